@@ -1,8 +1,18 @@
+import secrets
+import sys
+
 from flask_script import Manager
 from flask_migrate import Migrate, MigrateCommand
 
 import main
+from timeless import export as exports
+from timeless import imports
+from timeless.customers.models import Customer
 from timeless.db import DB
+from timeless.employees import pins
+from timeless.reservations import reminders
+from timeless.items.models import Item
+from timeless.restaurants.models import Device, Reservation, Table
 
 
 MIGRATE = Migrate(main.app, DB)
@@ -10,6 +20,78 @@ MANAGER = Manager(main.app)
 
 MANAGER.add_command("db", MigrateCommand)
 
+EXPORTED = {
+    "reservations": Reservation,
+    "customers": Customer,
+    "items": Item,
+}
+
+
+@MANAGER.option("entity", choices=sorted(EXPORTED))
+@MANAGER.option("-f", "--format", dest="export_format", default="csv",
+                choices=sorted(exports.FORMATS))
+@MANAGER.option("-o", "--output", dest="output", default=None,
+                help="File to write, standard output by default")
+def export(entity, export_format, output):
+    """Export all rows of entity as csv or json lines"""
+    model = EXPORTED[entity]
+    lines = exports.export(
+        model.query.order_by(*model.__mapper__.primary_key),
+        exports.columns(model),
+        export_format
+    )
+    if output is None:
+        sys.stdout.writelines(lines)
+        return
+    with open(output, "w", newline="") as file:
+        file.writelines(lines)
+
+
+IMPORTED = {
+    "customers": Customer,
+    "tables": Table,
+}
+
+
+# options are added bottom up, positionals are entity input_file
+@MANAGER.option("-k", "--key", dest="key", default=None,
+                help="Unique column of rows updating existing ones")
+@MANAGER.option("input_file", help="Csv file with a header naming columns")
+@MANAGER.option("entity", choices=sorted(IMPORTED))
+def import_csv(entity, input_file, key):
+    """Import rows of entity from csv file"""
+    with open(input_file, newline="") as file:
+        try:
+            result = imports.load(IMPORTED[entity], file, key=key)
+        except imports.CsvImportError as error:
+            sys.exit(f"Import failed: {error}")
+    for rejected in result.rejected:
+        print(f"Rejected line {rejected.line}: {rejected.errors}",
+              file=sys.stderr)
+    print(f"Imported {result.imported} rows, "
+          f"rejected {len(result.rejected)}")
+
+
+# options are added bottom up, positionals are location_id name
+@MANAGER.option("name", help="Name of the device, e.g. Bar tablet")
+@MANAGER.option("location_id", type=int, help="Location of the device")
+def register_device(location_id, name):
+    """Register a shared device for PIN login and print its token, which is
+    not stored and can not be shown again"""
+    token = secrets.token_urlsafe(32)
+    DB.session.add(Device(
+        name=name, location_id=location_id,
+        token_digest=pins.token_digest(token)))
+    DB.session.commit()
+    print(token)
+
+
+@MANAGER.command
+def schedule_reminders():
+    """Schedule reminders of all upcoming reservations, e.g. after they were
+    imported"""
+    print(f"Scheduled {reminders.schedule_all()} reservations")
+
 
 if __name__ == "__main__":
     MANAGER.run()
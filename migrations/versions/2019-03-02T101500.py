@@ -0,0 +1,30 @@
+"""Indexes for table availability lookups
+
+Revision ID: 3f6c2a9d8b41
+Revises: 65535c7283b5
+Create Date: 2019-03-02 10:15:00.000000+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6c2a9d8b41'
+down_revision = '65535c7283b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "CREATE INDEX ix_reservations_period ON reservations "
+        "USING gist (tsrange(start_time, end_time))"
+    )
+    op.create_index('ix_table_reservations_table_id', 'table_reservations',
+                    ['table_id', 'reservation_id'])
+
+
+def downgrade():
+    op.drop_index('ix_table_reservations_table_id',
+                  table_name='table_reservations')
+    op.execute("DROP INDEX ix_reservations_period")
@@ -0,0 +1,30 @@
+"""Unique poster_id for synchronized entities
+
+Revision ID: a81d0c6e52f7
+Revises: 3f6c2a9d8b41
+Create Date: 2019-03-04 09:12:00.000000+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a81d0c6e52f7'
+down_revision = '3f6c2a9d8b41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_unique_constraint('customers_poster_id_key',
+                                'customers', ['poster_id'])
+    op.create_unique_constraint('tables_poster_id_key',
+                                'tables', ['poster_id'])
+    op.create_unique_constraint('locations_poster_id_key',
+                                'locations', ['poster_id'])
+
+
+def downgrade():
+    op.drop_constraint('locations_poster_id_key', 'locations', type_='unique')
+    op.drop_constraint('tables_poster_id_key', 'tables', type_='unique')
+    op.drop_constraint('customers_poster_id_key', 'customers', type_='unique')
@@ -0,0 +1,38 @@
+"""Poster sync digests and high-water marks
+
+Revision ID: 5c2e7f1b9a30
+Revises: a81d0c6e52f7
+Create Date: 2019-03-05 14:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2e7f1b9a30'
+down_revision = 'a81d0c6e52f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('poster_sync_states',
+    sa.Column('entity', sa.String(), nullable=False),
+    sa.Column('high_water_mark', sa.DateTime(), nullable=True),
+    sa.Column('synchronized_on', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('entity')
+    )
+    op.add_column('customers',
+                  sa.Column('poster_hash', sa.String(32), nullable=True))
+    op.add_column('tables',
+                  sa.Column('poster_hash', sa.String(32), nullable=True))
+    op.add_column('locations',
+                  sa.Column('poster_hash', sa.String(32), nullable=True))
+
+
+def downgrade():
+    op.drop_column('locations', 'poster_hash')
+    op.drop_column('tables', 'poster_hash')
+    op.drop_column('customers', 'poster_hash')
+    op.drop_table('poster_sync_states')
@@ -0,0 +1,56 @@
+"""Indexes for list filters
+
+Revision ID: 8d4b1e6f2c57
+Revises: 5c2e7f1b9a30
+Create Date: 2019-03-06 10:00:00.000000+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4b1e6f2c57'
+down_revision = '5c2e7f1b9a30'
+branch_labels = None
+depends_on = None
+
+# prefix filters, LIKE 'value%' uses a btree index with pattern operators
+PATTERN_INDEXES = (
+    ('customers', 'first_name'),
+    ('customers', 'last_name'),
+)
+
+# ilike filters, ILIKE '%value%' uses a trigram index
+TRIGRAM_INDEXES = (
+    ('customers', 'first_name'),
+    ('customers', 'last_name'),
+    ('reservations', 'comment'),
+    ('table_shapes', 'description'),
+)
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in PATTERN_INDEXES:
+        op.execute(
+            f"CREATE INDEX ix_{table}_{column}_pattern ON {table} "
+            f"({column} text_pattern_ops)"
+        )
+    for table, column in TRIGRAM_INDEXES:
+        op.execute(
+            f"CREATE INDEX ix_{table}_{column}_trgm ON {table} "
+            f"USING gin ({column} gin_trgm_ops)"
+        )
+    op.create_index('ix_reservations_start_time', 'reservations',
+                    ['start_time'])
+    op.create_index('ix_reservations_end_time', 'reservations',
+                    ['end_time'])
+
+
+def downgrade():
+    op.drop_index('ix_reservations_end_time', table_name='reservations')
+    op.drop_index('ix_reservations_start_time', table_name='reservations')
+    for table, column in TRIGRAM_INDEXES:
+        op.execute(f"DROP INDEX ix_{table}_{column}_trgm")
+    for table, column in PATTERN_INDEXES:
+        op.execute(f"DROP INDEX ix_{table}_{column}_pattern")
@@ -0,0 +1,62 @@
+"""Normalized customer phone numbers
+
+Revision ID: 2a7e9c4d1f08
+Revises: 8d4b1e6f2c57
+Create Date: 2019-03-07 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2a7e9c4d1f08'
+down_revision = '8d4b1e6f2c57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('customers',
+                  sa.Column('phone_normalized', sa.String(16), nullable=True))
+    # Same rules as timeless.customers.phones.normalize, the oldest customer
+    # keeps a number shared by several ones
+    op.execute("""
+        WITH cleaned AS (
+            SELECT id,
+                   ltrim(phone_number) LIKE '+%' AS international,
+                   regexp_replace(substring(phone_number from '^[^A-Za-z]*'),
+                                  '[^0-9]', '', 'g') AS digits
+            FROM customers
+        ), normalized AS (
+            SELECT id,
+                   CASE
+                       WHEN international THEN digits
+                       WHEN digits LIKE '00%' THEN substr(digits, 3)
+                       WHEN digits LIKE '0%' THEN '380' || substr(digits, 2)
+                       ELSE digits
+                   END AS digits
+            FROM cleaned
+        ), ranked AS (
+            SELECT id, '+' || digits AS phone,
+                   row_number() OVER (PARTITION BY digits ORDER BY id) AS rank
+            FROM normalized
+            WHERE digits NOT LIKE '0%' AND length(digits) BETWEEN 7 AND 15
+        )
+        UPDATE customers SET phone_normalized = ranked.phone
+        FROM ranked
+        WHERE ranked.id = customers.id AND ranked.rank = 1
+    """)
+    op.create_unique_constraint('customers_phone_normalized_key', 'customers',
+                                ['phone_normalized'])
+    # lookups by ending digits are prefix lookups of the reversed number
+    op.execute(
+        "CREATE INDEX ix_customers_phone_normalized_reversed ON customers "
+        "(reverse(phone_normalized) text_pattern_ops)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX ix_customers_phone_normalized_reversed")
+    op.drop_constraint('customers_phone_normalized_key', 'customers')
+    op.drop_column('customers', 'phone_normalized')
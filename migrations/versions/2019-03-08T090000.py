@@ -0,0 +1,53 @@
+"""Devices and digests of PIN codes for PIN login
+
+Revision ID: 6f3a8b2d9e14
+Revises: 2a7e9c4d1f08
+Create Date: 2019-03-08 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from flask import current_app
+
+from timeless.employees import pins
+
+
+# revision identifiers, used by Alembic.
+revision = '6f3a8b2d9e14'
+down_revision = '2a7e9c4d1f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'devices',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=False),
+        sa.Column('token_digest', sa.String(64), nullable=False),
+        sa.Column('created_on', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('token_digest')
+    )
+    op.add_column('employees',
+                  sa.Column('pin_digest', sa.String(64), nullable=True))
+    # the key only exists in the configuration, so digests are computed here
+    key = current_app.config["PIN_SECRET_KEY"]
+    connection = op.get_bind()
+    employees = sa.table('employees', sa.column('id'), sa.column('pin_code'),
+                         sa.column('pin_digest'))
+    for employee_id, pin_code in connection.execute(
+            sa.select([employees.c.id, employees.c.pin_code])).fetchall():
+        connection.execute(
+            employees.update().where(employees.c.id == employee_id).values(
+                pin_digest=pins.digest(pin_code, key=key)))
+    op.create_unique_constraint('employees_pin_digest_key', 'employees',
+                                ['pin_digest'])
+
+
+def downgrade():
+    op.drop_constraint('employees_pin_digest_key', 'employees')
+    op.drop_column('employees', 'pin_digest')
+    op.drop_table('devices')
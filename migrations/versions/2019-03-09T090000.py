@@ -0,0 +1,44 @@
+"""Mail outbox
+
+Revision ID: 9b5d2e7c4a61
+Revises: 6f3a8b2d9e14
+Create Date: 2019-03-09 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b5d2e7c4a61'
+down_revision = '6f3a8b2d9e14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'outgoing_mails',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('subject', sa.String(), nullable=False),
+        sa.Column('recipients', sa.JSON(), nullable=False),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.Column('html', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_on', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('sent_on', sa.DateTime(), nullable=True),
+        sa.Column('created_on', sa.DateTime(), nullable=False),
+        sa.Column('updated_on', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # workers only look for pending messages
+    op.create_index('ix_outgoing_mails_pending', 'outgoing_mails',
+                    ['next_attempt_on'],
+                    postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade():
+    op.drop_index('ix_outgoing_mails_pending', table_name='outgoing_mails')
+    op.drop_table('outgoing_mails')
@@ -0,0 +1,42 @@
+"""Sms outbox
+
+Revision ID: 3c8e1f6a7d25
+Revises: 9b5d2e7c4a61
+Create Date: 2019-03-10 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8e1f6a7d25'
+down_revision = '9b5d2e7c4a61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'outgoing_sms',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('recipient', sa.String(16), nullable=False),
+        sa.Column('message', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_on', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('sent_on', sa.DateTime(), nullable=True),
+        sa.Column('created_on', sa.DateTime(), nullable=False),
+        sa.Column('updated_on', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # workers only look for pending messages
+    op.create_index('ix_outgoing_sms_pending', 'outgoing_sms',
+                    ['next_attempt_on'],
+                    postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade():
+    op.drop_index('ix_outgoing_sms_pending', table_name='outgoing_sms')
+    op.drop_table('outgoing_sms')
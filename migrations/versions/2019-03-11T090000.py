@@ -0,0 +1,62 @@
+"""Shared customer phone numbers
+
+Revision ID: 5d7a2c9e8b13
+Revises: 3c8e1f6a7d25
+Create Date: 2019-03-11 09:00:00.000000+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5d7a2c9e8b13'
+down_revision = '3c8e1f6a7d25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_constraint('customers_phone_normalized_key', 'customers')
+    op.create_index('ix_customers_phone_normalized', 'customers',
+                    ['phone_normalized'])
+    # numbers left out as duplicates, same rules as
+    # timeless.customers.phones.normalize
+    op.execute("""
+        WITH cleaned AS (
+            SELECT id,
+                   ltrim(phone_number) LIKE '+%' AS international,
+                   regexp_replace(substring(phone_number from '^[^A-Za-z]*'),
+                                  '[^0-9]', '', 'g') AS digits
+            FROM customers
+            WHERE phone_normalized IS NULL
+        ), normalized AS (
+            SELECT id,
+                   CASE
+                       WHEN international THEN digits
+                       WHEN digits LIKE '00%' THEN substr(digits, 3)
+                       WHEN digits LIKE '0%' THEN '380' || substr(digits, 2)
+                       ELSE digits
+                   END AS digits
+            FROM cleaned
+        )
+        UPDATE customers SET phone_normalized = '+' || normalized.digits
+        FROM normalized
+        WHERE normalized.id = customers.id
+          AND normalized.digits NOT LIKE '0%'
+          AND length(normalized.digits) BETWEEN 7 AND 15
+    """)
+
+
+def downgrade():
+    # the oldest customer keeps a number shared by several ones
+    op.execute("""
+        UPDATE customers SET phone_normalized = NULL
+        WHERE id NOT IN (
+            SELECT min(id) FROM customers
+            WHERE phone_normalized IS NOT NULL
+            GROUP BY phone_normalized
+        ) AND phone_normalized IS NOT NULL
+    """)
+    op.drop_index('ix_customers_phone_normalized', 'customers')
+    op.create_unique_constraint('customers_phone_normalized_key', 'customers',
+                                ['phone_normalized'])
@@ -0,0 +1,36 @@
+"""Sensitive mail
+
+Revision ID: 7e2b4f9a1c36
+Revises: 5d7a2c9e8b13
+Create Date: 2019-03-12 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e2b4f9a1c36'
+down_revision = '5d7a2c9e8b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('outgoing_mails',
+                  sa.Column('sensitive', sa.Boolean(), nullable=False,
+                            server_default=sa.false()))
+    # new passwords were sent in the subject of messages
+    op.execute("""
+        UPDATE outgoing_mails SET sensitive = true
+        WHERE subject LIKE 'Hello! your new password is %'
+    """)
+    op.execute("""
+        UPDATE outgoing_mails
+        SET subject = '[removed]', body = NULL, html = NULL
+        WHERE sensitive AND status <> 'pending'
+    """)
+
+
+def downgrade():
+    op.drop_column('outgoing_mails', 'sensitive')
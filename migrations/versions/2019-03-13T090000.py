@@ -0,0 +1,33 @@
+"""Pin codes as strings
+
+Revision ID: 3c9e1f7a2b58
+Revises: 7e2b4f9a1c36
+Create Date: 2019-03-13 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e1f7a2b58'
+down_revision = '7e2b4f9a1c36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # digests were computed from the same text, they stay valid
+    op.alter_column('employees', 'pin_code',
+                    type_=sa.String(length=12),
+                    existing_type=sa.Integer(),
+                    existing_nullable=False,
+                    postgresql_using='pin_code::text')
+
+
+def downgrade():
+    op.alter_column('employees', 'pin_code',
+                    type_=sa.Integer(),
+                    existing_type=sa.String(length=12),
+                    existing_nullable=False,
+                    postgresql_using='pin_code::integer')
@@ -0,0 +1,25 @@
+"""Drop high-water mark of Poster synchronization
+
+Revision ID: 9a4d6b2e7f15
+Revises: 3c9e1f7a2b58
+Create Date: 2019-03-14 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d6b2e7f15'
+down_revision = '3c9e1f7a2b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_column('poster_sync_states', 'high_water_mark')
+
+
+def downgrade():
+    op.add_column('poster_sync_states',
+                  sa.Column('high_water_mark', sa.DateTime(), nullable=True))
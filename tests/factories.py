@@ -50,7 +50,8 @@ class EmployeeFactory(factory.alchemy.SQLAlchemyModelFactory):
     user_status = factory.Faker("text")
     email = factory.Faker("email")
     password = factory.Faker("text")
-    pin_code = factory.LazyAttribute(lambda _: random.randint(1, 9999))
+    pin_code = factory.LazyAttribute(
+        lambda _: f"{random.randint(0, 9999):04d}")
     comment = "Test comment"
 
     class Meta:
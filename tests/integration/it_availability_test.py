@@ -0,0 +1,113 @@
+""" Integration tests for availability of tables """
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+from flask import url_for
+
+from tests import factories
+from timeless.restaurants import availability
+from timeless.restaurants.models import Reservation, TableReservation
+
+
+EVENING = datetime(2019, 3, 2, 19)
+
+
+def reserve(db_session, table, start_time, end_time, status="confirmed"):
+    reservation = Reservation(
+        start_time=start_time,
+        end_time=end_time,
+        num_of_persons=2,
+        comment="",
+        status=status
+    )
+    db_session.add(reservation)
+    db_session.add(TableReservation(table=table, reservation=reservation))
+    db_session.commit()
+
+
+def test_available_tables(db_session):
+    floor = factories.FloorFactory()
+    small = factories.TableFactory(floor=floor, max_capacity=2)
+    large = factories.TableFactory(floor=floor, max_capacity=6)
+    busy = factories.TableFactory(floor=floor, max_capacity=4)
+    canceled = factories.TableFactory(floor=floor, max_capacity=4)
+    factories.TableFactory(floor=factories.FloorFactory(), max_capacity=4)
+    reserve(db_session, busy, EVENING + timedelta(hours=1),
+            EVENING + timedelta(hours=3))
+    reserve(db_session, canceled, EVENING, EVENING + timedelta(hours=2),
+            status="canceled")
+    reserve(db_session, large, EVENING - timedelta(hours=2), EVENING)
+
+    tables = availability.available_tables(
+        floor.id, EVENING, EVENING + timedelta(hours=2), 3
+    ).all()
+
+    assert tables == [canceled, large]
+    assert small not in tables
+    assert not availability.is_available(
+        busy.id, EVENING, EVENING + timedelta(hours=2))
+    assert availability.is_available(
+        busy.id, EVENING + timedelta(hours=3), EVENING + timedelta(hours=4))
+
+
+def logged_in_floor(client):
+    """Floor of a location of the company of the logged in employee"""
+    company = factories.CompanyFactory()
+    location = factories.LocationFactory(company=company)
+    employee = factories.EmployeeFactory(company=company)
+    with client.session_transaction() as session:
+        session["user_id"] = employee.id
+    return factories.FloorFactory(location=location)
+
+
+def test_available_tables_endpoint(client):
+    floor = logged_in_floor(client)
+    table = factories.TableFactory(floor=floor, max_capacity=4)
+    response = client.get(url_for(
+        "table.available",
+        floor_id=floor.id,
+        persons=4,
+        start_time="2019-03-02T21:00:00+02:00",
+        end_time=(EVENING + timedelta(hours=2)).isoformat()
+    ))
+    assert response.status_code == HTTPStatus.OK
+    assert [item["id"] for item in response.get_json()["tables"]] == [
+        table.id
+    ]
+
+
+def test_available_tables_endpoint_is_scoped(client):
+    logged_in_floor(client)
+    other = factories.FloorFactory()
+    response = client.get(url_for(
+        "table.available",
+        floor_id=other.id,
+        persons=4,
+        start_time=EVENING.isoformat(),
+        end_time=(EVENING + timedelta(hours=2)).isoformat()
+    ))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_available_tables_endpoint_requires_login(client):
+    response = client.get(url_for("table.available", floor_id=1))
+    assert response.status_code == HTTPStatus.FOUND
+
+
+def test_naive_utc():
+    assert availability.naive_utc(
+        datetime(2019, 3, 2, 21, tzinfo=timezone(timedelta(hours=2)))
+    ) == EVENING
+    assert availability.naive_utc(EVENING) == EVENING
+
+
+def test_available_tables_endpoint_validates_period(client):
+    logged_in_floor(client)
+    response = client.get(url_for(
+        "table.available",
+        floor_id=1,
+        persons=4,
+        start_time=EVENING.isoformat(),
+        end_time=EVENING.isoformat()
+    ))
+    assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,28 @@
+from tests import factories
+from timeless.cache import model_versions
+from timeless.restaurants.models import Location
+
+
+def test_commit_changes_model_version(db_session):
+    version = model_versions([Location])
+    factories.LocationFactory()
+    assert model_versions([Location]) != version
+
+
+def test_cached_locations_list_expires_on_change(client, db_session):
+    factories.LocationFactory(name="First location")
+    assert b"First location" in client.get("/locations/").data
+    factories.LocationFactory(name="Second location")
+    assert b"Second location" in client.get("/locations/").data
+
+
+def test_unchanged_locations_list_is_not_modified(client, db_session):
+    factories.LocationFactory()
+    response = client.get("/locations/")
+    assert client.get(
+        "/locations/", headers={"If-None-Match": response.headers["ETag"]}
+    ).status_code == 304
+    factories.LocationFactory()
+    assert client.get(
+        "/locations/", headers={"If-None-Match": response.headers["ETag"]}
+    ).status_code == 200
@@ -6,7 +6,9 @@ import pytest
 
 from flask import url_for
 
+from tests import factories
 from timeless.reservations.models import Comment
+from timeless.roles.models import RoleType
 
 """
 @todo #222:30min Correct comments its_tests. After #222 Comments had the logic
@@ -41,3 +43,30 @@ def test_get_single_comment(client, db_session):
 def test_comment_not_found(client):
     url = url_for("/api/comments/", comment_id=2)
     client.get()
+
+
+def test_api_bulk_ignores_comments_of_other_companies(client, db_session):
+    owner = factories.EmployeeFactory(
+        company=factories.CompanyFactory(),
+        role=factories.RoleFactory(name="owner", role_type=RoleType.Owner)
+    )
+    other = Comment(
+        body="Other company", date=datetime.utcnow(),
+        employee_id=factories.EmployeeFactory(
+            company=factories.CompanyFactory()).id
+    )
+    db_session.add(other)
+    db_session.commit()
+    with client.session_transaction() as session:
+        session["user_id"] = owner.id
+    url = url_for("comments.api_bulk")
+
+    updated = client.put(
+        url, json=[{"id": other.id, "body": "x"}]).get_json()["results"]
+    deleted = client.delete(url, json=[other.id]).get_json()["results"]
+
+    assert [result["status"] for result in updated] == [HTTPStatus.NOT_FOUND]
+    assert [result["status"] for result in deleted] == [HTTPStatus.NOT_FOUND]
+    assert Comment.query.get(other.id).body == "Other company"
+    assert client.get(url_for("comments.api", comment_id=other.id)
+                      ).status_code == HTTPStatus.NOT_FOUND
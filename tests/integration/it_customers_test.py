@@ -0,0 +1,43 @@
+from flask import url_for
+
+from tests import factories
+
+
+def test_search_by_ending_digits(client, auth):
+    customer = factories.CustomerFactory(phone_number="093 123 45 67")
+    factories.CustomerFactory(phone_number="093 123 45 76")
+    auth.login()
+
+    response = client.get(url_for("customers.search"), query_string={
+        "phone": "45-67"
+    })
+
+    assert [found["id"] for found in response.json["customers"]] == [
+        customer.id]
+
+
+def test_search_by_whole_number(client, auth):
+    customer = factories.CustomerFactory(phone_number="093 123 45 67")
+    auth.login()
+
+    response = client.get(url_for("customers.search"), query_string={
+        "phone": "+380 93 123 45 67"
+    })
+
+    assert response.json["customers"][0]["id"] == customer.id
+
+
+def test_search_requires_digits(client, auth):
+    auth.login()
+    response = client.get(url_for("customers.search"), query_string={
+        "phone": "12"
+    })
+    assert response.status_code == 400
+
+
+def test_search_requires_valid_whole_number(client, auth):
+    auth.login()
+    response = client.get(url_for("customers.search"), query_string={
+        "phone": "+0931234"
+    })
+    assert response.status_code == 400
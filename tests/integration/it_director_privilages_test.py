@@ -14,7 +14,7 @@ def test_can_access_if_no_profile(app):
     flask.g.user = Employee(id=1, first_name="Alice", last_name="Cooper",
                             username="alice", phone_number="1",
                             birth_date=datetime.utcnow(),
-                            pin_code=1111,
+                            pin_code="1111",
                             account_status="on",
                             user_status="on",
                             registration_date=datetime.utcnow(),
@@ -26,7 +26,7 @@ def test_can_access_his_profile(app):
     flask.g.user = Employee(id=1, first_name="Alice", last_name="Cooper",
                       username="alice", phone_number="1",
                       birth_date=datetime.utcnow(),
-                      pin_code=9999,
+                      pin_code="9999",
                       account_status="on",
                       user_status="on",
                       registration_date=datetime.utcnow(),
@@ -68,7 +68,7 @@ def create_employee():
                     user_status="Working",
                     email="test@test.com",
                     password="bla",
-                    pin_code=1234,
+                    pin_code="1234",
                     comment="No comments",
                     )
 
@@ -106,7 +106,7 @@ def test_create(client, db_session):
                      "user_status": "Working",
                      "email": "test@test.com",
                      "password": "pwd1",
-                     "pin_code": 1234,
+                     "pin_code": "1234",
                      "comment": "No comments",
                      }
     client.post(url_for("employee.create"), data=employee_data)
@@ -143,7 +143,7 @@ def test_cannot_access_create(client, db_session):
                      "user_status": "Working",
                      "email": "test@test.com",
                      "password": "pwd1",
-                     "pin_code": 1234,
+                     "pin_code": "1234",
                      "comment": "No comments",
                      }
     client.post(url_for("employee.create"), data=employee_data)
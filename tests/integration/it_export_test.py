@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+from flask import url_for
+
+import pytest
+from tests import factories
+from timeless.restaurants.models import TableReservation
+from timeless.roles.models import RoleType
+
+
+@pytest.fixture
+def owner_table(client):
+    """Table of the company of the logged in owner"""
+    company = factories.CompanyFactory()
+    owner = factories.EmployeeFactory(
+        company=company,
+        role=factories.RoleFactory(name="owner", role_type=RoleType.Owner)
+    )
+    with client.session_transaction() as session:
+        session["user_id"] = owner.id
+    return factories.TableFactory(floor=factories.FloorFactory(
+        location=factories.LocationFactory(company=company)))
+
+
+def test_export_reservations_as_csv(client, db_session, owner_table):
+    reservations = factories.ReservationFactory.create_batch(size=3)
+    db_session.add_all(
+        TableReservation(table=owner_table, reservation=reservation)
+        for reservation in reservations
+    )
+    db_session.commit()
+    factories.ReservationFactory()
+
+    response = client.get(url_for("reservations.export"))
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+    assert response.mimetype == "text/csv"
+    assert [int(row["id"]) for row in rows] == sorted(
+        reservation.id for reservation in reservations)
+
+
+def test_export_customers_as_json_lines(client, owner_table):
+    customer = factories.CustomerFactory()
+
+    response = client.get(
+        url_for("customers.export"), query_string={"format": "jsonl"})
+    lines = response.get_data(as_text=True).splitlines()
+
+    assert response.mimetype == "application/x-ndjson"
+    assert json.loads(lines[0])["id"] == customer.id
+
+
+def test_export_items_of_the_company(client, owner_table):
+    factories.ItemFactory()
+
+    response = client.get(url_for("items.export"))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.get_data(as_text=True).splitlines()[1:] == []
+
+
+def test_export_requires_login(client):
+    response = client.get(url_for("items.export"))
+    assert response.location.endswith(url_for("auth.login"))
+
+
+def test_export_requires_permission(client, auth):
+    auth.login()
+    response = client.get(url_for("reservations.export"))
+    assert response.status_code == HTTPStatus.FORBIDDEN
@@ -0,0 +1,96 @@
+import io
+from http import HTTPStatus
+
+from flask import url_for
+
+import pytest
+from tests import factories
+from timeless.customers.models import Customer
+from timeless.restaurants.models import Table
+from timeless.roles.models import RoleType
+
+
+@pytest.fixture
+def owner_floor(client):
+    """Floor of the company of the logged in owner"""
+    company = factories.CompanyFactory()
+    owner = factories.EmployeeFactory(
+        company=company,
+        role=factories.RoleFactory(name="owner", role_type=RoleType.Owner)
+    )
+    with client.session_transaction() as session:
+        session["user_id"] = owner.id
+    return factories.FloorFactory(
+        location=factories.LocationFactory(company=company))
+
+
+def upload(data):
+    return {"file": (io.BytesIO(data.encode()), "import.csv")}
+
+
+def test_import_customers(client, owner_floor):
+    data = ("first_name,last_name,phone_number,poster_id\n"
+            "John,Black,+100,1\n"
+            "Jane,Black,+200,\n"
+            "Jim,White,,3\n")
+
+    response = client.post(url_for("customers.import"), data={
+        "file": (io.BytesIO(data.encode()), "customers.csv")
+    })
+
+    assert response.json == {
+        "imported": 2,
+        "rejected": [
+            {"line": 4, "errors": {"phone_number": "Field may not be null"}}
+        ]
+    }
+    assert Customer.query.filter_by(poster_id=1).one().first_name == "John"
+
+
+def test_import_updates_rows_with_same_key(client, owner_floor):
+    customer = factories.CustomerFactory(poster_id=7)
+    data = ("first_name,last_name,phone_number,poster_id\n"
+            "Old,Name,+100,7\n"
+            "New,Name,+100,7\n")
+
+    response = client.post(
+        url_for("customers.import"),
+        query_string={"key": "poster_id"},
+        data={"file": (io.BytesIO(data.encode()), "customers.csv")}
+    )
+
+    assert response.json["imported"] == 1
+    assert Customer.query.get(customer.id).first_name == "New"
+
+
+def test_import_requires_file(client, owner_floor):
+    response = client.post(url_for("table.import"))
+    assert response.status_code == 400
+
+
+def test_import_requires_permission(client, auth):
+    auth.login()
+    response = client.post(
+        url_for("table.import"), data=upload("name,floor_id\n"))
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_import_tables_of_other_companies_is_rejected(client, owner_floor):
+    other = factories.TableFactory(poster_id=9, name="Other")
+    data = (f"name,floor_id,poster_id\n"
+            f"Mine,{owner_floor.id},8\n"
+            f"Theirs,{other.floor_id},10\n"
+            f"Taken,{owner_floor.id},9\n")
+
+    response = client.post(
+        url_for("table.import"),
+        query_string={"key": "poster_id"},
+        data=upload(data)
+    )
+
+    assert response.json["rejected"] == [
+        {"line": 3, "errors": {"floor_id": "Not allowed"}}
+    ]
+    assert Table.query.filter_by(poster_id=8).one().floor_id == (
+        owner_floor.id)
+    assert Table.query.get(other.id).name == "Other"
@@ -58,7 +58,7 @@ def test_can_access_location_tables(app, db_session):
         id=1, first_name="Alice", last_name="Cooper",
         username="alice", phone_number="1",
         birth_date=datetime.utcnow(),
-        pin_code=3333,
+        pin_code="3333",
         account_status="on",
         user_status="on",
         registration_date=datetime.utcnow(),
@@ -127,7 +127,7 @@ def test_cannot_access_tables_from_other_locations(app, db_session):
         id=1, first_name="Alice", last_name="Cooper",
         username="alice", phone_number="1",
         birth_date=datetime.utcnow(),
-        pin_code=3333,
+        pin_code="3333",
         account_status="on",
         user_status="on",
         registration_date=datetime.utcnow(),
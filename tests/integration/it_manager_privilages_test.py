@@ -15,7 +15,7 @@ def test_can_access_if_no_profile(app):
     flask.g.user = Employee(id=1, first_name="Alice", last_name="Cooper",
                             username="alice", phone_number="1",
                             birth_date=datetime.utcnow(),
-                            pin_code=1111,
+                            pin_code="1111",
                             account_status="on",
                             user_status="on",
                             registration_date=datetime.utcnow(),
@@ -27,7 +27,7 @@ def test_can_access_his_profile(app):
     flask.g.user = Employee(id=1, first_name="Alice", last_name="Cooper",
                       username="alice", phone_number="1",
                       birth_date=datetime.utcnow(),
-                      pin_code=2222,
+                      pin_code="2222",
                       account_status="on",
                       user_status="on",
                       registration_date=datetime.utcnow(),
@@ -44,7 +44,7 @@ def test_cant_access_other_company_employees(app, db_session):
         id=1, first_name="Alice", last_name="Cooper",
         username="alice", phone_number="1",
         birth_date=datetime.utcnow(),
-        pin_code=3333,
+        pin_code="3333",
         account_status="on",
         user_status="on",
         registration_date=datetime.utcnow(),
@@ -61,7 +61,7 @@ def test_cant_access_other_company_employees(app, db_session):
         id=2, first_name="Bob", last_name="Cooper",
         username="bob", phone_number="1",
         birth_date=datetime.utcnow(),
-        pin_code=4444,
+        pin_code="4444",
         account_status="on",
         user_status="on",
         registration_date=datetime.utcnow(),
@@ -39,7 +39,7 @@ def test_can_access_his_profile(clean_app):
 def test_can_access_own_employees(clean_app):
     flask.g.user = Employee(id=1, first_name="Alice", last_name="Cooper",
                       username="alice", phone_number="1", account_status="T",
-                      birth_date=datetime.utcnow(), pin_code=1234,
+                      birth_date=datetime.utcnow(), pin_code="1234",
                       registration_date=datetime.utcnow(), user_status="T",
                       email="test@test.com", password="bla")
     assert has_privilege(method=Method.READ, resource="employee")
@@ -55,7 +55,7 @@ def test_can_manage_locations_from_same_company(clean_app, db_session):
         first_name="Alice", last_name="Cooper",
         username="alice", phone_number="1",
         birth_date=datetime.utcnow(),
-        pin_code=7777,
+        pin_code="7777",
         account_status="on",
         user_status="on",
         registration_date=datetime.utcnow(),
@@ -102,7 +102,7 @@ def test_can_not_manage_locations_from_different_company(clean_app, db_session):
         id=1, first_name="Bob", last_name="Cooper",
         username="alice", phone_number="1",
         birth_date=datetime.utcnow(),
-        pin_code=1111,
+        pin_code="1111",
         account_status="on",
         user_status="on",
         registration_date=datetime.utcnow(),
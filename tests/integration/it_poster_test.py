@@ -10,8 +10,8 @@ from timeless.poster.api import Authenticated, PosterAuthData
  provided by the poster service to identify the applications
 """
 
-@mock.patch("timeless.poster.api.requests")
-def test_auth(requests_mock):
+@mock.patch("timeless.poster.api.shared_session")
+def test_auth(session_mock):
     auth_data = PosterAuthData(
         application_id="test_id",
         application_secret="test_secret",
@@ -28,7 +28,7 @@ def test_auth(requests_mock):
         def json(self):
             return {"access_token": self.auth_token}
 
-    requests_mock.post.return_value = Response()
+    session_mock.return_value.post.return_value = Response()
 
     auth_token = Authenticated(auth_data).auth()
     assert auth_token == Response.auth_token
@@ -4,7 +4,35 @@ from flask import url_for
 
 import pytest
 from tests import factories
-from timeless.restaurants.models import Reservation
+from timeless.restaurants.models import Reservation, TableReservation
+from timeless.roles.models import RoleType
+
+
+@pytest.fixture
+def owner_table(client):
+    """Table of the company of the logged in owner"""
+    company = factories.CompanyFactory()
+    owner = factories.EmployeeFactory(
+        company=company,
+        role=factories.RoleFactory(name="owner", role_type=RoleType.Owner)
+    )
+    location = factories.LocationFactory(company=company)
+    table = factories.TableFactory(
+        floor=factories.FloorFactory(location=location))
+    with client.session_transaction() as session:
+        session["user_id"] = owner.id
+    return table
+
+
+def reserved(db_session, table, size):
+    """Reservations of the table"""
+    reservations = factories.ReservationFactory.create_batch(size=size)
+    db_session.add_all(
+        TableReservation(table=table, reservation=reservation)
+        for reservation in reservations
+    )
+    db_session.commit()
+    return reservations
 
 
 def test_list(client):
@@ -40,3 +68,125 @@ def test_delete(client):
     response = client.post(url)
     assert response.location.endswith(url_for("reservations.list"))
     assert Reservation.query.filter_by(id=reservation.id).count() == 0
+
+
+def test_api_cursor_pagination(client, db_session, owner_table):
+    reservations = reserved(db_session, owner_table, 5)
+    factories.ReservationFactory()
+    expected = [
+        reservation.id for reservation in
+        sorted(reservations, key=lambda item: (item.start_time, item.id))
+    ]
+    url = url_for("reservations.api")
+    first = client.get(url, query_string={"limit": 2}).get_json()
+    second = client.get(
+        url, query_string={"limit": 2, "cursor": first["next"]}
+    ).get_json()
+    last = client.get(
+        url, query_string={"limit": 2, "cursor": second["next"]}
+    ).get_json()
+    back = client.get(
+        url, query_string={"limit": 2, "cursor": last["prev"]}
+    ).get_json()
+
+    assert first["prev"] is None
+    assert [item["id"] for item in first["items"]] == expected[:2]
+    assert [item["id"] for item in second["items"]] == expected[2:4]
+    assert [item["id"] for item in last["items"]] == expected[4:]
+    assert last["next"] is None
+    assert back["items"] == second["items"]
+
+
+def test_api_malformed_cursor(client, owner_table):
+    response = client.get(
+        url_for("reservations.api"), query_string={"cursor": "foo"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_api_not_modified(client, db_session, owner_table):
+    reserved(db_session, owner_table, 2)
+    response = client.get(url_for("reservations.api"))
+    assert response.status_code == HTTPStatus.OK
+
+    unchanged = client.get(url_for("reservations.api"), headers={
+        "If-None-Match": response.headers["ETag"]})
+
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+    assert unchanged.get_data() == b""
+    reserved(db_session, owner_table, 1)
+    assert client.get(url_for("reservations.api"), headers={
+        "If-None-Match": response.headers["ETag"]
+    }).status_code == HTTPStatus.OK
+
+
+def test_api_bulk_create(client, owner_table):
+    other_table = factories.TableFactory()
+    valid = {
+        "start_time": "2019-03-01T19:00:00",
+        "end_time": "2019-03-01T21:00:00",
+        "num_of_persons": 4,
+        "comment": "Window",
+        "status": "confirmed",
+        "table_ids": [owner_table.id],
+    }
+    response = client.post(
+        url_for("reservations.api_bulk"),
+        json=[valid, {**valid, "num_of_persons": "four"}, valid,
+              {**valid, "table_ids": [other_table.id]}]
+    )
+    results = response.get_json()["results"]
+
+    assert response.status_code == HTTPStatus.OK
+    assert [result["status"] for result in results] == [
+        HTTPStatus.CREATED, HTTPStatus.BAD_REQUEST, HTTPStatus.CREATED,
+        HTTPStatus.BAD_REQUEST
+    ]
+    assert "num_of_persons" in results[1]["errors"]
+    assert "table_ids" in results[3]["errors"]
+    assert client.get(url_for(
+        "reservations.api", reservation_id=results[0]["id"]
+    )).status_code == HTTPStatus.OK
+    assert TableReservation.query.filter(
+        TableReservation.reservation_id.in_(
+            [results[0]["id"], results[2]["id"]]),
+        TableReservation.table_id == owner_table.id
+    ).count() == 2
+
+
+def test_api_bulk_update_and_delete(client, db_session, owner_table):
+    first, second = reserved(db_session, owner_table, 2)
+    other = factories.ReservationFactory()
+    url = url_for("reservations.api_bulk")
+
+    updated = client.put(url, json=[
+        {"id": first.id, "status": "canceled"}, {"id": 0, "comment": "x"},
+        {"id": other.id, "comment": "x"}
+    ]).get_json()["results"]
+    deleted = client.delete(
+        url, json=[second.id, 0, "foo"]
+    ).get_json()["results"]
+
+    assert [result["status"] for result in updated] == [
+        HTTPStatus.OK, HTTPStatus.NOT_FOUND, HTTPStatus.NOT_FOUND
+    ]
+    assert Reservation.query.get(first.id).status.code == "canceled"
+    assert [result["status"] for result in deleted] == [
+        HTTPStatus.NO_CONTENT, HTTPStatus.NOT_FOUND, HTTPStatus.BAD_REQUEST
+    ]
+    assert Reservation.query.get(second.id) is None
+
+
+def test_api_bulk_requires_array(client, owner_table):
+    response = client.post(
+        url_for("reservations.api_bulk"), json={"comment": "x"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_api_requires_login(client):
+    response = client.get(url_for("reservations.api"))
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_api_bulk_requires_login(client):
+    response = client.delete(url_for("reservations.api_bulk"), json=[1])
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,51 @@
+import unittest.mock
+
+from tests import factories
+from timeless.poster.api import Poster
+from timeless.poster.tasks import (
+    sync_all, sync_customers, sync_finished, sync_tables)
+
+
+@unittest.mock.patch("timeless.poster.tasks.chord")
+def test_sync_all_fans_out_by_location(chord_mock, db_session):
+    factories.LocationFactory(poster_id=7)
+    factories.LocationFactory(poster_id=3)
+    factories.LocationFactory(poster_id=None)
+
+    sync_all()
+
+    shards = chord_mock.call_args[0][0]
+    assert [shard.task for shard in shards] == [
+        "timeless.poster.tasks.sync_locations",
+        "timeless.poster.tasks.sync_customers",
+        "timeless.poster.tasks.sync_tables",
+        "timeless.poster.tasks.sync_tables",
+    ]
+    assert [shard.kwargs.get("location_id") for shard in shards[2:]] == [3, 7]
+
+
+def test_sync_finished_sums_shards():
+    assert sync_finished([2, 0, 5]) == {"shards": 3, "written": 7}
+
+
+@unittest.mock.patch("timeless.poster.tasks.redis_client")
+@unittest.mock.patch.object(Poster, "iter_customers")
+def test_sync_skipped_while_previous_run_holds_lock(customers_mock,
+                                                   redis_mock):
+    redis_mock.return_value.lock.return_value.acquire.return_value = False
+
+    assert sync_customers() == 0
+    customers_mock.assert_not_called()
+
+
+@unittest.mock.patch("timeless.poster.tasks.redis_client")
+@unittest.mock.patch.object(Poster, "iter_tables")
+def test_tables_of_all_locations_share_shard_locks(tables_mock, redis_mock,
+                                                   db_session):
+    factories.LocationFactory(poster_id=7)
+    redis_mock.return_value.lock.return_value.acquire.return_value = False
+
+    assert sync_tables() == 0
+    redis_mock.return_value.lock.assert_called_once_with(
+        "poster:sync:tables:7", timeout=unittest.mock.ANY)
+    tables_mock.assert_not_called()
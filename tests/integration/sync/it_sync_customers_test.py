@@ -1,15 +1,14 @@
 import unittest.mock
 
-import pytest
-
 from tests import factories
 from timeless.customers.models import Customer
 from timeless.poster.api import Poster, Authenticated
+from timeless.poster.models import SyncState
 from timeless.poster.tasks import sync_customers
 
 
 @unittest.mock.patch.object(Authenticated, "auth")
-@unittest.mock.patch.object(Poster, "customers")
+@unittest.mock.patch.object(Poster, "iter_customers")
 def test_sync_customers_with_creating_data(customers_mock, auth_mock):
     auth_mock.return_value = "token"
     poster_customer = {
@@ -40,11 +39,7 @@ def test_sync_customers_with_creating_data(customers_mock, auth_mock):
         "ewallet": "0"
     }
 
-    customers_mock.return_value = {
-        "response": [
-            poster_customer,
-        ]
-    }
+    customers_mock.return_value = [poster_customer]
 
     sync_customers()
 
@@ -56,16 +51,9 @@ def test_sync_customers_with_creating_data(customers_mock, auth_mock):
     assert customer.phone_number == poster_customer["phone_number"]
 
 
-@pytest.mark.skip(
-    "Skipped until puzzle below is not done")
 @unittest.mock.patch.object(Authenticated, "auth")
-@unittest.mock.patch.object(Poster, "customers")
+@unittest.mock.patch.object(Poster, "iter_customers")
 def test_sync_customers_with_merging_data(customers_mock, auth_mock):
-    """
-    @todo #409:30min Remove skipping decorator from this test.
-     Now def merge_data(model, poster_data, timelessis_data) func is not
-     working properly, pls fix it. After fixing this test should work
-    """
     customer = factories.CustomerFactory(poster_id="1")
     auth_mock.return_value = "token"
     poster_customer = {
@@ -96,11 +84,7 @@ def test_sync_customers_with_merging_data(customers_mock, auth_mock):
         "ewallet": "0"
     }
 
-    customers_mock.return_value = {
-        "response": [
-            poster_customer,
-        ]
-    }
+    customers_mock.return_value = [poster_customer]
 
     sync_customers()
 
@@ -110,3 +94,46 @@ def test_sync_customers_with_merging_data(customers_mock, auth_mock):
     assert merged_customer.first_name == poster_customer["firstname"]
     assert merged_customer.last_name == poster_customer["lastname"]
     assert merged_customer.phone_number == poster_customer["phone_number"]
+
+
+@unittest.mock.patch.object(Authenticated, "auth")
+@unittest.mock.patch.object(Poster, "iter_customers")
+def test_sync_customers_skips_unchanged_data(customers_mock, auth_mock):
+    auth_mock.return_value = "token"
+    customers_mock.return_value = [
+        {
+            "client_id": str(poster_id),
+            "firstname": "John",
+            "lastname": "Doe",
+            "date_activate": "2017-10-09 15:28:14",
+            "phone_number": "7963031384%d" % poster_id,
+        }
+        for poster_id in range(3)
+    ]
+
+    assert sync_customers() == 3
+    assert sync_customers() == 0
+    customers_mock.return_value[1]["lastname"] = "Smith"
+    assert sync_customers() == 1
+    assert Customer.query.filter_by(poster_id=1).one().last_name == "Smith"
+    assert Customer.query.count() == 3
+
+
+@unittest.mock.patch.object(Authenticated, "auth")
+@unittest.mock.patch.object(Poster, "iter_customers")
+def test_full_sync_rewrites_all_data(customers_mock, auth_mock):
+    auth_mock.return_value = "token"
+    customers_mock.return_value = [
+        {
+            "client_id": str(poster_id),
+            "firstname": "John",
+            "lastname": "Doe",
+            "date_activate": "2017-10-09 15:28:14",
+            "phone_number": "7963031384%d" % poster_id,
+        }
+        for poster_id in range(3)
+    ]
+
+    assert sync_customers() == 3
+    assert sync_customers(incremental=False) == 3
+    assert SyncState.query.get("customers").synchronized_on
@@ -3,6 +3,7 @@ import json
 import re
 import socket
 from threading import Thread
+from urllib.parse import parse_qs, urlparse
 
 import requests
 
@@ -52,7 +53,16 @@ def start_server(port, **kwargs):
             self.send_response(requests.codes.ok)
             self.send_header("Content-Type", "application/json; charset=utf-8")
             self.end_headers()
-            content = json.dumps(kwargs.get(target_type, {}))
+            data = kwargs.get(target_type, {})
+            query = parse_qs(urlparse(self.path).query)
+            if "num" in query and isinstance(data.get("response"), list):
+                offset = int(query.get("offset", ["0"])[0])
+                data = {
+                    "response": data["response"][
+                        offset:offset + int(query["num"][0])
+                    ]
+                }
+            content = json.dumps(data)
             self.wfile.write(content.encode("utf-8"))
 
         def do_POST(self):
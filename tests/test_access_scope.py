@@ -0,0 +1,71 @@
+from unittest import mock
+
+import flask
+
+from timeless.access_control import authorization, scope
+from timeless.auth.principal import Principal, RolePrincipal
+from timeless.roles.models import RoleType
+
+
+def owner(company_id=1):
+    return Principal(
+        id=1, username="alice", company_id=company_id, account_status="A",
+        role=RolePrincipal(id=1, name="owner", role_type=RoleType.Owner)
+    )
+
+
+def test_scope_lookups():
+    company_scope = scope.Scope(
+        company_id=1, location_ids=frozenset([2]), table_ids=frozenset([3]),
+        employees={4: scope.ScopedEmployee(4, RoleType.Intern)}
+    )
+    assert company_scope.has_location(2)
+    assert not company_scope.has_location(3)
+    assert company_scope.has_table(3)
+    assert company_scope.employee(4).is_master_or_intern()
+    assert company_scope.employee(5) is None
+
+
+@mock.patch("timeless.access_control.scope.build_scope")
+def test_scope_is_loaded_once_per_user(build_scope, app):
+    build_scope.side_effect = lambda company_id: scope.Scope(company_id)
+    with app.test_request_context():
+        flask.g.user = owner()
+        assert scope.current_scope().company_id == 1
+        scope.current_scope()
+        assert build_scope.call_count == 1
+        flask.g.user = owner(company_id=2)
+        assert scope.current_scope().company_id == 2
+        assert build_scope.call_count == 2
+
+
+@mock.patch("timeless.access_control.scope.build_scope")
+def test_decisions_are_memoized(build_scope, app):
+    build_scope.return_value = scope.Scope(1, location_ids=frozenset([7]))
+    with app.test_request_context():
+        flask.g.user = owner()
+        for _ in range(3):
+            assert authorization.is_allowed(
+                method="get", resource="location", id=7)
+            assert not authorization.is_allowed(
+                method="get", resource="location", id=8)
+        assert build_scope.call_count == 1
+        assert len(scope.current_access().decisions) == 2
+
+
+@mock.patch("timeless.access_control.scope.build_scope")
+def test_manager_edits_only_masters_and_interns(build_scope, app):
+    build_scope.return_value = scope.Scope(1, employees={
+        2: scope.ScopedEmployee(2, RoleType.Intern),
+        3: scope.ScopedEmployee(3, RoleType.Director),
+    })
+    with app.test_request_context():
+        flask.g.user = Principal(
+            id=1, username="bob", company_id=1, account_status="A",
+            role=RolePrincipal(id=2, name="manager",
+                               role_type=RoleType.Manager)
+        )
+        assert authorization.is_allowed(
+            method="put", resource="employee", employee_id=2)
+        assert not authorization.is_allowed(
+            method="put", resource="employee", employee_id=3)
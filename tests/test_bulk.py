@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from timeless import bulk
+from timeless.restaurants.models import Reservation, TableReservation
+
+
+def test_validate_new_object():
+    values, errors = bulk.validate(Reservation, {
+        "start_time": "2019-03-01T19:00:00",
+        "end_time": "2019-03-01T21:00:00",
+        "num_of_persons": 4,
+        "comment": "Window",
+        "status": "confirmed",
+    })
+    assert errors == {}
+    assert values["start_time"] == datetime(2019, 3, 1, 19)
+
+
+def test_validate_reports_every_invalid_field():
+    _, errors = bulk.validate(Reservation, {
+        "id": 1,
+        "start_time": 5,
+        "num_of_persons": "4",
+        "status": "unknown",
+        "color": "red",
+    })
+    assert set(errors) == {
+        "id", "start_time", "end_time", "num_of_persons", "comment",
+        "status", "color",
+    }
+
+
+def test_validate_partial_update_requires_primary_key():
+    assert bulk.validate(Reservation, {"comment": "Late"}, partial=True)[1] \
+        == {"id": "Missing data for required field"}
+    assert bulk.validate(
+        Reservation, {"id": 1, "comment": "Late"}, partial=True
+    ) == ({"id": 1, "comment": "Late"}, {})
+
+
+def test_validate_rejects_non_objects():
+    assert bulk.validate(Reservation, [1])[1] == {"_": "Not an object"}
+
+
+def test_links_are_split_from_items():
+    links = bulk.Links(field="table_ids", model=TableReservation,
+                       key="reservation_id", other_key="table_id",
+                       allowed={1, 2})
+    assert links.split({"comment": "x", "table_ids": [1, 2]}) == (
+        {"comment": "x"}, [1, 2], {})
+    assert links.split({"table_ids": [3]})[2] == {"table_ids": "Unknown ids"}
+    assert links.split({"table_ids": []})[2] == {
+        "table_ids": "Not a list of ids"}
+    assert links.split({})[2] == {"table_ids": "Not a list of ids"}
+    assert links.rows(7, [1, 2]) == [
+        {"reservation_id": 7, "table_id": 1},
+        {"reservation_id": 7, "table_id": 2},
+    ]
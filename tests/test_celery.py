@@ -0,0 +1,49 @@
+import pickle
+from datetime import datetime, timedelta
+from unittest import mock
+
+from timeless.celery import JitteredSchedule, beat_schedule
+
+
+def test_beat_schedule_of_poster_sync():
+    entries = beat_schedule({
+        "POSTER_SYNC_SCHEDULE": {"sync_all": 600},
+        "POSTER_SYNC_JITTER": 30,
+    })
+    entry = entries["poster-sync_all"]
+    assert entry["task"] == "timeless.poster.tasks.sync_all"
+    assert entry["schedule"].run_every == timedelta(seconds=600)
+    assert entry["schedule"].jitter == 30
+
+
+@mock.patch("timeless.celery.random.uniform", return_value=20)
+def test_jitter_delays_run(uniform_mock):
+    now = datetime(2019, 3, 1, 12, 0, 10)
+    schedule = JitteredSchedule(
+        timedelta(seconds=60), jitter=30, nowfun=lambda: now
+    )
+    assert not schedule.is_due(now - timedelta(seconds=70))[0]
+    assert schedule.is_due(now - timedelta(seconds=80))[0]
+    uniform_mock.assert_called_with(0, 30)
+
+
+def test_jittered_schedule_pickles():
+    schedule = JitteredSchedule(timedelta(seconds=60), jitter=30)
+    restored = pickle.loads(pickle.dumps(schedule))
+    assert restored.run_every == schedule.run_every
+    assert restored.jitter == 30
+
+
+def test_beat_schedule_of_mail_outbox():
+    entries = beat_schedule({"MAIL_OUTBOX_SCHEDULE": 60})
+    entry = entries["mail-send_pending"]
+    assert entry["task"] == "timeless.mail.tasks.send_pending"
+    assert entry["schedule"] == timedelta(seconds=60)
+    assert "mail-send_pending" not in beat_schedule({})
+    assert beat_schedule({"SMS_OUTBOX_SCHEDULE": 60})[
+        "sms-send_pending"]["task"] == "timeless.sms.tasks.send_pending"
+    assert beat_schedule({"REMINDER_SCHEDULE": 60})[
+        "reservations-send_reminders"]["task"] == (
+            "timeless.reservations.tasks.send_reminders")
+    assert beat_schedule({"REMINDER_RESCHEDULE": 3600})[
+        "reservations-schedule_reminders"]["schedule"] == timedelta(hours=1)
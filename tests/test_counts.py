@@ -0,0 +1,54 @@
+from unittest import mock
+
+from sqlalchemy.dialects import postgresql
+
+from timeless import counts
+from timeless.cache import invalidate
+from timeless.restaurants.models import Reservation
+from timeless.views import Page
+
+
+def test_explain_returns_json_plan():
+    statement = Reservation.query.filter(Reservation.id > 1).statement
+    sql = str(counts.Explain(statement).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT ")
+    assert sql.endswith("WHERE reservations.id > %(id_1)s")
+
+
+@mock.patch("timeless.counts.exact_count", return_value=12)
+@mock.patch("timeless.counts.table_estimate")
+def test_large_tables_are_estimated(table_estimate, exact_count, app):
+    strategy = counts.AdaptiveCount(exact_below=100)
+    table_estimate.return_value = 100000
+    assert strategy.compute(Reservation.query, Reservation) == counts.Count(
+        100000, estimated=True)
+    table_estimate.return_value = 20
+    assert strategy.compute(Reservation.query, Reservation) == counts.Count(12)
+
+
+@mock.patch("timeless.counts.plan_estimate", return_value=42)
+@mock.patch("timeless.counts.table_estimate")
+def test_filtered_queries_are_estimated_by_planner(table_estimate,
+                                                   plan_estimate, app):
+    query = Reservation.query.filter(Reservation.num_of_persons > 2)
+    count = counts.EstimatedCount().compute(query, Reservation)
+    assert count == counts.Count(42, estimated=True)
+    table_estimate.assert_not_called()
+
+
+def test_count_is_cached_until_model_changes(app):
+    strategy = counts.ExactCount()
+    query = Reservation.query.filter(Reservation.num_of_persons > 100)
+    with mock.patch("timeless.counts.exact_count", return_value=3) as exact:
+        assert strategy.count(query, Reservation) == counts.Count(3)
+        assert strategy.count(query, Reservation) == counts.Count(3)
+        assert exact.call_count == 1
+        invalidate(Reservation)
+        strategy.count(query, Reservation)
+        assert exact.call_count == 2
+
+
+def test_page_count():
+    page = Page(object_list=[], number=1, limit=10, has_next=False,
+                next_after=None, count=counts.Count(21))
+    assert page.page_count == 3
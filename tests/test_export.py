@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from timeless import export
+from timeless.restaurants.models import Reservation
+
+
+def test_csv_lines_start_with_header():
+    lines = export.csv_lines(
+        ["id", "start_time"], iter([(1, datetime(2019, 3, 1, 19))]))
+    assert next(lines) == "id,start_time\r\n"
+    assert list(lines) == ["1,2019-03-01T19:00:00\r\n"]
+
+
+def test_jsonl_lines():
+    lines = export.jsonl_lines(["id", "comment"], [(1, "a"), (2, None)])
+    assert list(lines) == [
+        '{"id": 1, "comment": "a"}\n', '{"id": 2, "comment": null}\n'
+    ]
+
+
+def test_rows_are_streamed(app):
+    query = export.stream_rows(
+        Reservation.query, export.columns(Reservation, ["id"]), 10)
+    assert query._execution_options["stream_results"]
+    assert str(query).startswith("SELECT reservations.id")
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from timeless.customers.models import Customer
+from timeless.filters import GenericFilter, compile_plans
+from timeless.restaurants.models import Reservation
+
+
+def where(model, *params):
+    query = GenericFilter(model).apply(model.query, params)
+    compiled = query.statement.compile(dialect=postgresql.dialect())
+    return str(compiled).split("WHERE ", 1)[-1], list(compiled.params.values())
+
+
+@pytest.mark.parametrize("param, condition, values", [
+    ("id=1", "customers.id = %(id_1)s", [1]),
+    ("id__in=1,2", "customers.id IN (%(id_1)s, %(id_2)s)", [1, 2]),
+    ("last_name__prefix=Bl%", "customers.last_name LIKE %(last_name_1)s "
+                              "ESCAPE '/'", ["Bl/%%"]),
+    ("first_name__ilike=o_h", "customers.first_name ILIKE %(first_name_1)s "
+                              "ESCAPE '/'", ["%o/_h%"]),
+])
+def test_filter_operators(param, condition, values, app):
+    assert where(Customer, param) == (condition, values)
+
+
+def test_date_range(app):
+    assert where(Reservation, "start_time__range=2019-03-01,2019-03-31") == (
+        "reservations.start_time BETWEEN %(start_time_1)s "
+        "AND %(start_time_2)s",
+        [datetime(2019, 3, 1), datetime(2019, 3, 31)])
+    assert where(Reservation, "start_time__range=,2019-03-31") == (
+        "reservations.start_time <= %(start_time_1)s",
+        [datetime(2019, 3, 31)])
+
+
+@pytest.mark.parametrize("param", [
+    "id=foo", "id__range=1", "id__range=,", "start_time__gte=tomorrow",
+])
+def test_invalid_values_are_rejected(param, app):
+    with pytest.raises(ValueError):
+        GenericFilter(Reservation).conditions([param])
+
+
+def test_unknown_fields_and_operators_are_skipped(app):
+    conditions = GenericFilter(Customer).conditions(
+        ["foobar=1", "id__prefix=1", "phone_number__gte=1"])
+    assert conditions == []
+
+
+def test_filter_subclass_restricts_operators(app):
+    class CustomerFilter(GenericFilter):
+        fields = ("last_name",)
+        operators = {"last_name": ("eq",)}
+
+    assert set(CustomerFilter(Customer).plans()) == {("last_name", "eq")}
+    assert compile_plans(CustomerFilter, Customer) is CustomerFilter(
+        Customer).plans()
@@ -0,0 +1,52 @@
+import io
+
+import pytest
+
+from timeless import imports
+from timeless.customers.models import Customer
+
+
+def test_copy_values_are_escaped():
+    assert imports.copy_value(None) == "\\N"
+    assert imports.copy_value(False) == "f"
+    assert imports.copy_value("a\tb\\c\nd") == "a\\tb\\\\c\\nd"
+
+
+def test_merge_keeps_last_row_of_key():
+    statement = imports.merge_statement(
+        "customers", "import_customers", ["poster_id", "first_name"],
+        "poster_id")
+    ordering = "poster_id, CASE WHEN poster_id IS NULL THEN import_line END"
+    assert f"DISTINCT ON ({ordering})" in statement
+    assert f"ORDER BY {ordering}, import_line DESC" in statement
+    assert statement.endswith(
+        "ON CONFLICT (poster_id) DO UPDATE SET "
+        "first_name = EXCLUDED.first_name")
+
+
+def test_merge_updates_allowed_rows_only():
+    statement = imports.merge_statement(
+        "tables", "import_tables", ["poster_id", "floor_id"], "poster_id",
+        {"floor_id": [2, 1], "location_id": []})
+    assert statement.endswith(
+        "DO UPDATE SET floor_id = EXCLUDED.floor_id "
+        "WHERE tables.floor_id IN (2, 1) AND FALSE")
+
+
+def test_imported_phones_are_normalized():
+    derived = imports.derivations(
+        Customer, ["first_name", "last_name", "phone_number"])
+    assert list(derived) == ["phone_normalized"]
+    assert imports.derive(derived, {"phone_number": "093 123 45 67"}) == {
+        "phone_normalized": "+380931234567"}
+    assert imports.derivations(
+        Customer, ["phone_number", "phone_normalized"]) == {}
+
+
+@pytest.mark.parametrize("header, error", [
+    ("id,first_name,last_name,phone_number", "Unknown columns: id"),
+    ("first_name,last_name", "Missing columns: phone_number"),
+])
+def test_invalid_header_is_rejected(header, error):
+    with pytest.raises(imports.CsvImportError, match=error):
+        imports.load(Customer, io.StringIO(header + "\n"))
@@ -79,7 +79,7 @@ def test_item_assign():
         user_status="active",
         email="meninblack@johnncash.com",
         password="carterjune",
-        pin_code=55,
+        pin_code="55",
         comment="A famous american country singer",
         company_id=223
     )
@@ -114,7 +114,7 @@ def test_item_assign_history():
         user_status="active",
         email="theking@king.com",
         password="theking",
-        pin_code=100,
+        pin_code="100",
         comment="Famous artist known as The King of Rock and Roll",
         company_id=company.id
     )
@@ -131,7 +131,7 @@ def test_item_assign_history():
         user_status="active",
         email="blueeyes@sinatra.com",
         password="nancy",
-        pin_code=55,
+        pin_code="55",
         comment="One of the most popular musical artists of the 20th century",
         company_id=company.id
     )
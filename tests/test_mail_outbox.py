@@ -0,0 +1,91 @@
+import smtplib
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+from timeless.mail import outbox
+from timeless.mail.models import OutgoingMail
+
+
+@pytest.fixture
+def smtp():
+    connection = mock.MagicMock()
+    with mock.patch("timeless.mail.outbox.connection",
+                    return_value=connection):
+        yield connection
+
+
+def mail(**kwargs):
+    return OutgoingMail(subject="Hello", recipients=["v@gmail.com"],
+                        attempts=0, status="pending", **kwargs)
+
+
+@mock.patch("timeless.mail.tasks.send_pending")
+@mock.patch("timeless.mail.outbox.DB")
+def test_enqueue_only_stores_message(db, send_pending, app):
+    queued = outbox.enqueue("Hello", ["v@gmail.com"], body="Text")
+    db.session.add.assert_called_once_with(queued)
+    db.session.commit.assert_called_once_with()
+    send_pending.delay.assert_called_once_with()
+    assert queued.recipients == ["v@gmail.com"]
+
+
+def test_delivered_message_is_sent(smtp, app):
+    sent = mail()
+    assert outbox.deliver([sent]) == 1
+    assert smtp.send.call_args[0][0].send_to == {"v@gmail.com"}
+    assert sent.status == "sent"
+    assert sent.attempts == 1
+    assert sent.sent_on is not None
+
+
+@pytest.mark.parametrize("error, status", (
+        (None, "sent"),
+        (smtplib.SMTPRecipientsRefused({}), "failed"),
+))
+def test_sensitive_message_content_is_removed(error, status, smtp, app):
+    smtp.send.side_effect = error
+    sensitive = mail(body="Password", sensitive=True)
+    sensitive.attempts = app.config["MAIL_MAX_ATTEMPTS"] - 1
+    with mock.patch("timeless.mail.outbox.close"):
+        outbox.deliver([sensitive])
+    assert smtp.send.call_args[0][0].body == "Password"
+    assert sensitive.status == status
+    assert sensitive.subject == outbox.REDACTED
+    assert sensitive.body is None
+
+
+def test_failed_message_is_retried_with_backoff(smtp, app):
+    smtp.send.side_effect = smtplib.SMTPServerDisconnected("closed")
+    failed = mail()
+    before = datetime.utcnow()
+    with mock.patch("timeless.mail.outbox.close") as close:
+        assert outbox.deliver([failed]) == 0
+        close.assert_called_once_with()
+    assert failed.status == "pending"
+    assert failed.last_error == "closed"
+    assert failed.next_attempt_on >= before + timedelta(
+        seconds=app.config["MAIL_RETRY_BACKOFF"])
+    assert outbox.retry_delay(3) == 4 * app.config["MAIL_RETRY_BACKOFF"]
+
+
+def test_message_fails_after_last_attempt(smtp, app):
+    smtp.send.side_effect = smtplib.SMTPRecipientsRefused({})
+    failed = mail()
+    failed.attempts = app.config["MAIL_MAX_ATTEMPTS"] - 1
+    outbox.deliver([failed])
+    assert failed.status == "failed"
+
+
+@mock.patch("timeless.mail.outbox.MAIL")
+def test_worker_connection_is_reused_until_closed(mail_mock, app):
+    connection = mail_mock.connect.return_value.__enter__.return_value
+    outbox.close()
+    assert outbox.connection() is connection
+    assert outbox.connection() is connection
+    assert mail_mock.connect.call_count == 1
+    connection.host.noop.side_effect = smtplib.SMTPServerDisconnected()
+    outbox.connection()
+    assert mail_mock.connect.call_count == 2
+    outbox.close()
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import asc, desc
+
+from timeless.customers.models import Customer
+from timeless.pagination import (
+    NEXT, PREV, decode_cursor, encode_cursor, keyset_condition, paginate,
+    parse_ordering)
+from timeless.restaurants.models import Reservation
+
+
+ORDERING = [(Reservation.start_time, desc), (Reservation.id, asc)]
+
+
+def test_keyset_condition():
+    condition = str(keyset_condition(ORDERING, [datetime.utcnow(), 5]))
+    assert "reservations.start_time < " in condition
+    assert "reservations.start_time = " in condition
+    assert "reservations.id > " in condition
+
+
+def test_keyset_condition_is_null_safe():
+    ordering = [(Customer.phone_normalized, asc), (Customer.id, asc)]
+    condition = str(keyset_condition(ordering, [None, 5]))
+    assert "> NULL" not in condition
+    assert "customers.phone_normalized IS NULL AND customers.id > " in (
+        condition)
+    condition = str(keyset_condition(ordering, ["+380931234567", 5]))
+    assert "OR customers.phone_normalized IS NULL" in condition
+
+
+def test_cursor_round_trip():
+    start_time = datetime(2019, 3, 1, 19, 30)
+    row = Reservation(id=7, start_time=start_time)
+    fields, values, way = decode_cursor(encode_cursor(ORDERING, row, PREV))
+    assert fields == ["-start_time", "id"]
+    assert values == [start_time.isoformat(), 7]
+    assert way == PREV
+
+
+@pytest.mark.parametrize("cursor", ("", "foo", "W10=", "eyJvIjpbXX0="))
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_cursor_must_match_ordering():
+    row = Reservation(id=7, start_time=datetime.utcnow())
+    cursor = encode_cursor(ORDERING, row, NEXT)
+    with pytest.raises(ValueError):
+        paginate(Reservation.query, [(Reservation.id, asc)], 10, cursor)
+
+
+def test_ordering_skips_attributes_that_are_not_columns():
+    assert parse_ordering(
+        Reservation, "-start_time,query,metadata,tables,unknown,id"
+    ) == [(Reservation.start_time, desc), (Reservation.id, asc)]
+    assert parse_ordering(Reservation, None) == []
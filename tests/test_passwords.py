@@ -0,0 +1,60 @@
+from unittest import mock
+
+import pytest
+
+from timeless.auth import passwords, throttle
+
+HASH_10_ROUNDS = (
+    "$bcrypt-sha256$2b,10$n79VH.0Q2TMWmt3Oqt9uku$"
+    "Kq4Noyk3094Y2QlB8NdRT8SvGiI4ft2")
+
+
+def test_hash_with_other_work_factor_needs_update():
+    assert passwords.handler(12).needs_update(HASH_10_ROUNDS)
+    assert not passwords.handler(10).needs_update(HASH_10_ROUNDS)
+
+
+@mock.patch("timeless.auth.passwords._hash", return_value="new hash")
+@mock.patch("timeless.auth.passwords._verify", return_value=True)
+def test_password_is_rehashed_on_login(verify, rehash, app):
+    app.config["PASSWORD_ROUNDS"] = 12
+    try:
+        assert passwords.verify_password("pass", HASH_10_ROUNDS) == (
+            True, "new hash")
+        rehash.assert_called_once_with("pass", 12)
+        app.config["PASSWORD_ROUNDS"] = 10
+        assert passwords.verify_password("pass", HASH_10_ROUNDS) == (
+            True, None)
+    finally:
+        app.config["PASSWORD_ROUNDS"] = 4
+
+
+@mock.patch("timeless.auth.passwords._verify", return_value=False)
+def test_wrong_password_is_not_rehashed(verify, app):
+    assert passwords.verify_password("wrong", HASH_10_ROUNDS) == (
+        False, None)
+
+
+def test_malformed_hash_does_not_verify():
+    assert not passwords._verify("pass", "pass")
+
+
+@pytest.fixture
+def throttling(app):
+    limit = app.config["LOGIN_MAX_FAILURES_PER_USERNAME"]
+    app.config["LOGIN_THROTTLE_WINDOW"] = 60
+    app.config["LOGIN_MAX_FAILURES_PER_USERNAME"] = 2
+    yield
+    app.config["LOGIN_THROTTLE_WINDOW"] = None
+    app.config["LOGIN_MAX_FAILURES_PER_USERNAME"] = limit
+
+
+def test_failed_logins_are_throttled(throttling):
+    throttle.reset(username="mallory", address="203.0.113.7")
+    subjects = {"username": "mallory", "address": "203.0.113.7"}
+    throttle.record_failure(username="Mallory", address="203.0.113.7")
+    assert not throttle.is_throttled(**subjects)
+    throttle.record_failure(**subjects)
+    assert throttle.is_throttled(**subjects)
+    throttle.reset(username="mallory")
+    assert not throttle.is_throttled(**subjects)
@@ -0,0 +1,35 @@
+import pytest
+
+from timeless.customers import phones
+from timeless.customers.models import Customer
+
+
+@pytest.mark.parametrize("number, normalized", [
+    ("+380 (93) 123-45-67", "+380931234567"),
+    ("093 123 45 67", "+380931234567"),
+    ("00380931234567", "+380931234567"),
+    ("+1-555-010-2000x123", "+15550102000"),
+    ("12-34", None),
+    ("not a number", None),
+    ("", None),
+])
+def test_normalize(number, normalized):
+    assert phones.normalize(number) == normalized
+
+
+def test_customer_phone_is_normalized_on_write():
+    customer = Customer(phone_number="093 123 45 67")
+    assert customer.phone_normalized == "+380931234567"
+    customer.phone_number = "+385 91 3628 1"
+    assert customer.phone_normalized == "+3859136281"
+
+
+def test_poster_customer_phone_is_normalized():
+    customer = Customer.create_by_poster({
+        "firstname": "First",
+        "lastname": "Last",
+        "phone_number": "+1 999 99 99",
+        "date_activate": None,
+        "client_id": 1,
+    })
+    assert customer.phone_normalized == "+19999999"
@@ -0,0 +1,49 @@
+from http import HTTPStatus
+
+import pytest
+
+from timeless.auth import throttle
+from timeless.employees import pins
+from timeless.employees.models import Employee
+
+TOKEN = "device-token"
+
+
+def test_pin_digest_is_keyed(app):
+    assert pins.digest("1234", key="one") != pins.digest("1234", key="two")
+    assert pins.digest("1234") == pins.digest("1234", key=app.config[
+        "PIN_SECRET_KEY"])
+    assert pins.digest(None) is None
+
+
+def test_pin_digest_follows_pin_code(app):
+    employee = Employee(pin_code="1234")
+    assert employee.pin_digest == pins.digest("1234")
+    employee.pin_code = "4321"
+    assert employee.pin_digest == pins.digest("4321")
+
+
+def test_leading_zeros_of_pin_codes_count(app):
+    employee = Employee(pin_code="0123")
+    assert employee.pin_code == "0123"
+    assert employee.pin_digest != pins.digest("123")
+
+
+@pytest.fixture
+def throttled_device(app):
+    app.config["LOGIN_THROTTLE_WINDOW"] = 60
+    device = pins.token_digest(TOKEN)
+    throttle.reset(device=device)
+    for _ in range(app.config["LOGIN_MAX_FAILURES_PER_DEVICE"]):
+        throttle.record_failure(device=device)
+    yield
+    throttle.reset(device=device)
+    app.config["LOGIN_THROTTLE_WINDOW"] = None
+
+
+def test_pin_login_of_throttled_device_is_refused(client, throttled_device):
+    response = client.post(
+        "/auth/pin", data={"pin_code": "1234"},
+        headers={"X-Device-Token": TOKEN})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.get_json() == {"error": "login.throttled"}
@@ -1,6 +1,10 @@
+from unittest import mock
+
 import pytest
 from tests.poster_mock import free_port, start_server
-from timeless.poster.api import Poster
+from timeless.poster.api import (
+    CachedAuthenticated, Poster, PosterAuthData, create_session
+)
 
 
 @pytest.fixture(scope='module')
@@ -25,3 +29,52 @@ def test_tables(poster):
 
 def test_customers(poster):
     assert poster.customers()["data"] == "test_data"
+
+
+def test_iter_customers_by_pages():
+    port = free_port()
+    customers = [{"client_id": str(index)} for index in range(5)]
+    start_server(port, customers={"response": customers})
+    poster = Poster(url=f"http://localhost:{port}", page_size=2)
+    with mock.patch.object(poster, "send", wraps=poster.send) as send:
+        assert list(poster.iter_customers()) == customers
+    assert send.call_count == 3
+
+
+def test_session_reuses_connections():
+    adapter = create_session(pool_size=4).get_adapter("https://joinposter.com")
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 3
+
+
+def test_cached_token():
+    class Cache(dict):
+        def set(self, key, value, timeout=None):
+            self[key] = value
+
+    origin = mock.Mock(
+        auth_data=PosterAuthData(
+            application_id="id", application_secret="secret",
+            redirect_uri="uri", code="code"
+        )
+    )
+    origin.auth.return_value = "token"
+    cached = CachedAuthenticated(origin, Cache())
+    assert cached.auth() == "token"
+    assert cached.auth() == "token"
+    origin.auth.assert_called_once()
+
+
+def test_rejected_token_is_renewed_once():
+    session = mock.Mock()
+    session.request.side_effect = [
+        mock.Mock(status_code=401), mock.Mock(status_code=200)
+    ]
+    authenticator = mock.Mock()
+    authenticator.auth.return_value = "new"
+    poster = Poster(auth_token="old", authenticator=authenticator,
+                    session=session)
+    poster.send(method=Poster.GET, action="clients.getLocations")
+    authenticator.invalidate.assert_called_once_with()
+    assert [call[1]["params"]["token"]
+            for call in session.request.call_args_list] == ["old", "new"]
@@ -0,0 +1,112 @@
+from datetime import datetime
+from unittest import mock
+
+from sqlalchemy.dialects import postgresql
+
+from timeless.customers.models import Customer
+from timeless.poster.sync import (
+    chunks, link_unsynchronized, poster_rows, upsert
+)
+from timeless.restaurants.models import Location, Table
+
+
+def test_chunks():
+    assert list(chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunks([], 2)) == []
+
+
+def test_poster_rows_are_converted_to_column_types():
+    rows = poster_rows(Table, [{
+        "id": "10",
+        "name": "Table",
+        "floor_id": "5",
+        "x": "800",
+        "y": "640",
+        "width": "200",
+        "height": "200",
+        "status": "2",
+        "max_capacity": "5",
+        "multiple": "0",
+        "playstation": "1",
+    }])
+    assert rows[0]["poster_id"] == 10
+    assert rows[0]["max_capacity"] == 5
+    assert rows[0]["multiple"] is False
+    assert rows[0]["playstation"] is True
+    assert rows[0]["shape_id"] is None
+
+
+def test_poster_rows_keep_last_duplicate():
+    customer = {
+        "client_id": "55",
+        "firstname": "John",
+        "lastname": "Doe",
+        "date_activate": "2017-10-09 15:28:14",
+        "phone_number": "79630313844",
+    }
+    rows = poster_rows(Customer, [customer, {**customer, "lastname": "Roe"}])
+    assert len(rows) == 1
+    assert rows[0]["last_name"] == "Roe"
+    assert rows[0]["created_on"] == datetime(2017, 10, 9, 15, 28, 14)
+
+
+def test_poster_rows_digest_is_stable():
+    customer = {
+        "client_id": "55",
+        "firstname": "John",
+        "lastname": "Doe",
+        "date_activate": "2017-10-09 15:28:14",
+        "phone_number": "79630313844",
+    }
+    first, = poster_rows(Customer, [customer])
+    second, = poster_rows(Customer, [dict(reversed(list(customer.items())))])
+    changed, = poster_rows(Customer, [{**customer, "lastname": "Roe"}])
+    assert first["poster_hash"] == second["poster_hash"]
+    assert first["poster_hash"] != changed["poster_hash"]
+
+
+@mock.patch("timeless.poster.sync.DB")
+def test_unsynchronized_rows_are_linked_by_unique_keys(db):
+    taken, by_name, by_code = mock.Mock(), mock.Mock(), mock.Mock()
+    taken.filter.return_value = []
+    by_name.filter.return_value = [(1, "Bar")]
+    by_code.filter.return_value = [(1, "B"), (2, "K")]
+    db.session.query.side_effect = [taken, by_name, by_code]
+    rows = [
+        {"poster_id": 10, "name": "Bar", "code": "B"},
+        {"poster_id": 20, "name": "Kitchen", "code": "K"},
+    ]
+    assert link_unsynchronized(Location, rows) == 2
+    db.session.bulk_update_mappings.assert_called_once_with(Location, [
+        {"id": 1, "poster_id": 10}, {"id": 2, "poster_id": 20}
+    ])
+    condition = str(by_name.filter.call_args[0][0])
+    assert "locations.poster_id IS NULL" in condition
+
+
+@mock.patch("timeless.poster.sync.DB")
+def test_poster_ids_are_linked_once(db):
+    taken, by_name, by_code = mock.Mock(), mock.Mock(), mock.Mock()
+    taken.filter.return_value = [(20,)]
+    by_name.filter.return_value = [(1, "Bar"), (3, "Kitchen")]
+    by_code.filter.return_value = [(2, "B")]
+    db.session.query.side_effect = [taken, by_name, by_code]
+    rows = [
+        {"poster_id": 10, "name": "Bar", "code": "B"},
+        {"poster_id": 20, "name": "Kitchen", "code": "K"},
+    ]
+    assert link_unsynchronized(Location, rows) == 1
+    db.session.bulk_update_mappings.assert_called_once_with(Location, [
+        {"id": 1, "poster_id": 10}
+    ])
+
+
+@mock.patch("timeless.poster.sync.DB")
+def test_upsert_keeps_company_of_locations(db):
+    upsert(Location, [{"poster_id": 10, "name": "Bar", "company_id": None}],
+           datetime.utcnow())
+    statement = str(db.session.execute.call_args[0][0].compile(
+        dialect=postgresql.dialect()))
+    update = statement.split("DO UPDATE SET")[1]
+    assert "name = excluded.name" in update
+    assert "company_id" not in update
@@ -0,0 +1,53 @@
+from unittest import mock
+
+import pytest
+
+from timeless.auth.principal import Principal, RolePrincipal, load_principal
+from timeless.cache import invalidate
+from timeless.employees.models import Employee
+from timeless.roles.models import Role, RoleType
+
+
+@pytest.fixture
+def principal_cache(app):
+    app.config["PRINCIPAL_CACHE_TIMEOUT"] = 60
+    yield
+    app.config["PRINCIPAL_CACHE_TIMEOUT"] = None
+
+
+def employee(employee_id=1):
+    return Employee(
+        id=employee_id, username="alice", company_id=2, account_status="A",
+        role=Role(id=3, name="director", role_type=RoleType.Director)
+    )
+
+
+def test_principal_of_employee():
+    principal = Principal.from_employee(employee())
+    assert principal == Principal(
+        id=1, username="alice", company_id=2, account_status="A",
+        role=RolePrincipal(id=3, name="director",
+                           role_type=RoleType.Director)
+    )
+    assert principal.role.is_director()
+    assert principal["username"] == "alice"
+
+
+@mock.patch.object(Employee, "query")
+def test_principal_is_cached_until_employees_change(query, app,
+                                                     principal_cache):
+    get = query.options.return_value.get
+    get.return_value = employee(employee_id=1001)
+    invalidate(Employee)
+    assert load_principal(1001).username == "alice"
+    assert load_principal(1001).username == "alice"
+    assert get.call_count == 1
+    invalidate(Employee)
+    load_principal(1001)
+    assert get.call_count == 2
+
+
+@mock.patch.object(Employee, "query")
+def test_missing_employee_has_no_principal(query, app, principal_cache):
+    query.options.return_value.get.return_value = None
+    assert load_principal(1002) is None
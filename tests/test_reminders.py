@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from redis import RedisError
+
+from timeless.cache import redis_client
+from timeless.db import DB
+from timeless.reservations import reminders
+
+
+@pytest.fixture
+def scheduled(app):
+    redis_client().delete(reminders.REMINDERS_KEY)
+    yield
+    redis_client().delete(reminders.REMINDERS_KEY)
+
+
+def test_only_upcoming_reservations_are_reminded():
+    now = datetime(2019, 3, 10, 12, 0)
+    later = now + timedelta(hours=2)
+    assert reminders.is_reminded("confirmed", later, now)
+    assert not reminders.is_reminded("canceled", later, now)
+    assert not reminders.is_reminded("confirmed", now, now)
+    assert not reminders.is_reminded(None, None, now)
+
+
+def test_changed_reservations_are_rescheduled(scheduled):
+    soon = datetime.utcnow() + timedelta(minutes=30)
+    later = datetime.utcnow() + timedelta(days=1)
+    reminders.schedule([(1, "confirmed", soon), (2, "unconfirmed", later),
+                        (3, "confirmed", soon)])
+    reminders.schedule([(3, "canceled", soon), (2, None, None)])
+    assert redis_client().zrange(reminders.REMINDERS_KEY, 0, -1) == [b"1"]
+
+
+def test_due_reservations_are_popped_once(scheduled):
+    soon = datetime.utcnow() + timedelta(minutes=30)
+    later = datetime.utcnow() + timedelta(days=1)
+    reminders.schedule([(1, "confirmed", soon), (2, "confirmed", later)])
+    until = datetime.utcnow() + timedelta(hours=1)
+    assert reminders.pop_due(until) == [1]
+    assert reminders.pop_due(until) == []
+    assert redis_client().zcard(reminders.REMINDERS_KEY) == 1
+
+
+@mock.patch("timeless.reservations.reminders.Reservation")
+def test_written_reservations_are_rescheduled_by_id(reservation, scheduled):
+    soon = datetime.utcnow() + timedelta(minutes=30)
+    reminders.schedule([(1, "confirmed", soon), (2, "confirmed", soon)])
+    reservation.query.filter.return_value.with_entities.return_value = [
+        (1, "canceled", soon), (3, "confirmed", soon)]
+    reminders.reschedule([1, 2, 3])
+    assert redis_client().zrange(reminders.REMINDERS_KEY, 0, -1) == [b"3"]
+
+
+@mock.patch("timeless.reservations.reminders.schedule",
+            side_effect=RedisError)
+def test_committed_writes_survive_redis_errors(schedule, app):
+    soon = datetime.utcnow() + timedelta(minutes=30)
+    with app.app_context():
+        DB.session.info[reminders.CHANGED_RESERVATIONS] = {
+            1: ("confirmed", soon)}
+        DB.session.commit()
+    schedule.assert_called_once()
+
+
+@mock.patch("timeless.reservations.reminders.outbox")
+@mock.patch("timeless.reservations.reminders.DB")
+@mock.patch("timeless.reservations.reminders.threshold", return_value=60)
+def test_due_reminders_are_queued_as_sms(threshold, db, outbox, scheduled):
+    start_time = datetime.utcnow() + timedelta(minutes=30)
+    reminders.schedule([(1, "confirmed", start_time)])
+    db.session.query.return_value.join.return_value.filter.return_value = [
+        ("confirmed", start_time, "+380931234567"),
+        ("confirmed", start_time, None),
+    ]
+    reminders.send_due()
+    messages = list(outbox.enqueue.call_args[0][0])
+    assert messages == [(
+        "+380931234567", reminders.MESSAGE.format(start_time=start_time))]
+
+
+@mock.patch("timeless.reservations.reminders.outbox")
+@mock.patch("timeless.reservations.reminders.DB")
+@mock.patch("timeless.reservations.reminders.threshold", return_value=60)
+def test_reminders_failing_to_be_queued_are_restored(threshold, db, outbox,
+                                                     scheduled):
+    start_time = datetime.utcnow() + timedelta(minutes=30)
+    reminders.schedule([(1, "confirmed", start_time)])
+    outbox.enqueue.side_effect = ConnectionError
+    with pytest.raises(ConnectionError):
+        reminders.send_due()
+    assert reminders.pop_due(start_time + timedelta(hours=1)) == [1]
+
+
+@mock.patch("timeless.reservations.reminders.outbox")
+@mock.patch("timeless.reservations.reminders.threshold", return_value=None)
+def test_reminders_are_dropped_when_disabled(threshold, outbox, scheduled):
+    reminders.schedule(
+        [(1, "confirmed", datetime.utcnow() + timedelta(seconds=1))])
+    with mock.patch("timeless.reservations.reminders.datetime") as clock:
+        clock.utcnow.return_value = datetime.utcnow() + timedelta(minutes=1)
+        assert reminders.send_due() == 0
+    outbox.enqueue.assert_not_called()
+    assert redis_client().zcard(reminders.REMINDERS_KEY) == 0
@@ -5,8 +5,8 @@ from timeless.sms import RedSMS
 
 
 @mock.patch("timeless.sms.datetime")
-@mock.patch("timeless.sms.requests")
-def test_red_sms_provider(requests_mock, timestamp_mock):
+@mock.patch("timeless.sms.shared_session")
+def test_red_sms_provider(session_mock, timestamp_mock):
     login = "test_login"
     api_key = "api_key"
     timestamp = 1549208808.562239
@@ -27,7 +27,7 @@ def test_red_sms_provider(requests_mock, timestamp_mock):
     )
     sms.send()
 
-    requests_mock.post.assert_called_with(
+    session_mock.return_value.post.assert_called_with(
         "https://cp.redsms.ru/api/message",
         data={
             "login": login,
@@ -37,20 +37,20 @@ def test_red_sms_provider(requests_mock, timestamp_mock):
             "text": message,
             "route": route,
             "from": sender,
-        }
+        },
+        timeout=10
     )
 
 
-@mock.patch("timeless.sms.requests")
-def test_retry_decorator_with_sms_sending(requests_mock):
-    sms = RedSMS(
+def test_red_sms_sends_to_several_recipients():
+    session = mock.Mock()
+    RedSMS(
         login="test_login",
         api_key="api_key",
-        recipient="recipient",
+        recipient=["+380931234567", "+380501234567"],
         message="message",
         sender="sender",
-    )
-    requests_mock.post.return_value = type(
-        'Response', (), {'status_code': 500})
-    sms.send()
-    assert requests_mock.post.call_count == 4
+        session=session,
+    ).send()
+    assert session.post.call_args[1]["data"]["to"] == (
+        "+380931234567,+380501234567")
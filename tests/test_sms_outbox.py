@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+import requests
+
+from timeless.sms import outbox
+from timeless.sms.models import OutgoingSMS
+
+
+def sms(recipient, message="Your table is ready"):
+    return OutgoingSMS(recipient=recipient, message=message, attempts=0,
+                       status="pending")
+
+
+@pytest.fixture
+def provider():
+    with mock.patch("timeless.sms.outbox.provider") as provider_mock:
+        yield provider_mock
+
+
+@mock.patch("timeless.sms.tasks.send_pending")
+@mock.patch("timeless.sms.outbox.DB")
+def test_enqueue_queues_task_per_batch(db, send_pending, app):
+    batch_size = app.config["SMS_BATCH_SIZE"]
+    messages = [(f"+38093{index:07}", "Hi") for index in range(batch_size + 1)]
+    assert outbox.enqueue(messages) == batch_size + 1
+    db.session.bulk_insert_mappings.assert_called_once_with(
+        OutgoingSMS, [
+            {"recipient": recipient, "message": message}
+            for recipient, message in messages
+        ])
+    db.session.commit.assert_called_once_with()
+    assert send_pending.delay.call_count == 2
+
+
+def test_same_messages_are_sent_in_bulk(provider, app):
+    provider.return_value.send.return_value = mock.Mock(status_code=200)
+    messages = [sms("+380931"), sms("+380932"), sms("+380933", "Other")]
+    assert outbox.deliver(messages) == 3
+    provider.assert_has_calls([
+        mock.call(["+380931", "+380932"], "Your table is ready"),
+        mock.call(["+380933"], "Other"),
+    ], any_order=True)
+    assert provider.call_count == 2
+    assert all(message.status == "sent" for message in messages)
+
+
+def test_bulk_is_split_by_provider_limit():
+    messages = [sms(f"+{index}") for index in range(outbox.PROVIDER
+                                                      .max_recipients + 1)]
+    assert [len(chunk) for chunk in outbox.chunks(messages)] == [
+        outbox.PROVIDER.max_recipients, 1]
+
+
+def test_unavailable_provider_is_retried_with_backoff(provider, app):
+    provider.return_value.send.return_value = mock.Mock(
+        status_code=503, text="Unavailable")
+    message = sms("+380931")
+    before = datetime.utcnow()
+    assert outbox.deliver([message]) == 0
+    assert message.status == "pending"
+    assert message.attempts == 1
+    assert message.last_error == "503: Unavailable"
+    assert message.next_attempt_on >= before + timedelta(
+        seconds=app.config["SMS_RETRY_BACKOFF"])
+    assert outbox.retry_delay(2) == 2 * app.config["SMS_RETRY_BACKOFF"]
+
+
+def test_connection_error_is_retried(provider, app):
+    provider.return_value.send.side_effect = requests.ConnectionError("down")
+    message = sms("+380931")
+    outbox.deliver([message])
+    assert message.status == "pending"
+    assert message.last_error == "down"
+
+
+def test_rejected_message_fails(provider, app):
+    provider.return_value.send.return_value = mock.Mock(
+        status_code=400, text="Bad number")
+    message = sms("+380931")
+    outbox.deliver([message])
+    assert message.status == "failed"
+
+
+def test_message_fails_after_last_attempt(provider, app):
+    provider.return_value.send.side_effect = requests.Timeout()
+    message = sms("+380931")
+    message.attempts = app.config["SMS_MAX_ATTEMPTS"] - 1
+    outbox.deliver([message])
+    assert message.status == "failed"
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+import pytest
+
+from timeless import values
+from timeless.restaurants.models import Table
+
+
+def test_parse_values():
+    columns = Table.__table__.columns
+    assert values.parse(columns.x, "12") == 12
+    assert values.parse(columns.multiple, "true") is True
+    assert values.parse(columns.floor_id, "") is None
+    assert values.parse(columns.created_on, "2019-03-01T19:00") == datetime(
+        2019, 3, 1, 19)
+
+
+@pytest.mark.parametrize("column, text, error", [
+    ("x", "", "Field may not be null"),
+    ("x", "a", "Not a valid int"),
+    ("multiple", "maybe", "Not a valid bool"),
+])
+def test_parse_invalid_values(column, text, error):
+    with pytest.raises(ValueError, match=error):
+        values.parse(Table.__table__.columns[column], text)
@@ -1,10 +1,13 @@
 """ Tests for CrudeAPIView. """
 import json
 from http import HTTPStatus
+from unittest import mock
 
 import pytest
 from werkzeug.exceptions import NotFound
 
+from timeless.auth.principal import Principal, RolePrincipal
+from timeless.roles.models import RoleType
 from timeless.views import FakeAPIView, FakeModel
 
 
@@ -87,3 +90,25 @@ def test_delete_object(app):
     assert json_result == {"some_id": FakeModel.FakeQuery.FAKE_OBJECT_ID, "some_attr": "attr"}, \
         "Wrong result returned from CrudeAPI view"
     assert result[1] == HTTPStatus.OK, "Wrong response from CrudeAPI view"
+
+
+@pytest.mark.parametrize("method", ("post", "put", "delete"))
+def test_bulk_requires_login(method, client):
+    response = getattr(client, method)(
+        "/api/reservations/bulk", json=[{"comment": "x"}])
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.parametrize("method", ("post", "put", "delete"))
+def test_bulk_requires_privilege(method, client):
+    intern = Principal(
+        id=1, username="intern", company_id=1, account_status="A",
+        role=RolePrincipal(id=1, name="other", role_type=RoleType.Intern)
+    )
+    with client.session_transaction() as session:
+        session["user_id"] = intern.id
+    with mock.patch("timeless.auth.views.load_principal",
+                    return_value=intern):
+        response = getattr(client, method)(
+            "/api/reservations/bulk", json=[{"comment": "x"}])
+    assert response.status_code == HTTPStatus.FORBIDDEN
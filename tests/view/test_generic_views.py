@@ -1,13 +1,25 @@
+from datetime import datetime
+from http import HTTPStatus
+from unittest import mock
+
 import pytest
+from werkzeug.exceptions import HTTPException
 
+from timeless.cache import invalidate
 from timeless.views import ListView
 from timeless.customers.models import Customer
+from timeless.restaurants.models import Location
 
 
 class TestListView(ListView):
     model = Customer
 
 
+class CachedListView(TestListView):
+    cache_timeout = 60
+    conditional = True
+
+
 @pytest.mark.parametrize("query_string,sql_query", (
         ("/?ordering=id,-first_name",
          "ORDER BY customers.id ASC, customers.first_name DESC"),
@@ -22,3 +34,204 @@ def test_view_ordering(query_string, sql_query, app):
     with app.test_request_context(query_string):
         query = view.sort_query(query)
         assert sql_query in str(query)
+
+
+@pytest.mark.parametrize("query_string,sql_query", (
+        ("/", "ORDER BY customers.id ASC"),
+        ("/?ordering=-first_name",
+         "ORDER BY customers.first_name DESC, customers.id ASC"),
+        ("/?ordering=-id", "ORDER BY customers.id DESC"),
+))
+def test_view_ordering_has_primary_key_tie_breaker(query_string, sql_query,
+                                                   app):
+    view = TestListView()
+    with app.test_request_context(query_string):
+        assert sql_query in str(view.sort_query(Customer.query))
+
+
+def test_view_filtering(app):
+    view = TestListView()
+    with app.test_request_context(
+            "/?filter_by=first_name=John&filter_by=foobar=1"):
+        query = str(view.filter_query(Customer.query))
+    assert "WHERE customers.first_name = " in query
+    assert "foobar" not in query
+
+
+def test_view_filter_with_invalid_value_is_bad_request(app):
+    view = TestListView()
+    with app.test_request_context("/?filter_by=id__in=1,foo"):
+        with pytest.raises(HTTPException) as error:
+            view.filter_query(Customer.query)
+    assert error.value.code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize("query_string,limit", (
+        ("/", TestListView.paginate_by),
+        ("/?limit=10", 10),
+        ("/?limit=0", 1),
+        ("/?limit=100000", TestListView.max_paginate_by),
+        ("/?limit=foo", TestListView.paginate_by),
+))
+def test_view_page_size_is_capped(query_string, limit, app):
+    view = TestListView()
+    with app.test_request_context(query_string):
+        assert view.get_paginate_by() == limit
+
+
+def test_view_offset_pagination(app, db_session):
+    for index in range(5):
+        db_session.add(Customer(
+            first_name=f"First {index}", last_name="Last",
+            phone_number=str(index)
+        ))
+    db_session.commit()
+    with app.test_request_context("/?limit=2&page=2&ordering=first_name"):
+        page = TestListView().get_page()
+    assert [customer.first_name for customer in page.object_list] == [
+        "First 2", "First 3"
+    ]
+    assert page.has_next
+    assert page.has_previous
+
+
+def test_view_keyset_pagination(app, db_session):
+    customers = [
+        Customer(first_name=name, last_name="Last", phone_number=name)
+        for name in ("C", "A", "B", "A")
+    ]
+    db_session.add_all(customers)
+    db_session.commit()
+    with app.test_request_context("/?limit=2&ordering=first_name"):
+        first_page = TestListView().get_page()
+    with app.test_request_context(
+            f"/?limit=2&ordering=first_name&after={first_page.next_after}"):
+        second_page = TestListView().get_page()
+    assert [customer.first_name for customer in first_page.object_list] == [
+        "A", "A"
+    ]
+    assert [customer.first_name for customer in second_page.object_list] == [
+        "B", "C"
+    ]
+    assert not second_page.has_next
+
+
+def test_view_keyset_pagination_goes_back(app, db_session):
+    db_session.add_all([
+        Customer(first_name=name, last_name="Last", phone_number=name)
+        for name in ("E", "D", "C", "B", "A")
+    ])
+    db_session.commit()
+    with app.test_request_context("/?limit=2&ordering=first_name"):
+        first_page = TestListView().get_page()
+    with app.test_request_context(
+            f"/?limit=2&ordering=first_name&page=2"
+            f"&after={first_page.next_after}"):
+        second_page = TestListView().get_page()
+    with app.test_request_context(
+            f"/?limit=2&ordering=first_name&page=1"
+            f"&before={second_page.previous_before}"):
+        previous_page = TestListView().get_page()
+    assert second_page.number == 2
+    assert second_page.has_previous
+    assert [customer.first_name for customer in second_page.object_list] == [
+        "C", "D"
+    ]
+    assert previous_page.number == 1
+    assert not previous_page.has_previous
+    assert previous_page.has_next
+    assert previous_page.object_list == first_page.object_list
+
+
+def test_view_response_is_cached_until_model_changes(app):
+    view = CachedListView()
+    render = mock.Mock(return_value="rendered")
+    with app.test_request_context("/?page=2"):
+        assert view.cached_response(render).get_data() == b"rendered"
+        assert view.cached_response(render).get_data() == b"rendered"
+        assert render.call_count == 1
+        invalidate(Customer)
+        view.cached_response(render)
+        assert render.call_count == 2
+
+
+def test_view_response_is_not_cached_by_default(app):
+    view = TestListView()
+    render = mock.Mock(return_value="rendered")
+    with app.test_request_context("/"):
+        view.cached_response(render)
+        view.cached_response(render)
+    assert render.call_count == 2
+
+
+def test_view_cache_key_depends_on_query_and_company(app):
+    view = CachedListView()
+    with app.test_request_context("/?page=1"):
+        first_page = view.get_cache_key()
+    with app.test_request_context("/?page=2"):
+        second_page = view.get_cache_key()
+    with app.test_request_context("/?page=2"):
+        app.preprocess_request()
+        with mock.patch("timeless.views.g") as g_mock:
+            g_mock.get.return_value = mock.Mock(company_id=2, id=1)
+            other_company = view.get_cache_key()
+    assert len({first_page, second_page, other_company}) == 3
+
+
+def test_view_not_modified_before_rendering(app):
+    view = CachedListView()
+    render = mock.Mock(return_value="rendered")
+    last_modified = datetime(2019, 3, 1, 12, 0)
+    with mock.patch.object(
+            view, "get_validators", return_value=("v1", last_modified)):
+        with app.test_request_context("/"):
+            response = view.conditional_response(render)
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["ETag"] == 'W/"v1"'
+        assert response.last_modified == last_modified
+        with app.test_request_context(
+                "/", headers={"If-None-Match": 'W/"v1"'}):
+            response = view.conditional_response(render)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        with app.test_request_context(
+                "/", headers={"If-None-Match": 'W/"v0"'}):
+            assert view.conditional_response(render).status_code == 200
+    assert render.call_count == 2
+
+
+def test_view_is_not_conditional_by_default(app):
+    view = TestListView()
+    render = mock.Mock(return_value="rendered")
+    with mock.patch.object(view, "get_validators") as validators:
+        with app.test_request_context("/"):
+            assert view.conditional_response(render) == "rendered"
+        validators.assert_not_called()
+
+
+def test_view_validators_do_not_count_rows(app):
+    view = CachedListView()
+    with mock.patch.object(view, "get_validator_query") as query:
+        query.return_value.order_by.return_value.with_entities \
+            .return_value.scalar.return_value = None
+        with app.test_request_context("/"):
+            first, _ = view.get_validators()
+            invalidate(Customer)
+            second, _ = view.get_validators()
+        columns = query.return_value.order_by.return_value \
+            .with_entities.call_args[0]
+    assert first != second
+    assert len(columns) == 1
+    assert "count" not in str(columns[0]).lower()
+
+
+def test_view_eager_loading_and_projection(app):
+    class LocationListView(ListView):
+        model = Location
+        eager = ("company", "floors")
+        only = ("id", "name")
+
+    options = LocationListView().get_load_options()
+    sql = str(Location.query.options(*options))
+    assert "LEFT OUTER JOIN companies" in sql
+    assert "JOIN floors" not in sql
+    assert "locations.comment" not in sql
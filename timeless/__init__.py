@@ -54,6 +54,9 @@ def initialize_extensions(app):
     import timeless.items.models
     import timeless.employees.models
     import timeless.companies.models
+    import timeless.mail.models
+    import timeless.sms.models
+    import timeless.reservations.reminders
     # initialize celery
     app.celery = make_celery(app)
 
@@ -76,6 +79,13 @@ def register_api(app, view, endpoint, url, pk="id", pk_type="int"):
         view_func=view_func,
         methods=["GET", "PUT", "DELETE"]
     )
+    app.add_url_rule(
+        "%sbulk" % url,
+        endpoint="%s_bulk" % endpoint,
+        defaults={"bulk": True},
+        view_func=view_func,
+        methods=["POST", "PUT", "DELETE"]
+    )
 
 
 def register_endpoints(app):
@@ -91,6 +101,7 @@ def register_endpoints(app):
     from timeless.items import views as items_views
     from timeless.schemetypes import views as schemetypes_views
     from timeless.employees import views as employees_views
+    from timeless.customers import views as customers_views
 
     app.register_blueprint(auth_views.BP)
     app.register_blueprint(tables_views.BP)
@@ -102,6 +113,7 @@ def register_endpoints(app):
     app.register_blueprint(reservations_views.BP)
     app.register_blueprint(schemetypes_views.BP)
     app.register_blueprint(employees_views.BP)
+    app.register_blueprint(customers_views.BP)
     register_api(
         app,
         companies_views.Resource,
@@ -111,10 +123,10 @@ def register_endpoints(app):
     )
     register_api(
         app,
-        reservations_views.ReservationsListView,
+        reservations_views.ReservationView,
         "reservations.api",
         "/api/reservations/",
-        pk="company_id"
+        pk="reservation_id"
     )
     register_api(
         app,
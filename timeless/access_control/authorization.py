@@ -3,6 +3,7 @@ from flask import g
 from timeless.access_control import (
     administrator_privileges, manager_privileges, other_privileges,
     owner_privileges, director_privileges, unknown_privileges)
+from timeless.access_control.scope import current_access
 
 
 def is_allowed(method=None, resource=None, *args, **kwargs) -> bool:
@@ -11,6 +12,8 @@ def is_allowed(method=None, resource=None, *args, **kwargs) -> bool:
     args or kwargs. This method is meant to work in conjunction with
     SecuredView.dispatch_request so that all available information about
     a user view can be accessible in the authorization process.
+    Decisions are memoized for the rest of the request, see
+    timeless.access_control.scope.
     @todo #358:30min Change checking of this statement below
      `name = g.user.role.name` to `name = g.user.role.role_type` and fix all
      tests, in all tests should be provided role_type instead of name of Role
@@ -26,9 +29,20 @@ def is_allowed(method=None, resource=None, *args, **kwargs) -> bool:
     else:
         name = g.user.role.name
 
-    return __roles[name].has_privilege(
-        method=method, resource=resource,  *args, **kwargs
-    )
+    decisions = current_access().decisions
+    key = (name, method, resource, args, tuple(sorted(kwargs.items())))
+    try:
+        return decisions[key]
+    except TypeError:
+        # unhashable arguments are not memoized
+        return __roles[name].has_privilege(
+            method=method, resource=resource,  *args, **kwargs
+        )
+    except KeyError:
+        decisions[key] = __roles[name].has_privilege(
+            method=method, resource=resource,  *args, **kwargs
+        )
+        return decisions[key]
 
 
 __roles = {
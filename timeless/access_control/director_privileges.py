@@ -1,6 +1,6 @@
 import flask
 
-from timeless.employees.models import Employee
+from timeless.access_control.scope import current_scope, scoped_access
 
 
 def has_privilege(method=None, resource=None, *args, **kwargs) -> bool:
@@ -30,10 +30,14 @@ def check_rights(method, employee_id, user):
     if employee_id == user.id:
         return True
     else:
-        other = Employee.query.get(employee_id)
-        return user.company_id == other.company_id and user.role.is_director()
+        other = current_scope().employee(employee_id)
+        return other is not None and user.role.is_director()
 
 
 __resources = {
-    "employee": __employee_access
+    "employee": __employee_access,
+    "reservation": scoped_access,
+    "table": scoped_access,
+    "customer": scoped_access,
+    "item": scoped_access
 }
@@ -1,6 +1,6 @@
 import flask
 
-from timeless.restaurants.models import Table
+from timeless.access_control.scope import current_scope
 
 
 def has_privilege(method=None, resource=None, *args, **kwargs) -> bool:
@@ -21,9 +21,7 @@ def __table_access(method=None, *args, **kwargs):
     permitted, user = False, flask.g.get("user")
     table_id = kwargs.get("id")
     if user and table_id:
-        location = Table.query.get(table_id).floor.location
-        if location.company_id == user.company_id:
-            permitted = True
+        permitted = current_scope().has_table(table_id)
     return permitted
 
 
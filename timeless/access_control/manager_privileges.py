@@ -1,7 +1,7 @@
 import flask
 
 from timeless.access_control.methods import Method
-from timeless.employees.models import Employee
+from timeless.access_control.scope import current_scope, scoped_access
 
 
 def has_privilege(method=None, resource=None, *args, **kwargs) -> bool:
@@ -26,9 +26,9 @@ def check_employee(employee_id, method, user):
     if employee_id == user.id:
         return True
 
-    employee = Employee.query.get(employee_id)
+    employee = current_scope().employee(employee_id)
 
-    if not employee or user.company_id != employee.company_id:
+    if not employee:
         # User cannot do anything if employee does not belong to his company
         return False
 
@@ -36,9 +36,13 @@ def check_employee(employee_id, method, user):
         return True
 
     # Manager can edit not own account only if it is a master or intern
-    return employee.role.is_master_or_intern()
+    return employee.is_master_or_intern()
 
 
 __resources = {
     "employee": __employee_access,
+    "reservation": scoped_access,
+    "table": scoped_access,
+    "customer": scoped_access,
+    "item": scoped_access
 }
@@ -5,7 +5,8 @@ import flask
 def has_privilege(*args, resource=None, **kwargs) -> bool:
     """Check if user with Master / Intern / Others role can access a
     particular resource."""
-    return __resources.get(resource, lambda *arg: False)(*args, **kwargs)
+    return __resources.get(
+        resource, lambda *arg, **kwargs: False)(*args, **kwargs)
 
 
 def __employee_access(*args, **kwargs):
@@ -1,8 +1,7 @@
 import flask
 
 from timeless.access_control.methods import Method
-from timeless.employees.models import Employee
-from timeless.restaurants.models import Location
+from timeless.access_control.scope import current_scope, scoped_access
 
 
 def has_privilege(method=None, resource=None, *args, **kwargs) -> bool:
@@ -12,22 +11,14 @@ def has_privilege(method=None, resource=None, *args, **kwargs) -> bool:
 
 
 def __location_access(method=None, *args, **kwargs):
-    user_company = flask.g.get("user").company_id
-    location_company = Location.query.get(kwargs.get("id")).company_id
-    return user_company == location_company
+    return current_scope().has_location(kwargs.get("id"))
 
 
 def __employee_access(method=None, *args, **kwargs):
-    user, employee_id = flask.g.user, kwargs.get("employee_id")
+    employee_id = kwargs.get("employee_id")
     if not employee_id:
         return True
-
-    employee = Employee.query.get(employee_id)
-
-    if not employee:
-        return False
-
-    return employee.company_id == user.company_id
+    return current_scope().employee(employee_id) is not None
 
 
 def __company_access(method=None, *args, **kwargs):
@@ -40,5 +31,9 @@ __resources = {
     "employee": __employee_access,
     "company": __company_access,
     "reservation_settings": __employee_access,
-    "reservation_comment": __employee_access
+    "reservation_comment": __employee_access,
+    "reservation": scoped_access,
+    "table": scoped_access,
+    "customer": scoped_access,
+    "item": scoped_access
 }
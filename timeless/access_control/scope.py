@@ -0,0 +1,121 @@
+"""Scope of the company of the logged in user, for access control.
+
+Privilege checks compare the company of a location, table or employee with
+the company of the user. Instead of loading every checked object, the ids
+of the locations, tables and employees of the company are loaded once, with
+one query each, and checks are set lookups. The scope is cached in CACHE
+with the versions of the data it is built from, and kept on g for the rest
+of the request, together with the decisions already taken by
+authorization.is_allowed.
+"""
+import attr
+from flask import current_app, g
+
+from timeless.cache import CACHE, version_key
+from timeless.employees.models import Employee
+from timeless.restaurants.models import Floor, Location, Table
+from timeless.roles.models import Role, RoleTypeMixin
+
+
+SCOPE_MODELS = (Location, Floor, Table, Employee, Role)
+
+
+@attr.s(frozen=True)
+class ScopedEmployee(RoleTypeMixin):
+    """ Employee of the company with the type of its role """
+    id = attr.ib()
+    role_type = attr.ib(default=None)
+
+
+@attr.s(frozen=True)
+class Scope:
+    """ Objects belonging to a company """
+    company_id = attr.ib()
+    location_ids = attr.ib(factory=frozenset)
+    table_ids = attr.ib(factory=frozenset)
+    employees = attr.ib(factory=dict)
+
+    def has_location(self, location_id):
+        """ Whether the location belongs to the company """
+        return location_id in self.location_ids
+
+    def has_table(self, table_id):
+        """ Whether the table is at a location of the company """
+        return table_id in self.table_ids
+
+    def employee(self, employee_id):
+        """ ScopedEmployee working at the company, None for others """
+        return self.employees.get(employee_id)
+
+
+@attr.s
+class Access:
+    """ Scope and decisions of the current request, for user """
+    user = attr.ib()
+    scope = attr.ib(default=None)
+    decisions = attr.ib(factory=dict)
+
+
+def build_scope(company_id):
+    """Load the scope of the company from the database."""
+    location_ids = frozenset(
+        location_id for location_id, in Location.query.filter(
+            Location.company_id == company_id
+        ).with_entities(Location.id)
+    )
+    table_ids = frozenset(
+        table_id for table_id, in Table.query.join(Floor).filter(
+            Floor.location_id.in_(location_ids)
+        ).with_entities(Table.id)
+    ) if location_ids else frozenset()
+    employees = {
+        employee_id: ScopedEmployee(employee_id, role_type)
+        for employee_id, role_type in Employee.query.outerjoin(
+            Employee.role
+        ).filter(
+            Employee.company_id == company_id
+        ).with_entities(Employee.id, Role.role_type)
+    }
+    return Scope(company_id, location_ids, table_ids, employees)
+
+
+def load_scope(company_id):
+    """Scope of the company, from the cache when none of the data it is
+    built from changed since it was cached."""
+    timeout = current_app.config.get("ACCESS_SCOPE_CACHE_TIMEOUT")
+    if timeout is None:
+        return build_scope(company_id)
+    key = f"access-scope:{company_id}"
+    cached, *versions = CACHE.get_many(
+        key, *[version_key(model.__tablename__) for model in SCOPE_MODELS])
+    versions = [version or "0" for version in versions]
+    if cached is not None and cached[0] == versions:
+        return cached[1]
+    scope = build_scope(company_id)
+    CACHE.set(key, (versions, scope), timeout=timeout)
+    return scope
+
+
+def current_access():
+    """Access state of the current request, renewed when g.user changes."""
+    user = g.get("user")
+    access = g.get("access")
+    if access is None or access.user is not user:
+        access = g.access = Access(user)
+    return access
+
+
+def scoped_access(method=None, *args, **kwargs):
+    """Privilege of resources read and written through queries restricted to
+    the scope of the company of the user, e.g. ReservationView.get_query:
+    any logged in user may use them."""
+    return g.get("user") is not None
+
+
+def current_scope():
+    """Scope of the company of the logged in user, loaded once per request.
+    """
+    access = current_access()
+    if access.scope is None:
+        access.scope = load_scope(getattr(access.user, "company_id", None))
+    return access.scope
@@ -3,13 +3,14 @@ import random
 import string
 
 
-from flask import session
-from passlib.handlers.bcrypt import bcrypt_sha256
+from flask import request, session
 
 from timeless import DB
+from timeless.auth import passwords, throttle
+from timeless.employees import pins
 from timeless.employees.models import Employee
-from timeless.mail import MAIL
-from flask_mail import Message
+from timeless.restaurants.models import Device, Location
+from timeless.mail import outbox
 
 
 PASS_LENGTH = 8
@@ -28,18 +29,58 @@ def mask_email(email: str) -> str:
 
 def login(username="", password=""):
     """Login user
-
+    Failed logins are throttled, see timeless.auth.throttle. The password
+    hash is replaced when it was made with another work factor.
     """
+    address = request.remote_addr or "unknown"
+    if throttle.is_throttled(username=username, address=address):
+        return "login.throttled"
     user = Employee.query.filter_by(username=username).first()
     error = None
-    if user is None or not verify(password, user.password):
+    if user is None:
         error = "login.failed"
+    else:
+        valid, new_hash = passwords.verify_password(password, user.password)
+        if not valid:
+            error = "login.failed"
+        elif new_hash is not None:
+            user.password = new_hash
+            DB.session.commit()
     if error is None:
+        throttle.reset(username=username)
         session.clear()
         session["user_id"] = user.id
+    else:
+        throttle.record_failure(username=username, address=address)
     return error
 
 
+def login_with_pin(device_token="", pin_code=""):
+    """Login employee with PIN code on a shared device of a location
+    The employee and the device are found with a single query by the digests
+    of the PIN code and of the device token, the employee must work for the
+    company of the device location. Failed logins are throttled per device
+    and per client address.
+    """
+    address = request.remote_addr or "unknown"
+    device_digest = pins.token_digest(device_token)
+    if throttle.is_throttled(device=device_digest, address=address):
+        return "login.throttled"
+    found = DB.session.query(Employee.id, Device.id).join(
+        Location, Location.company_id == Employee.company_id
+    ).join(Device, Device.location_id == Location.id).filter(
+        Employee.pin_digest == pins.digest(pin_code),
+        Device.token_digest == device_digest
+    ).first()
+    if found is None:
+        throttle.record_failure(device=device_digest, address=address)
+        return "login.failed"
+    throttle.reset(device=device_digest)
+    session.clear()
+    session["user_id"], session["device_id"] = found
+    return None
+
+
 def forgot_password(email=""):
     """ Handle the forgot password routine. """
     user = Employee.query.filter_by(email=email).first()    
@@ -49,13 +90,13 @@ def forgot_password(email=""):
     password = "".join(random.choice(
             string.ascii_uppercase + string.digits
         ) for _ in range(PASS_LENGTH))
-    user.password = bcrypt_sha256.hash(password)
+    user.password = hash(password)
     DB.session.commit()
-    MAIL.send(
-        Message(
-            f"Hello! your new password is {password}, please change it!",
-            recipients=[email]
-        )
+    outbox.enqueue(
+        "Your new password",
+        recipients=[email],
+        body=f"Hello! your new password is {password}, please change it!",
+        sensitive=True
     )
     session.clear()
 
@@ -67,7 +108,8 @@ def verify(password, hash):
     :param hash: Hash to check password against
     :return: True in case of successful password verification
     """
-    return bcrypt_sha256.verify(password, hash)
+    valid, _ = passwords.verify_password(password, hash)
+    return valid
 
 
 def hash(password):
@@ -76,4 +118,4 @@ def hash(password):
     :param password: Password to hash
     :return: Hashed password
     """
-    return bcrypt_sha256.hash(password)
+    return passwords.hash_password(password)
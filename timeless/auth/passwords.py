@@ -0,0 +1,76 @@
+"""Password hashing off the request thread.
+
+bcrypt is CPU bound and holds the GIL, so hashing on the web worker stalls
+every other request it serves. Passwords are hashed and verified in a
+process pool of PASSWORD_WORKERS processes instead, and at most twice as
+many requests of a worker wait for it at a time. The work factor is
+PASSWORD_ROUNDS, hashes made with another one are replaced when their
+password is verified. With PASSWORD_WORKERS set to 0 hashing runs inline.
+"""
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from flask import current_app
+from passlib.handlers.bcrypt import bcrypt_sha256
+
+
+@lru_cache(maxsize=None)
+def handler(rounds):
+    """bcrypt_sha256 hashing with rounds, other rounds need update."""
+    return bcrypt_sha256.using(
+        rounds=rounds, min_desired_rounds=rounds, max_desired_rounds=rounds)
+
+
+@lru_cache(maxsize=None)
+def __pool(workers):
+    pool = ProcessPoolExecutor(max_workers=workers)
+    return pool, threading.BoundedSemaphore(workers * 2)
+
+
+def _hash(password, rounds):
+    return handler(rounds).hash(password)
+
+
+def _verify(password, hashed):
+    try:
+        return bcrypt_sha256.verify(password, hashed)
+    except ValueError:
+        # not a bcrypt_sha256 hash
+        return False
+
+
+def run(function, *args):
+    """Run function in the process pool, wait for its result."""
+    workers = current_app.config["PASSWORD_WORKERS"]
+    if not workers:
+        return function(*args)
+    pool, pending = __pool(workers)
+    with pending:
+        return pool.submit(function, *args).result()
+
+
+def hash_password(password):
+    """
+    Hash password with the configured work factor
+    :param password: Password to hash
+    :return: Hashed password
+    """
+    return run(_hash, password, current_app.config["PASSWORD_ROUNDS"])
+
+
+def verify_password(password, hashed):
+    """
+    Verify password against hash, and rehash it when the hash was made with
+    another work factor.
+    :param password: Password to check
+    :param hashed: Hash to check password against
+    :return: Tuple of the result and the new hash, None when the hash is
+     up to date or the password is wrong
+    """
+    if not run(_verify, password, hashed):
+        return False, None
+    rounds = current_app.config["PASSWORD_ROUNDS"]
+    if handler(rounds).needs_update(hashed):
+        return True, run(_hash, password, rounds)
+    return True, None
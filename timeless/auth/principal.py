@@ -0,0 +1,91 @@
+"""Compact identity of the logged in employee.
+
+Authorization needs a few fields of the employee and of its role on every
+request. They are kept in a Principal cached in CACHE, together with the
+versions of employees and roles data, so a request gets them with a single
+cache read and no query. Any change of an employee or a role makes cached
+principals stale. Views which need the Employee object itself load it with
+current_employee().
+"""
+import attr
+from flask import current_app, g
+from sqlalchemy.orm import joinedload
+
+from timeless.cache import CACHE, version_key
+from timeless.employees.models import Employee
+from timeless.roles.models import Role, RoleTypeMixin
+
+
+@attr.s(frozen=True)
+class RolePrincipal(RoleTypeMixin):
+    """ Role of a Principal """
+    id = attr.ib()
+    name = attr.ib()
+    role_type = attr.ib()
+
+
+@attr.s(frozen=True)
+class Principal:
+    """ Fields of the logged in employee needed by authorization """
+    id = attr.ib()
+    username = attr.ib()
+    company_id = attr.ib()
+    account_status = attr.ib()
+    role = attr.ib(default=None)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    @classmethod
+    def from_employee(cls, employee):
+        """ Principal of the employee """
+        role = employee.role
+        return cls(
+            id=employee.id,
+            username=employee.username,
+            company_id=employee.company_id,
+            account_status=employee.account_status,
+            role=role and RolePrincipal(
+                id=role.id, name=role.name, role_type=role.role_type)
+        )
+
+
+def principal_key(employee_id):
+    """ Cache key of the principal of the employee """
+    return f"principal:{employee_id}"
+
+
+def load_principal(employee_id):
+    """Principal of the employee, from the cache when neither employees nor
+    roles changed since it was cached, None when there is no such employee.
+    """
+    timeout = current_app.config.get("PRINCIPAL_CACHE_TIMEOUT")
+    if timeout is None:
+        employee = Employee.query.get(employee_id)
+        return employee and Principal.from_employee(employee)
+    key = principal_key(employee_id)
+    cached, *versions = CACHE.get_many(
+        key,
+        version_key(Employee.__tablename__),
+        version_key(Role.__tablename__)
+    )
+    versions = [version or "0" for version in versions]
+    if cached is not None and cached[0] == versions:
+        return cached[1]
+    employee = Employee.query.options(
+        joinedload(Employee.role)
+    ).get(employee_id)
+    if employee is None:
+        return None
+    principal = Principal.from_employee(employee)
+    CACHE.set(key, (versions, principal), timeout=timeout)
+    return principal
+
+
+def current_employee():
+    """Employee object of the logged in user, loaded once per request."""
+    if not g.get("user"):
+        return None
+    if "employee" not in g:
+        g.employee = Employee.query.get(g.user.id)
+    return g.employee
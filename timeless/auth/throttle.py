@@ -0,0 +1,63 @@
+"""Throttling of failed logins.
+
+Failed logins are counted in redis for LOGIN_THROTTLE_WINDOW seconds, per
+subject of the login: its username, client address or PIN device. Once a
+count reaches the limit of its subject, logins are refused before the
+credentials are checked, so guessing passwords can not make the server hash
+them without end. A successful login resets the count of its username or
+device. Throttling is disabled while LOGIN_THROTTLE_WINDOW is None.
+"""
+from flask import current_app
+
+from timeless.cache import redis_client
+
+
+LIMITS = {
+    "username": "LOGIN_MAX_FAILURES_PER_USERNAME",
+    "address": "LOGIN_MAX_FAILURES_PER_ADDRESS",
+    "device": "LOGIN_MAX_FAILURES_PER_DEVICE",
+}
+
+
+def failure_key(subject, value):
+    """Redis key of the count of failed logins of a subject."""
+    return f"login-failures:{subject}:{str(value).lower()}"
+
+
+def enabled():
+    """Whether failed logins are throttled."""
+    return current_app.config.get("LOGIN_THROTTLE_WINDOW") is not None
+
+
+def is_throttled(**subjects):
+    """Whether logins of the subjects are refused, e.g.
+    is_throttled(username="alice", address="192.0.2.1")."""
+    if not enabled():
+        return False
+    counts = redis_client().mget(
+        [failure_key(subject, value) for subject, value in subjects.items()])
+    return any(
+        int(count or 0) >= current_app.config[LIMITS[subject]]
+        for subject, count in zip(subjects, counts)
+    )
+
+
+def record_failure(**subjects):
+    """Count a failed login of the subjects."""
+    if not enabled():
+        return
+    window = current_app.config["LOGIN_THROTTLE_WINDOW"]
+    pipeline = redis_client().pipeline()
+    for subject, value in subjects.items():
+        key = failure_key(subject, value)
+        pipeline.incr(key)
+        pipeline.expire(key, window)
+    pipeline.execute()
+
+
+def reset(**subjects):
+    """Forget failed logins of the subjects."""
+    if enabled():
+        redis_client().delete(*[
+            failure_key(subject, value) for subject, value in subjects.items()
+        ])
@@ -2,11 +2,13 @@
 Auth views module.
 """
 from functools import wraps
+from http import HTTPStatus
 from flask import (
-    Blueprint, flash, g, redirect, render_template, request, session, url_for
+    Blueprint, abort, flash, g, jsonify, redirect, render_template, request, session,
+    url_for
 )
 from timeless.auth import auth
-from timeless.employees.models import Employee
+from timeless.auth.principal import current_employee, load_principal
 from timeless import DB
 
 BP = Blueprint("auth", __name__, url_prefix="/auth")
@@ -14,11 +16,13 @@ BP = Blueprint("auth", __name__, url_prefix="/auth")
 
 @BP.before_app_request
 def load_logged_in_user():
+    """Set g.user to the Principal of the logged in employee. Static files
+    do not need it."""
     user_id = session.get("user_id")
-    if not user_id:
+    if not user_id or request.endpoint == "static":
         g.user = None
     else:
-        g.user = Employee.query.get(user_id)
+        g.user = load_principal(user_id)
 
 
 def login_required(view):
@@ -31,6 +35,18 @@ def login_required(view):
     return wrapped_view
 
 
+def api_login_required(view):
+    """login_required for json APIs, anonymous requests are answered with
+    401 instead of a redirect to the login page."""
+    @wraps(view)
+    def wrapped_view(**kwargs):
+        if not g.user:
+            abort(HTTPStatus.UNAUTHORIZED)
+        return view(**kwargs)
+
+    return wrapped_view
+
+
 @BP.route("/login", methods=("GET", "POST"))
 def login():
     if request.method == "POST":
@@ -43,6 +59,22 @@ def login():
     return render_template("auth/login.html")
 
 
+@BP.route("/pin", methods=("POST",))
+def pin_login():
+    """Switch the employee of a shared location device by PIN code. The
+    device sends the token it was registered with in the X-Device-Token
+    header, or in the device_token form field."""
+    error = auth.login_with_pin(
+        device_token=request.headers.get(
+            "X-Device-Token", request.form.get("device_token", "")),
+        pin_code=request.form.get("pin_code", ""))
+    if error == "login.throttled":
+        return jsonify(error=error), HTTPStatus.TOO_MANY_REQUESTS
+    if error is not None:
+        return jsonify(error=error), HTTPStatus.UNAUTHORIZED
+    return jsonify(user_id=session["user_id"]), HTTPStatus.OK
+
+
 @BP.route("/logout")
 def logout():
     session.clear()
@@ -75,7 +107,7 @@ def activate():
     if not session.get("user_id"):
         return render_template("auth/activate.html")
 
-    g.user.account_status = True
+    current_employee().account_status = True
     DB.session.commit()
     return render_template(
         "auth/activate.html",
@@ -0,0 +1,278 @@
+"""Bulk writes of objects received as json by the API views.
+
+Every item of a bulk request is validated in one pass, then all valid items
+are written in a single transaction with multi-row statements: INSERT ...
+RETURNING for creation, bulk_update_mappings for update and DELETE ... WHERE
+id IN (...) for deletion. The result of every item is
+reported with an http status, so one invalid item does not reject the
+others. Bulk statements bypass ORM events, so cached results of the model
+are invalidated explicitly.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from http import HTTPStatus
+
+import attr
+from dateutil.parser import isoparse
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy_utils import ChoiceType
+
+from timeless.cache import invalidate
+from timeless.db import DB
+
+
+@attr.s
+class ItemResult:
+    """ Result of a single item of a bulk request """
+    index = attr.ib()
+    status = attr.ib()
+    id = attr.ib(default=None)
+    errors = attr.ib(default=None)
+
+    def to_json(self):
+        """ Json serializable dict without empty fields """
+        return attr.asdict(self, filter=lambda _, value: value is not None)
+
+
+@attr.s
+class Links:
+    """ Rows of an association model written with every created object,
+    e.g. the tables of reservations. The ids of the other side are listed
+    in field of every item, only allowed ones are accepted. """
+    field = attr.ib()
+    model = attr.ib()
+    key = attr.ib()
+    other_key = attr.ib()
+    allowed = attr.ib(default=None)
+
+    def split(self, item):
+        """
+        Separate the listed ids from the item.
+        :return: Tuple with the item without them, the ids and their errors
+        """
+        if not isinstance(item, dict):
+            return item, [], {}
+        item = dict(item)
+        ids = item.pop(self.field, None)
+        if not isinstance(ids, list) or not ids or not all(
+                isinstance(other, int) and not isinstance(other, bool)
+                for other in ids):
+            return item, [], {self.field: "Not a list of ids"}
+        if self.allowed is not None and not set(ids) <= set(self.allowed):
+            return item, [], {self.field: "Unknown ids"}
+        return item, ids, {}
+
+    def rows(self, key, ids):
+        """ Association rows of the object with the given key """
+        return [{self.key: key, self.other_key: other} for other in ids]
+
+
+def primary_key(model):
+    """ Primary key column of the model """
+    return model.__mapper__.primary_key[0]
+
+
+def parse(column, value):
+    """Convert json value to the python type of the column.
+    :raise ValueError: When the value does not fit the column
+    """
+    if value is None:
+        if not column.nullable:
+            raise ValueError("Field may not be null")
+        return None
+    if isinstance(column.type, ChoiceType):
+        if value not in dict(column.type.choices):
+            raise ValueError("Not a valid choice")
+        return value
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type in (datetime, date):
+        if not isinstance(value, str):
+            raise ValueError("Not a valid date")
+        parsed = isoparse(value)
+        return parsed if python_type is datetime else parsed.date()
+    if python_type is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, python_type) or (
+            isinstance(value, bool) and python_type is not bool):
+        raise ValueError(f"Not a valid {python_type.__name__}")
+    return value
+
+
+def validate(model, item, partial=False):
+    """Validate json item as column values of model.
+    :param model: Model the item is written to
+    :param item: Json item
+    :param partial: Only the given fields are validated, the primary key is
+     required, otherwise it is forbidden and all required fields are checked
+    :return: Tuple with column values and dict of errors by field
+    """
+    if not isinstance(item, dict):
+        return {}, {"_": "Not an object"}
+    columns = model.__table__.columns
+    key = primary_key(model).key
+    values, errors = {}, {}
+    for name, value in item.items():
+        if name not in columns:
+            errors[name] = "Unknown field"
+            continue
+        try:
+            values[name] = parse(columns[name], value)
+        except ValueError as error:
+            errors[name] = str(error)
+    if partial:
+        if key not in item:
+            errors[key] = "Missing data for required field"
+        return values, errors
+    if key in item:
+        errors[key] = "Field is assigned by the database"
+    for column in columns:
+        if column.key != key and column.key not in item and not (
+                column.nullable or column.default is not None
+                or column.server_default is not None):
+            errors[column.key] = "Missing data for required field"
+    return values, errors
+
+
+def write(model, results, statement):
+    """Run statement writing the valid items in its own transaction. When it
+    fails because of stored data, these items are reported as conflicting.
+    """
+    written = [result for result in results if result.errors is None]
+    if not written:
+        return results
+    try:
+        statement(written)
+        DB.session.commit()
+    except IntegrityError:
+        DB.session.rollback()
+        for result in written:
+            result.status = HTTPStatus.CONFLICT
+            result.errors = {"_": "Conflicts with stored data"}
+        return results
+    invalidate(model)
+    return results
+
+
+def create(model, items, links=None):
+    """Insert valid items with a multi-row statement, one per set of given
+    fields.
+    :param links: Links written in the same transaction, with one more
+     multi-row statement
+    :return: List of ItemResult, with ids of created objects
+    """
+    rows, results = [], []
+    for index, item in enumerate(items):
+        linked, link_errors = [], {}
+        if links is not None:
+            item, linked, link_errors = links.split(item)
+        values, errors = validate(model, item)
+        errors.update(link_errors)
+        if errors:
+            results.append(ItemResult(index, HTTPStatus.BAD_REQUEST,
+                                      errors=errors))
+        else:
+            rows.append((values, linked))
+            results.append(ItemResult(index, HTTPStatus.CREATED))
+
+    def statement(written):
+        # Rows of a multi-row INSERT must have the same fields
+        groups = defaultdict(list)
+        for result, row in zip(written, rows):
+            groups[frozenset(row[0])].append((result, row))
+        link_rows = []
+        for group in groups.values():
+            keys = DB.session.execute(
+                insert(model.__table__).values(
+                    [values for _, (values, _) in group]
+                ).returning(primary_key(model))
+            ).fetchall()
+            for (result, (_, linked)), (key,) in zip(group, keys):
+                result.id = key
+                if links is not None:
+                    link_rows.extend(links.rows(key, linked))
+        if link_rows:
+            DB.session.execute(insert(links.model.__table__).values(link_rows))
+    return write(model, results, statement)
+
+
+def existing_query(model, query=None):
+    """Query of the primary keys of objects which can be written, all
+    objects of model unless query restricts them."""
+    key = primary_key(model)
+    if query is None:
+        return DB.session.query(key)
+    return query.with_entities(key)
+
+
+def update(model, items, query=None):
+    """Update valid items of existing objects with bulk_update_mappings.
+    :param query: Query of the objects which can be updated, others are
+     not found
+    :return: List of ItemResult
+    """
+    key = primary_key(model)
+    validated = [validate(model, item, partial=True) for item in items]
+    existing = {
+        found for found, in existing_query(model, query).filter(key.in_([
+            values[key.key] for values, errors in validated
+            if key.key in values
+        ]))
+    }
+    rows, results = [], []
+    for index, (values, errors) in enumerate(validated):
+        if errors:
+            results.append(ItemResult(index, HTTPStatus.BAD_REQUEST,
+                                      errors=errors))
+        elif values[key.key] not in existing:
+            results.append(ItemResult(index, HTTPStatus.NOT_FOUND,
+                                      id=values[key.key],
+                                      errors={key.key: "Not found"}))
+        else:
+            rows.append(values)
+            results.append(ItemResult(index, HTTPStatus.OK,
+                                      id=values[key.key]))
+
+    def statement(_):
+        DB.session.bulk_update_mappings(model, rows)
+    return write(model, results, statement)
+
+
+def delete(model, ids, query=None):
+    """Delete existing objects with a single statement.
+    :param ids: Primary keys of the objects
+    :param query: Query of the objects which can be deleted, others are not
+     found
+    :return: List of ItemResult
+    """
+    key = primary_key(model)
+    valid = [
+        isinstance(object_id, int) and not isinstance(object_id, bool)
+        for object_id in ids
+    ]
+    existing = {
+        found for found, in existing_query(model, query).filter(key.in_([
+            object_id for object_id, is_valid in zip(ids, valid) if is_valid
+        ]))
+    }
+    results = []
+    for index, (object_id, is_valid) in enumerate(zip(ids, valid)):
+        if not is_valid:
+            results.append(ItemResult(index, HTTPStatus.BAD_REQUEST,
+                                      errors={key.key: "Not a valid int"}))
+        elif object_id not in existing:
+            results.append(ItemResult(index, HTTPStatus.NOT_FOUND,
+                                      id=object_id,
+                                      errors={key.key: "Not found"}))
+        else:
+            results.append(ItemResult(index, HTTPStatus.NO_CONTENT,
+                                      id=object_id))
+
+    def statement(written):
+        DB.session.query(model).filter(
+            key.in_([result.id for result in written])
+        ).delete(synchronize_session=False)
+    return write(model, results, statement)
@@ -1,4 +1,85 @@
-""" CACHE module """
+""" CACHE module
+
+Data of models is versioned in the cache, cached results depending on a
+model include its version in their keys. Whenever rows of a model are
+inserted, updated or deleted through the ORM, its version changes once the
+transaction is committed, so results cached before are never read again and
+expire by themselves. Rows written with bulk statements bypass ORM events,
+the code writing them calls invalidate() itself.
+"""
+from functools import lru_cache
+from uuid import uuid4
+
+from flask import current_app
 from flask_caching import Cache
+import redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from timeless.db import DB
 
 CACHE = Cache()
+
+CHANGED_TABLES = "timeless_changed_tables"
+
+
+@lru_cache(maxsize=None)
+def __connection_pool(url):
+    return redis.ConnectionPool.from_url(url)
+
+
+def redis_client():
+    """Redis client connected to REDIS_HOST of the current application,
+    clients share the connection pool of the process."""
+    return redis.Redis(
+        connection_pool=__connection_pool(current_app.config["REDIS_HOST"])
+    )
+
+
+def version_key(table_name):
+    """Cache key of the version of table data."""
+    return f"table-version:{table_name}"
+
+
+def model_versions(models):
+    """Current versions of the data of models.
+    :param models: Sequence of models
+    :return: List of versions, in the order of models
+    """
+    keys = [version_key(model.__tablename__) for model in models]
+    return [version or "0" for version in CACHE.get_many(*keys)]
+
+
+def invalidate(*models):
+    """Change versions of models, so results cached for them expire."""
+    invalidate_tables(model.__tablename__ for model in models)
+
+
+def invalidate_tables(table_names):
+    """Change versions of tables, so results cached for them expire."""
+    CACHE.set_many(
+        {version_key(name): uuid4().hex for name in table_names}, timeout=0
+    )
+
+
+@event.listens_for(DB.Model, "after_insert", propagate=True)
+@event.listens_for(DB.Model, "after_update", propagate=True)
+@event.listens_for(DB.Model, "after_delete", propagate=True)
+def __remember_changed_table(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(CHANGED_TABLES, set()).add(
+            mapper.local_table.name
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def __invalidate_changed_tables(session):
+    changed = session.info.pop(CHANGED_TABLES, None)
+    if changed:
+        invalidate_tables(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def __forget_changed_tables(session):
+    session.info.pop(CHANGED_TABLES, None)
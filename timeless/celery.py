@@ -1,4 +1,8 @@
+import random
+from datetime import timedelta
+
 from celery import Celery
+from celery.schedules import schedule
 
 
 def make_celery(app):
@@ -8,6 +12,7 @@ def make_celery(app):
         broker=app.config["BROKER_URL"]
     )
     celery.conf.update(app.config)
+    celery.conf.update(CELERYBEAT_SCHEDULE=beat_schedule(app.config))
 
     class ContextTask(celery.Task):
         def __call__(self, *args, **kwargs):
@@ -16,3 +21,71 @@ def make_celery(app):
 
     celery.Task = ContextTask
     return celery
+
+
+def beat_schedule(config):
+    """Periodic tasks of the application.
+    Poster synchronization tasks run every POSTER_SYNC_SCHEDULE seconds,
+    delayed by up to POSTER_SYNC_JITTER seconds. The mail outbox is sent
+    every MAIL_OUTBOX_SCHEDULE seconds and the sms outbox every
+    SMS_OUTBOX_SCHEDULE seconds, for messages waiting for a retry.
+    Reminders of reservations are queued every REMINDER_SCHEDULE seconds
+    and all upcoming ones scheduled again every REMINDER_RESCHEDULE seconds.
+    """
+    entries = {
+        f"poster-{name}": {
+            "task": f"timeless.poster.tasks.{name}",
+            "schedule": JitteredSchedule(
+                timedelta(seconds=interval),
+                jitter=config.get("POSTER_SYNC_JITTER", 0)
+            ),
+        }
+        for name, interval in config.get("POSTER_SYNC_SCHEDULE", {}).items()
+    }
+    for name in ("mail", "sms"):
+        interval = config.get(f"{name.upper()}_OUTBOX_SCHEDULE")
+        if interval:
+            entries[f"{name}-send_pending"] = {
+                "task": f"timeless.{name}.tasks.send_pending",
+                "schedule": timedelta(seconds=interval),
+            }
+    if config.get("REMINDER_SCHEDULE"):
+        entries["reservations-send_reminders"] = {
+            "task": "timeless.reservations.tasks.send_reminders",
+            "schedule": timedelta(seconds=config["REMINDER_SCHEDULE"]),
+        }
+    if config.get("REMINDER_RESCHEDULE"):
+        entries["reservations-schedule_reminders"] = {
+            "task": "timeless.reservations.tasks.schedule_reminders",
+            "schedule": timedelta(seconds=config["REMINDER_RESCHEDULE"]),
+        }
+    return entries
+
+
+class JitteredSchedule(schedule):
+    """Interval schedule delaying every run by a random number of seconds
+    up to jitter, so that tasks with the same interval do not start at the
+    same moment."""
+
+    def __init__(self, run_every, jitter=0, relative=False, nowfun=None,
+                 app=None):
+        super().__init__(run_every, relative, nowfun, app)
+        self.jitter = jitter
+        self.last_run_at = None
+        self.delay = timedelta()
+
+    def is_due(self, last_run_at):
+        if last_run_at != self.last_run_at:
+            self.last_run_at = last_run_at
+            self.delay = timedelta(seconds=random.uniform(0, self.jitter))
+        return super().is_due(last_run_at + self.delay)
+
+    def __reduce__(self):
+        return self.__class__, (
+            self.run_every, self.jitter, self.relative, self.nowfun
+        )
+
+    def __repr__(self):
+        return "<freq: {0.human_seconds}, jitter: {1}s>".format(
+            self, self.jitter
+        )
@@ -1,11 +1,14 @@
 """Company views module."""
 
 from timeless.access_control.views import SecuredView
+from timeless.companies.models import Company
+from timeless.views import CrudAPIView
 
 
-class Resource(SecuredView):
+class Resource(SecuredView, CrudAPIView):
 
     resource = "company"
+    model = Company
 
     """API Resource for companies /api/companies"""
     def get(self, company_id):
@@ -14,7 +17,7 @@ class Resource(SecuredView):
         """
         if company_id:
             return "Detail get method of CompanyViewSet", 200
-        return "Get method of CompanyViewSet", 200
+        return self.get_list()
 
     def post(self):
         """Post method of Resource"""
@@ -0,0 +1,139 @@
+"""Counting rows of list queries, exactly or from planner estimates.
+
+COUNT(*) reads every matching row, so on large tables it costs more than
+the page it is shown with. Estimates are read from the statistics of the
+planner instead: pg_class.reltuples for a whole table, the rows estimated
+by EXPLAIN for a filtered query. AdaptiveCount counts exactly only when the
+estimate is small enough for the count to be cheap. Counts are cached in
+CACHE for a short time, and until rows of the model change.
+"""
+import hashlib
+import json
+
+import attr
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from timeless.cache import CACHE, model_versions
+from timeless.db import DB
+
+
+@attr.s(frozen=True)
+class Count:
+    """ Number of rows, estimated or exact """
+    value = attr.ib()
+    estimated = attr.ib(default=False)
+
+
+class Explain(Executable, ClauseElement):
+    """ EXPLAIN of a statement, with the plan as json """
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def __compile_explain(element, compiler, **kwargs):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(
+        element.statement, **kwargs)
+
+
+def exact_count(query):
+    """Count rows of the query with COUNT(*)."""
+    return query.order_by(None).count()
+
+
+def table_estimate(table_name):
+    """Number of rows of the table in planner statistics, None when the
+    table was never analyzed."""
+    estimate = DB.session.execute(
+        text("SELECT reltuples FROM pg_class "
+             "WHERE oid = CAST(:table_name AS regclass)"),
+        {"table_name": table_name}
+    ).scalar()
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def plan_estimate(query):
+    """Number of rows of the query estimated by the planner."""
+    plan = DB.session.execute(
+        Explain(query.order_by(None).statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CountStrategy:
+    """
+    Count rows of list queries, caching counts for timeout seconds. The
+    count of a query is cached by its SQL, parameters and the version of the
+    model, so it changes as soon as rows of the model are written.
+    """
+    timeout = 60
+
+    def count(self, query, model):
+        """Count rows of the query of model, from the cache if possible.
+        :return: Count
+        """
+        key = self.cache_key(query, model)
+        count = CACHE.get(key)
+        if count is None:
+            count = self.compute(query, model)
+            CACHE.set(key, count, timeout=self.timeout)
+        return count
+
+    def cache_key(self, query, model):
+        """Cache key of the count of query."""
+        compiled = query.statement.compile(dialect=DB.session.bind.dialect)
+        digest = hashlib.sha1(json.dumps([
+            type(self).__name__, vars(self), str(compiled),
+            sorted(compiled.params.items()), model_versions([model])
+        ], default=str).encode()).hexdigest()
+        return f"count:{digest}"
+
+    def compute(self, query, model):
+        """Count rows of the query without the cache."""
+        raise NotImplementedError(
+            f"{type(self).__name__} must define 'compute()'")
+
+
+class ExactCount(CountStrategy):
+    """ Count with COUNT(*) """
+
+    def compute(self, query, model):
+        return Count(exact_count(query))
+
+
+class EstimatedCount(CountStrategy):
+    """ Estimate from statistics of the table when the query is not
+    filtered, from EXPLAIN otherwise """
+
+    def compute(self, query, model):
+        return Count(self.estimate(query, model), estimated=True)
+
+    @staticmethod
+    def estimate(query, model):
+        """Estimated number of rows of the query."""
+        estimate = None
+        if query.whereclause is None:
+            estimate = table_estimate(model.__tablename__)
+        if estimate is None:
+            estimate = plan_estimate(query)
+        return estimate
+
+
+class AdaptiveCount(EstimatedCount):
+    """ Exact count when fewer than exact_below rows are estimated, the
+    estimate otherwise """
+
+    def __init__(self, exact_below=10000):
+        self.exact_below = exact_below
+
+    def compute(self, query, model):
+        estimate = self.estimate(query, model)
+        if estimate < self.exact_below:
+            return Count(exact_count(query))
+        return Count(estimate, estimated=True)
@@ -1,6 +1,10 @@
 """File for models in customer module"""
 from datetime import datetime
+
+from sqlalchemy.orm import validates
+
 from timeless import DB
+from timeless.customers import phones
 from timeless.poster.models import PosterSyncMixin
 from timeless.models import validate_required
 
@@ -15,28 +19,54 @@ class Customer(PosterSyncMixin, DB.Model):
     first_name = DB.Column(DB.String, nullable=False)
     last_name = DB.Column(DB.String, nullable=False)
     phone_number = DB.Column(DB.String, nullable=False)
+    # E.164 form of phone_number, see timeless.customers.phones, customers
+    # may share a number
+    phone_normalized = DB.Column(DB.String(16), index=True)
     created_on = DB.Column(DB.DateTime, default=datetime.utcnow, nullable=False)
     updated_on = DB.Column(DB.DateTime, onupdate=datetime.utcnow)
+    # columns computed from another one, for rows written in bulk
+    derived_columns = {
+        "phone_normalized": ("phone_number", phones.normalize),
+    }
 
     def __repr__(self):
         return "<Customer(name=%s %s)>" % (self.first_name, self.last_name)
 
+    @validates("phone_number")
+    def validate_phone_number(self, _, phone_number):
+        """Keep phone_normalized in sync with phone_number"""
+        self.phone_normalized = phones.normalize(phone_number)
+        return phone_number
+
+    @classmethod
+    def poster_values(cls, poster_customer: dict) -> dict:
+        """
+        Method should return Customer column values taken from
+        poster_customer dict
+        """
+        return {
+            "first_name": poster_customer["firstname"],
+            "last_name": poster_customer["lastname"],
+            "phone_number": poster_customer["phone_number"],
+            "phone_normalized": phones.normalize(
+                poster_customer["phone_number"]),
+            "created_on": poster_customer["date_activate"],
+            "poster_id": poster_customer["client_id"],
+        }
+
     @classmethod
     def merge_with_poster(cls, customer: "Customer", poster_customer: dict):
         """
         Method should return Customer object with merged data from table entity
         and poster customer dict
         """
-        return Customer(
-            id=customer.id,
-            first_name=poster_customer["firstname"],
-            last_name=poster_customer["lastname"],
-            phone_number=poster_customer["phone_number"],
-            created_on=poster_customer["date_activate"],
-            updated_on=datetime.utcnow(),
-            poster_id=customer.poster_id,
-            synchronized_on=datetime.utcnow()
-        )
+        return Customer(**{
+            **cls.poster_values(poster_customer),
+            "id": customer.id,
+            "updated_on": datetime.utcnow(),
+            "poster_id": customer.poster_id,
+            "synchronized_on": datetime.utcnow()
+        })
 
     @classmethod
     def create_by_poster(cls, poster_customer: dict):
@@ -45,11 +75,7 @@ class Customer(PosterSyncMixin, DB.Model):
         poster_customer dict
         """
         return Customer(
-            first_name=poster_customer["firstname"],
-            last_name=poster_customer["lastname"],
-            phone_number=poster_customer["phone_number"],
-            created_on=poster_customer["date_activate"],
+            **cls.poster_values(poster_customer),
             updated_on=datetime.utcnow(),
-            poster_id=poster_customer["client_id"],
             synchronized_on=datetime.utcnow()
         )
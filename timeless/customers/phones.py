@@ -0,0 +1,46 @@
+"""Normalization of customer phone numbers to E.164.
+
+Numbers are stored as typed by hosts or received from Poster, so the same
+number comes in many forms: "+380 (93) 123-45-67", "0931234567",
+"00380931234567". They are normalized to "+" followed by the country code
+and the subscriber number, which is stored in Customer.phone_normalized and
+searched by its last digits. National numbers, starting with the trunk
+prefix 0, get COUNTRY_CODE.
+"""
+import re
+
+
+COUNTRY_CODE = "380"
+
+MIN_DIGITS = 7
+MAX_DIGITS = 15
+
+# Extensions such as "x123" or "ext. 123" are not part of the number
+EXTENSION = re.compile("[A-Za-z].*$")
+NOT_DIGITS = re.compile("[^0-9]")
+
+
+def normalize(number, country_code=COUNTRY_CODE):
+    """E.164 form of the phone number, None when it is not a phone number.
+    :param number: Phone number as typed
+    :param country_code: Country code of national numbers
+    """
+    if not number:
+        return None
+    number = EXTENSION.sub("", number).strip()
+    digits = NOT_DIGITS.sub("", number)
+    if number.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif digits.startswith("0"):
+        digits = country_code + digits[1:]
+    if digits.startswith("0") or not (
+            MIN_DIGITS <= len(digits) <= MAX_DIGITS):
+        return None
+    return "+" + digits
+
+
+def search_digits(text):
+    """Digits of a partial phone number typed in a search."""
+    return NOT_DIGITS.sub("", EXTENSION.sub("", text or ""))
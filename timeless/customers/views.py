@@ -0,0 +1,69 @@
+"""Customers views module."""
+from http import HTTPStatus
+
+from flask import Blueprint, abort, jsonify, request
+from sqlalchemy import func
+
+from timeless import views
+from timeless.auth import views as auth
+from timeless.customers import phones
+from timeless.customers.models import Customer
+
+
+BP = Blueprint("customers", __name__, url_prefix="/customers")
+
+MIN_SEARCH_DIGITS = 4
+MAX_SEARCH_RESULTS = 20
+
+
+class Export(views.ExportView):
+    """ Export all customers as csv or json lines """
+    decorators = (auth.login_required,)
+    model = Customer
+    resource = "customer"
+
+
+class Import(views.ImportView):
+    """ Import customers from csv """
+    decorators = (auth.login_required,)
+    model = Customer
+    resource = "customer"
+
+
+@BP.route("/search")
+@auth.login_required
+def search():
+    """Find customers by phone number, e.g.:
+    /customers/search?phone=4567            numbers ending with 4567
+    /customers/search?phone=%2B380931234567 the whole number
+    Numbers are matched in E.164 form, ending digits through the index on
+    reversed numbers, so that the lookup does not scan all customers. A whole
+    number that is not a phone number is a bad request.
+    """
+    phone = request.args.get("phone", "").strip()
+    digits = phones.search_digits(phone)
+    if len(digits) < MIN_SEARCH_DIGITS:
+        abort(HTTPStatus.BAD_REQUEST)
+    query = Customer.query
+    if phone.startswith("+"):
+        normalized = phones.normalize(phone)
+        if normalized is None:
+            abort(HTTPStatus.BAD_REQUEST)
+        query = query.filter(Customer.phone_normalized == normalized)
+    else:
+        query = query.filter(
+            func.reverse(Customer.phone_normalized).like(digits[::-1] + "%"))
+    customers = query.order_by(Customer.id).limit(MAX_SEARCH_RESULTS)
+    return jsonify(customers=[
+        {
+            "id": customer.id,
+            "first_name": customer.first_name,
+            "last_name": customer.last_name,
+            "phone_number": customer.phone_normalized,
+        }
+        for customer in customers
+    ])
+
+
+Export.register(BP, "/export")
+Import.register(BP, "/import")
@@ -1,6 +1,8 @@
 """File for models in employees module"""
+from sqlalchemy.orm import validates
 
 from timeless.db import DB
+from timeless.employees import pins
 from timeless.models import TimestampsMixin
 
 
@@ -19,7 +21,9 @@ class Employee(TimestampsMixin, DB.Model):
     user_status = DB.Column(DB.String, nullable=False)
     email = DB.Column(DB.String(300), nullable=False)
     password = DB.Column(DB.String(300), nullable=False)
-    pin_code = DB.Column(DB.Integer, unique=True, nullable=False)
+    pin_code = DB.Column(DB.String(12), unique=True, nullable=False)
+    # keyed digest of pin_code, see timeless.employees.pins
+    pin_digest = DB.Column(DB.String(64), unique=True)
     comment = DB.Column(DB.String)
     company_id = DB.Column(DB.Integer, DB.ForeignKey("companies.id"))
     role_id = DB.Column(DB.Integer, DB.ForeignKey("roles.id"), nullable=True)
@@ -31,3 +35,9 @@ class Employee(TimestampsMixin, DB.Model):
 
     def __repr__(self):
         return "<Employee(username=%s)>" % self.username
+
+    @validates("pin_code")
+    def validate_pin_code(self, _, pin_code):
+        """Keep pin_digest in sync with pin_code"""
+        self.pin_digest = pins.digest(pin_code)
+        return pin_code
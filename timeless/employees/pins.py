@@ -0,0 +1,32 @@
+"""Keyed digests of employee PIN codes.
+
+PIN login looks employees up by the HMAC of their PIN code keyed with
+PIN_SECRET_KEY, stored in Employee.pin_digest with a unique index. Looking
+up a PIN costs one indexed query, and the digests are worthless without
+the key, unlike plain hashes of the few possible PIN codes.
+"""
+import hashlib
+import hmac
+
+from flask import current_app
+
+
+def digest(pin_code, key=None):
+    """HMAC-SHA256 of the PIN code, as hex.
+    :param pin_code: PIN code of an employee, a string so that leading
+     zeros count
+    :param key: Secret key, PIN_SECRET_KEY of the application by default
+    """
+    if pin_code is None:
+        return None
+    if key is None:
+        key = current_app.config["PIN_SECRET_KEY"]
+    return hmac.new(
+        key.encode(), pin_code.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def token_digest(token):
+    """SHA-256 of a device token, as hex. Tokens are random, so they need
+    no key."""
+    return hashlib.sha256(token.encode()).hexdigest()
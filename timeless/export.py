@@ -0,0 +1,78 @@
+"""Streaming export of model rows as csv or json lines.
+
+Rows are fetched through a server side cursor in chunks of CHUNK_SIZE, as
+plain tuples of the exported columns, and every line is yielded as soon as
+it is formatted. Exporting any number of rows runs in constant memory and
+the first line is available right after the first chunk is fetched.
+"""
+import csv
+import io
+import json
+
+from timeless.pagination import json_value
+
+
+CHUNK_SIZE = 1000
+
+
+def columns(model, fields=None):
+    """Columns of model to export, all of its columns by default."""
+    table_columns = model.__table__.columns
+    if fields is None:
+        return list(table_columns)
+    return [table_columns[name] for name in fields]
+
+
+def stream_rows(query, exported, chunk_size=CHUNK_SIZE):
+    """Iterate over values of exported columns for every row of the query,
+    fetching chunk_size rows at a time from a server side cursor."""
+    return query.with_entities(*exported).execution_options(
+        stream_results=True
+    ).yield_per(chunk_size)
+
+
+def csv_lines(header, rows):
+    """Format rows as csv lines, the first line is the header."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        writer.writerow(values)
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    yield line(header)
+    for row in rows:
+        yield line([json_value(value) for value in row])
+
+
+def jsonl_lines(header, rows):
+    """Format rows as json objects, one per line."""
+    for row in rows:
+        yield json.dumps(
+            dict(zip(header, (json_value(value) for value in row)))
+        ) + "\n"
+
+
+FORMATS = {
+    "csv": (csv_lines, "text/csv"),
+    "jsonl": (jsonl_lines, "application/x-ndjson"),
+}
+
+
+def export(query, exported, export_format="csv", chunk_size=CHUNK_SIZE):
+    """Lines of the export of the query.
+    :param query: Query of the exported rows, usually model.query
+    :param exported: Exported columns
+    :param export_format: "csv" or "jsonl"
+    :param chunk_size: Number of rows fetched at a time
+    :return: Generator of lines
+    :raise KeyError: When the format is unknown
+    """
+    lines, _ = FORMATS[export_format]
+    return lines(
+        [column.key for column in exported],
+        stream_rows(query, exported, chunk_size)
+    )
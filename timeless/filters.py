@@ -0,0 +1,166 @@
+"""Typed filters of lists, parsed from ?filter_by= parameters.
+
+A parameter is field__operator=value, field=value being equality:
+    filter_by=id__in=1,2,3                      id IN (1, 2, 3)
+    filter_by=start_time__range=2019-03-01,2019-03-31
+                                                BETWEEN, either end optional
+    filter_by=num_of_persons__gte=4             also lte
+    filter_by=last_name__prefix=Bla             LIKE 'Bla%', btree index
+    filter_by=first_name__ilike=oh              ILIKE '%oh%', trigram index
+
+Operators allowed for a column depend on its type, values are converted to
+its python type, so they compare as the column does and the database can use
+its indexes. The plans mapping (field, operator) to a column and its
+operator are compiled once per filter class and model.
+"""
+from functools import lru_cache
+
+import attr
+from sqlalchemy_utils import ChoiceType
+
+from timeless.values import parse
+
+
+SEPARATOR = "__"
+ESCAPE = "/"
+
+EQUALITY_OPERATORS = ("eq", "in")
+ORDERED_OPERATORS = EQUALITY_OPERATORS + ("range", "gte", "lte")
+STRING_OPERATORS = EQUALITY_OPERATORS + ("prefix", "ilike")
+
+
+def like_pattern(value):
+    """Escape LIKE wildcards of value with ESCAPE."""
+    return value.replace(ESCAPE, ESCAPE * 2).replace(
+        "%", ESCAPE + "%").replace("_", ESCAPE + "_")
+
+
+def between(column, values):
+    """Range condition, an empty end leaves the range open."""
+    start, end = values
+    if start is None and end is None:
+        raise ValueError("Empty range")
+    if start is None:
+        return column <= end
+    if end is None:
+        return column >= start
+    return column.between(start, end)
+
+
+OPERATORS = {
+    "eq": lambda column, value: column == value,
+    "in": lambda column, values: column.in_(values),
+    "range": between,
+    "gte": lambda column, value: column >= value,
+    "lte": lambda column, value: column <= value,
+    "prefix": lambda column, value: column.like(
+        like_pattern(value) + "%", escape=ESCAPE),
+    "ilike": lambda column, value: column.ilike(
+        "%" + like_pattern(value) + "%", escape=ESCAPE),
+}
+
+
+def column_operators(column):
+    """Operators which can be applied to the column, by its type."""
+    if isinstance(column.type, ChoiceType):
+        return EQUALITY_OPERATORS
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return EQUALITY_OPERATORS
+    if python_type is str:
+        return STRING_OPERATORS
+    if python_type is bool:
+        return EQUALITY_OPERATORS
+    return ORDERED_OPERATORS
+
+
+@attr.s(frozen=True)
+class Plan:
+    """ Compiled filter of a column with an operator """
+    column = attr.ib()
+    operator = attr.ib()
+
+    def condition(self, text):
+        """Condition of the filter for the value given as text.
+        :raise ValueError: When the value does not fit the column
+        """
+        if self.operator in ("prefix", "ilike"):
+            if not text:
+                raise ValueError("Empty pattern")
+            value = text
+        elif self.operator == "in":
+            value = [self.parse(item) for item in text.split(",")]
+        elif self.operator == "range":
+            start, separator, end = text.partition(",")
+            if not separator:
+                raise ValueError("Not a valid range")
+            value = (self.parse(start, True), self.parse(end, True))
+        else:
+            value = self.parse(text)
+        return OPERATORS[self.operator](self.column, value)
+
+    def parse(self, text, optional=False):
+        """Convert text to the python type of the column."""
+        if optional and text == "":
+            return None
+        return parse(self.column.property.columns[0], text)
+
+
+class GenericFilter:
+    """
+    Filter of the objects of a model. Subclasses restrict the fields which
+    can be filtered and the operators allowed for them, e.g.:
+        class ReservationFilter(GenericFilter):
+            fields = ("start_time", "customer_id")
+            operators = {"customer_id": ("eq",)}
+    """
+    fields = None
+    operators = {}
+
+    def __init__(self, model):
+        self.model = model
+
+    def plans(self):
+        """Compiled plans of the filter for the model."""
+        return compile_plans(type(self), self.model)
+
+    def compile(self):
+        """Map (field, operator) to the Plan of every allowed filter."""
+        plans = {}
+        for prop in self.model.__mapper__.column_attrs:
+            if self.fields is not None and prop.key not in self.fields:
+                continue
+            column = getattr(self.model, prop.key)
+            allowed = self.operators.get(
+                prop.key, column_operators(prop.columns[0]))
+            for operator in allowed:
+                plans[(prop.key, operator)] = Plan(column, operator)
+        return plans
+
+    def conditions(self, params):
+        """Conditions of filter_by parameters, unknown fields and operators
+        are skipped.
+        :raise ValueError: When a value does not fit its column
+        """
+        plans = self.plans()
+        conditions = []
+        for param in params:
+            name, _, text = param.partition("=")
+            field, _, operator = name.partition(SEPARATOR)
+            plan = plans.get((field, operator or "eq"))
+            if plan is not None:
+                conditions.append(plan.condition(text))
+        return conditions
+
+    def apply(self, query, params):
+        """Filter the query with filter_by parameters.
+        :raise ValueError: When a value does not fit its column
+        """
+        return query.filter(*self.conditions(params))
+
+
+@lru_cache(maxsize=None)
+def compile_plans(filter_class, model):
+    """Compile plans of filter_class for model once."""
+    return filter_class(model).compile()
@@ -0,0 +1,225 @@
+"""Bulk import of csv files with PostgreSQL COPY.
+
+The csv file is read and validated in chunks of CHUNK_SIZE rows. Valid rows
+of every chunk are sent with COPY FROM STDIN into a temporary table, then
+all staged rows are merged into the model table with a single
+INSERT ... SELECT, updating rows with the same merge key when one is given.
+Memory use depends on the chunk size only and the database does set based
+work instead of a statement per row. Rows failing validation are reported
+with their line number and skipped, the whole import runs in one
+transaction.
+"""
+import csv
+import io
+from datetime import date, datetime
+
+import attr
+from sqlalchemy.exc import DBAPIError
+
+from timeless.cache import invalidate
+from timeless.db import DB
+from timeless.poster.sync import chunks
+from timeless.values import parse
+
+
+CHUNK_SIZE = 10000
+
+
+class CsvImportError(Exception):
+    """ The file can not be imported at all """
+
+
+@attr.s
+class Rejected:
+    """ Row of the file which was not imported """
+    line = attr.ib()
+    errors = attr.ib()
+
+
+@attr.s
+class ImportResult:
+    """ Numbers of imported rows and rows rejected because of errors """
+    imported = attr.ib(default=0)
+    rejected = attr.ib(factory=list)
+
+
+def copy_value(value):
+    """Format value for COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace(
+        "\n", "\\n").replace("\r", "\\r")
+
+
+def defaults(model, fields):
+    """Values of python side defaults of columns missing from the file, the
+    same value is used for all rows, as a single INSERT would do. Columns
+    only having an update default get it too, as merged rows may update
+    existing ones."""
+    values = {}
+    for column in model.__table__.columns:
+        default = column.default or column.onupdate
+        if column.key in fields or default is None:
+            continue
+        if default.is_callable:
+            values[column.key] = default.arg(None)
+        elif default.is_scalar:
+            values[column.key] = default.arg
+    return values
+
+
+def derivations(model, fields):
+    """Columns missing from the file which the model computes from columns
+    of the file, see derived_columns of timeless.customers.models.Customer.
+    :return: Dict of column name to (source column, function)
+    """
+    return {
+        name: (source, function)
+        for name, (source, function)
+        in getattr(model, "derived_columns", {}).items()
+        if source in fields and name not in fields
+    }
+
+
+def derive(derived, values):
+    """Values of derived columns of a row."""
+    return {
+        name: function(values[source])
+        for name, (source, function) in derived.items()
+    }
+
+
+def stage(cursor, staging, fields, rows):
+    """Copy rows into the staging table with a single COPY."""
+    buffer = io.StringIO()
+    for line, values in rows:
+        buffer.write("\t".join(
+            [copy_value(value) for value in values] + [str(line)]
+        ) + "\n")
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {staging} ({', '.join(fields)}, import_line) FROM STDIN",
+        buffer
+    )
+
+
+def merge_statement(table, staging, fields, key=None, allowed=None):
+    """INSERT ... SELECT moving staged rows into the table. With a merge key
+    existing rows are updated, the last row of the file wins for duplicate
+    keys, rows without key are all inserted.
+    :param allowed: Dict of column name to the integer values existing rows
+     must have to be updated, e.g. the ids of the company of the user
+    """
+    columns = ", ".join(fields)
+    if key is None:
+        return (f"INSERT INTO {table} ({columns}) "
+                f"SELECT {columns} FROM {staging}")
+    updates = ", ".join(
+        f"{field} = EXCLUDED.{field}" for field in fields if field != key
+    )
+    # NULL keys never conflict, each of these rows stays distinct
+    distinct = f"{key}, CASE WHEN {key} IS NULL THEN import_line END"
+    statement = (f"INSERT INTO {table} ({columns}) "
+                 f"SELECT DISTINCT ON ({distinct}) {columns} FROM {staging} "
+                 f"ORDER BY {distinct}, import_line DESC "
+                 f"ON CONFLICT ({key}) DO UPDATE SET {updates}")
+    conditions = [
+        f"{table}.{name} IN ({', '.join(str(int(value)) for value in values)})"
+        if values else "FALSE"
+        for name, values in sorted((allowed or {}).items())
+    ]
+    if conditions:
+        statement += " WHERE " + " AND ".join(conditions)
+    return statement
+
+
+def load(model, file, key=None, chunk_size=CHUNK_SIZE, forced=None,
+         allowed=None):
+    """Import csv file into the table of model.
+    :param model: Imported model
+    :param file: Text file with a header naming columns of the model
+    :param key: Unique column identifying rows to update instead of insert
+    :param chunk_size: Number of rows validated and copied at a time
+    :param forced: Dict of column values set on every row, replacing the
+     ones of the file
+    :param allowed: Dict of column name to the integer values rows may have,
+     other rows are rejected and existing rows with other values are not
+     updated
+    :return: ImportResult
+    :raise CsvImportError: When the header is invalid or the database rejects
+     the rows
+    """
+    forced, allowed = forced or {}, allowed or {}
+    reader = csv.DictReader(file)
+    columns = model.__table__.columns
+    primary_key = model.__mapper__.primary_key[0].key
+    header = reader.fieldnames or []
+    unknown = [
+        name for name in header
+        if name not in columns or name == primary_key
+    ]
+    if unknown:
+        raise CsvImportError(f"Unknown columns: {', '.join(unknown)}")
+    if key is not None and (key not in header or not columns[key].unique):
+        raise CsvImportError(f"{key} is not a unique column of the file")
+    missing = [
+        column.key for column in columns
+        if column.key != primary_key and column.key not in header
+        and column.key not in forced and not column.nullable
+        and column.default is None and column.server_default is None
+    ]
+    if missing:
+        raise CsvImportError(f"Missing columns: {', '.join(missing)}")
+    given = header + [name for name in forced if name not in header]
+    extra = defaults(model, given)
+    derived = derivations(model, given)
+    fields = given + list(derived) + list(extra)
+    table, staging = model.__tablename__, f"import_{model.__tablename__}"
+    result = ImportResult()
+    try:
+        DB.session.execute(
+            f"CREATE TEMPORARY TABLE {staging} "
+            f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        DB.session.execute(
+            f"ALTER TABLE {staging} ADD COLUMN import_line integer")
+        cursor = DB.session.connection().connection.cursor()
+        # the header is line 1
+        for chunk in chunks(enumerate(reader, start=2), chunk_size):
+            rows = []
+            for line, row in chunk:
+                values, errors = {}, {}
+                for name in header:
+                    try:
+                        values[name] = parse(columns[name], row[name] or "")
+                    except ValueError as error:
+                        errors[name] = str(error)
+                values.update(forced)
+                for name, permitted in allowed.items():
+                    if name not in errors \
+                            and values.get(name) not in permitted:
+                        errors[name] = "Not allowed"
+                if errors:
+                    result.rejected.append(Rejected(line, errors))
+                else:
+                    values.update(derive(derived, values))
+                    rows.append((line, [
+                        {**values, **extra}[field] for field in fields
+                    ]))
+            stage(cursor, staging, fields, rows)
+        result.imported = DB.session.execute(
+            merge_statement(table, staging, fields, key, {
+                **allowed,
+                **{name: [value] for name, value in forced.items()}
+            })
+        ).rowcount
+        DB.session.commit()
+    except DBAPIError as error:
+        DB.session.rollback()
+        raise CsvImportError(str(error.orig).strip()) from error
+    invalidate(model)
+    return result
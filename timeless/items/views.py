@@ -1,5 +1,5 @@
 from timeless.auth import views as auth
-from timeless.views import ListView, CreateView
+from timeless.views import ListView, CreateView, ExportView
 from timeless.items.forms import ItemForm
 from timeless.items.models import Item
 """ Views module for Items.
@@ -19,11 +19,22 @@ class ItemListView(ListView):
     """ List the Items """
     model = Item
     template_name = "items/list.html"
+    only = ("id",)
 
 
 ItemListView.register(BP, "/")
 
 
+class ItemExportView(ExportView):
+    """ Export the items of the company as csv or json lines """
+    decorators = (auth.login_required,)
+    model = Item
+    resource = "item"
+
+
+ItemExportView.register(BP, "/export", name="export")
+
+
 class ItemCreateView(CreateView):
     """ Create a new Item """
     model = Item
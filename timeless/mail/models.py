@@ -0,0 +1,41 @@
+"""Models of the mail outbox"""
+from datetime import datetime
+
+from sqlalchemy_utils import ChoiceType
+
+from timeless.db import DB
+from timeless.models import TimestampsMixin
+
+
+MAIL_STATUS = [
+    (u"pending", u"Pending"),
+    (u"sent", u"Sent"),
+    (u"failed", u"Failed"),
+]
+
+
+class OutgoingMail(TimestampsMixin, DB.Model):
+    """Message queued in the outbox, with the state of its delivery. Pending
+    messages are sent by timeless.mail.tasks.send_pending once
+    next_attempt_on has passed."""
+
+    __tablename__ = "outgoing_mails"
+
+    id = DB.Column(DB.Integer, primary_key=True, autoincrement=True)
+    subject = DB.Column(DB.String, nullable=False)
+    recipients = DB.Column(DB.JSON, nullable=False)
+    body = DB.Column(DB.Text)
+    html = DB.Column(DB.Text)
+    status = DB.Column(ChoiceType(MAIL_STATUS), nullable=False,
+                       default=u"pending")
+    attempts = DB.Column(DB.Integer, nullable=False, default=0)
+    next_attempt_on = DB.Column(DB.DateTime, nullable=False,
+                                default=datetime.utcnow)
+    last_error = DB.Column(DB.String)
+    sent_on = DB.Column(DB.DateTime)
+    # content of sensitive messages, e.g. passwords, is removed once they
+    # are sent or failed
+    sensitive = DB.Column(DB.Boolean, nullable=False, default=False)
+
+    def __repr__(self):
+        return "<OutgoingMail %r>" % self.id
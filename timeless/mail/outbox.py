@@ -0,0 +1,138 @@
+"""Outbox of mail sent by celery workers.
+
+Requests only store messages in the outbox and return, so they never wait
+for the SMTP server. Workers send pending messages in batches of
+MAIL_BATCH_SIZE over a SMTP connection kept open by the worker process
+between batches. A message failing to send is tried again after
+MAIL_RETRY_BACKOFF seconds, doubled on every attempt, until it failed
+MAIL_MAX_ATTEMPTS times. The content of sensitive messages is only kept
+until they are sent or failed. Locally, messages can be caught by a stub SMTP
+server, e.g. the mail service of docker-compose.yaml.
+"""
+import smtplib
+from datetime import datetime, timedelta
+
+from flask import current_app
+from flask_mail import Message
+
+from timeless.db import DB
+from timeless.mail import MAIL
+from timeless.mail.models import OutgoingMail
+
+
+# subject of sensitive messages once they are sent or failed
+REDACTED = "[removed]"
+
+__connection = None
+
+
+def enqueue(subject, recipients, body=None, html=None, sensitive=False):
+    """
+    Store a message in the outbox and commit it, a worker sends it.
+    :param sensitive: Whether the content is removed once the message is
+     sent or failed
+    :return: OutgoingMail of the message
+    """
+    # tasks import this module
+    from timeless.mail import tasks
+    mail = OutgoingMail(
+        subject=subject, recipients=list(recipients), body=body, html=html,
+        sensitive=sensitive)
+    DB.session.add(mail)
+    DB.session.commit()
+    tasks.send_pending.delay()
+    return mail
+
+
+def message(mail):
+    """Message of an OutgoingMail"""
+    return Message(mail.subject, recipients=mail.recipients, body=mail.body,
+                   html=mail.html)
+
+
+def redact(mail):
+    """Remove the content of a sensitive message."""
+    if mail.sensitive:
+        mail.subject, mail.body, mail.html = REDACTED, None, None
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt, after attempts failed."""
+    return current_app.config["MAIL_RETRY_BACKOFF"] * 2 ** (attempts - 1)
+
+
+def connection():
+    """SMTP connection of the worker process, opened on first use and
+    opened again when the server closed it."""
+    global __connection
+    if __connection is not None and __connection.host is not None:
+        try:
+            __connection.host.noop()
+        except (smtplib.SMTPException, OSError):
+            close()
+    if __connection is None:
+        __connection = MAIL.connect().__enter__()
+    return __connection
+
+
+def close():
+    """Close the SMTP connection of the worker process."""
+    global __connection
+    if __connection is not None:
+        try:
+            __connection.__exit__(None, None, None)
+        except (smtplib.SMTPException, OSError):
+            pass
+        __connection = None
+
+
+def claim(limit):
+    """Pending messages due now, locked until the transaction ends, so that
+    other workers skip them."""
+    return OutgoingMail.query.filter(
+        OutgoingMail.status == u"pending",
+        OutgoingMail.next_attempt_on <= datetime.utcnow()
+    ).order_by(OutgoingMail.next_attempt_on).limit(limit).with_for_update(
+        skip_locked=True).all()
+
+
+def deliver(mails):
+    """
+    Send the messages over the connection of the worker and record their
+    state. The connection is closed after an error, the next message opens
+    it again.
+    :return: Number of messages sent
+    """
+    sent = 0
+    max_attempts = current_app.config["MAIL_MAX_ATTEMPTS"]
+    for mail in mails:
+        mail.attempts += 1
+        try:
+            connection().send(message(mail))
+        except (smtplib.SMTPException, OSError) as error:
+            close()
+            mail.last_error = str(error)
+            if mail.attempts >= max_attempts:
+                mail.status = u"failed"
+                redact(mail)
+            else:
+                mail.next_attempt_on = datetime.utcnow() + timedelta(
+                    seconds=retry_delay(mail.attempts))
+        else:
+            mail.status = u"sent"
+            mail.sent_on = datetime.utcnow()
+            mail.last_error = None
+            redact(mail)
+            sent += 1
+    return sent
+
+
+def send_pending():
+    """
+    Send a batch of pending messages.
+    :return: Numbers of messages sent and of messages of the batch
+    """
+    mails = claim(current_app.config["MAIL_BATCH_SIZE"])
+    sent = deliver(mails)
+    DB.session.commit()
+    return sent, len(mails)
@@ -0,0 +1,206 @@
+"""Keyset pagination shared by template and API views.
+
+Keyset (seek) pagination filters rows placed after the last seen row instead
+of skipping them with OFFSET, so fetching any page costs the same as fetching
+the first one, provided there is an index on the sort columns. Nullable
+sort columns are compared NULL-safely, NULLs sorted as PostgreSQL does.
+"""
+import base64
+import binascii
+import enum
+import json
+from datetime import date, datetime
+
+import attr
+from dateutil.parser import isoparse
+from sqlalchemy import and_, asc, desc, false, or_
+from sqlalchemy.orm import ColumnProperty
+from sqlalchemy.sql.elements import ClauseElement
+from sqlalchemy_utils import Choice
+
+
+NEXT = "next"
+PREV = "prev"
+
+
+def is_nullable(column):
+    """Whether the column, or mapped attribute, may hold NULL."""
+    return getattr(getattr(column, "expression", column), "nullable", True)
+
+
+def equals(column, value):
+    """NULL-safe equality of a column with the value of a row, a python
+    value or an SQL expression."""
+    if not is_nullable(column) or not isinstance(value, ClauseElement):
+        # == None is rendered as IS NULL
+        return column == value
+    return or_(column == value, and_(column.is_(None), value.is_(None)))
+
+
+def placed_after(column, direction, value):
+    """Condition selecting values of the column placed after the value of a
+    row. NULLs are placed as PostgreSQL sorts them: last in ascending order
+    and first in descending order, as a comparison with NULL is never true.
+    """
+    if not is_nullable(column):
+        return column < value if direction is desc else column > value
+    if direction is desc:
+        if value is None:
+            return column.isnot(None)
+        if isinstance(value, ClauseElement):
+            return or_(column < value,
+                       and_(value.is_(None), column.isnot(None)))
+        return column < value
+    if value is None:
+        return false()
+    if isinstance(value, ClauseElement):
+        return or_(column > value, and_(value.isnot(None), column.is_(None)))
+    return or_(column > value, column.is_(None))
+
+
+def keyset_condition(ordering, values):
+    """Build a condition selecting rows placed after the given values.
+    :param ordering: List of (column, direction) pairs the query is sorted by
+    :param values: Values of these columns for the last seen row
+    :return: SQL expression usable in query.filter()
+    """
+    clauses = []
+    for index, (column, direction) in enumerate(ordering):
+        clauses.append(and_(*[
+            equals(previous, values[position])
+            for position, (previous, _) in enumerate(ordering[:index])
+        ], placed_after(column, direction, values[index])))
+    return or_(*clauses)
+
+
+def json_value(value):
+    """Convert a column value to something json can serialize."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Choice):
+        return value.code
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def parse_value(column, value):
+    """Convert a json value back to the python type of the column."""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return isoparse(value)
+    if python_type is date:
+        return isoparse(value).date()
+    return value
+
+
+def parse_ordering(model, fields):
+    """(column, direction) pairs of comma separated field names in the
+    ?ordering= syntax. Names that are not column attributes of the model,
+    e.g. relationships or query, are skipped."""
+    ordering = []
+    for name in (fields or "").split(","):
+        column = getattr(model, name.strip().lstrip("-"), None)
+        if isinstance(getattr(column, "property", None), ColumnProperty):
+            ordering.append(
+                (column, desc if name.strip().startswith("-") else asc))
+    return ordering
+
+
+def field_name(column, direction):
+    """Name of the sort field in the ?ordering= syntax."""
+    return "-" + column.key if direction is desc else column.key
+
+
+def encode_cursor(ordering, row, way):
+    """Build an opaque cursor pointing at the given row.
+    :param ordering: List of (column, direction) pairs the query is sorted by
+    :param row: Row the cursor points at
+    :param way: NEXT for rows after the row, PREV for rows before it
+    :return: Url safe cursor string
+    """
+    payload = {
+        "o": [field_name(column, direction) for column, direction in ordering],
+        "v": [json_value(getattr(row, column.key)) for column, _ in ordering],
+        "w": way,
+    }
+    return base64.urlsafe_b64encode(
+        json.dumps(payload, separators=(",", ":")).encode()
+    ).decode()
+
+
+def decode_cursor(cursor):
+    """Read the cursor built by encode_cursor.
+    :return: Tuple with field names, raw values and way of the cursor
+    :raise ValueError: When the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        fields, values, way = payload["o"], payload["v"], payload["w"]
+    except (binascii.Error, UnicodeDecodeError, TypeError, KeyError) as error:
+        raise ValueError("Malformed cursor") from error
+    if way not in (NEXT, PREV) or len(fields) != len(values):
+        raise ValueError("Malformed cursor")
+    return fields, values, way
+
+
+@attr.s
+class CursorPage:
+    """ Single page of a cursor paginated list """
+    items = attr.ib()
+    next_cursor = attr.ib()
+    prev_cursor = attr.ib()
+
+
+def paginate(query, ordering, limit, cursor=None):
+    """Fetch one page of the query using keyset pagination.
+    :param query: Query to paginate, it must not be ordered
+    :param ordering: List of (column, direction) pairs, the last column must
+     be unique (usually the primary key)
+    :param limit: Page size
+    :param cursor: Value returned in next_cursor or prev_cursor of a previous
+     page, the ordering encoded in it must match the given one
+    :return: CursorPage
+    :raise ValueError: When the cursor is malformed
+    """
+    way, values = NEXT, None
+    if cursor:
+        fields, raw_values, way = decode_cursor(cursor)
+        if fields != [field_name(*pair) for pair in ordering]:
+            raise ValueError("Cursor does not match the ordering")
+        values = [
+            parse_value(column, value)
+            for (column, _), value in zip(ordering, raw_values)
+        ]
+    seek = ordering
+    if way == PREV:
+        seek = [
+            (column, asc if direction is desc else desc)
+            for column, direction in ordering
+        ]
+    if values is not None:
+        query = query.filter(keyset_condition(seek, values))
+    rows = query.order_by(
+        *[direction(column) for column, direction in seek]
+    ).limit(limit + 1).all()
+    has_more, items = len(rows) > limit, rows[:limit]
+    if way == PREV:
+        items.reverse()
+    has_next = has_more if way == NEXT else values is not None
+    has_prev = values is not None if way == NEXT else has_more
+    return CursorPage(
+        items=items,
+        next_cursor=(
+            encode_cursor(ordering, items[-1], NEXT)
+            if items and has_next else None
+        ),
+        prev_cursor=(
+            encode_cursor(ordering, items[0], PREV)
+            if items and has_prev else None
+        ),
+    )
@@ -1,16 +1,61 @@
 """Poster API"""
 
+from hashlib import md5
+from http import HTTPStatus
 from urllib.parse import urljoin
 import attr
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 from timeless.poster import exceptions
 
 
+__session = None
+
+
+def create_session(retries=3, backoff_factor=0.5, pool_size=10):
+    """Creates http session keeping connections to Poster alive and retrying
+    idempotent requests which failed because of connection errors or
+    temporary server errors, waiting backoff_factor * 2 ^ attempt seconds
+    between attempts.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                HTTPStatus.BAD_GATEWAY,
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                HTTPStatus.GATEWAY_TIMEOUT,
+            ),
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def shared_session(**kwargs):
+    """Http session shared by all Poster calls of the process, it is created
+    on first use with the given create_session arguments."""
+    global __session
+    if __session is None:
+        __session = create_session(**kwargs)
+    return __session
+
+
 class Poster:
     """Poster application API.
 
+    Requests rejected with 401 are sent once more with a new access token
+    when an authenticator able to forget the old one is given, see
+    CachedAuthenticated.
     """
 
     GET = "GET"
@@ -22,6 +67,10 @@ class Poster:
         self.url = kwargs.get("url", "https://joinposter.com/api")
         self.account = kwargs.get("client_id", 0)
         self.auth_token = auth_token
+        self.authenticator = kwargs.get("authenticator")
+        self.session = kwargs.get("session") or shared_session()
+        self.timeout = kwargs.get("timeout", 10)
+        self.page_size = kwargs.get("page_size", 500)
 
     def locations(self):
         """Fetches location data
@@ -47,18 +96,73 @@ class Poster:
         """
         return self.send(method=self.GET, action="clients.getClients").json()
 
+    def iter_tables(self, spot_id=None):
+        """Iterates over tables, fetching them page by page
+
+        :param spot_id: Poster id of the location, tables of all locations
+         when omitted
+        :return:
+            Generator of table data
+        """
+        if spot_id is None:
+            return self.iter_pages("clients.getTables")
+        return self.iter_pages("clients.getTables", spot_id=spot_id)
+
+    def iter_customers(self):
+        """Iterates over customers, fetching them page by page
+
+        :return:
+            Generator of customer data
+        """
+        return self.iter_pages("clients.getClients")
+
+    def iter_pages(self, action, **params):
+        """Iterates over records of a list action, requesting page_size
+        records at a time, so only one page is held in memory
+
+        :param params: Additional parameters of the action
+        :return:
+            Generator of records from the response of every page
+        """
+        offset = 0
+        while True:
+            page = self.send(
+                method=self.GET, action=action,
+                num=self.page_size, offset=offset, **params
+            ).json().get("response", [])
+            yield from page
+            if len(page) < self.page_size:
+                return
+            offset += len(page)
+
     def send(self, **kwargs):
         """Sends http request for specific poster action
 
         :return: response
         """
-        response = requests.request(
+        response = self.request(**kwargs)
+        if (response.status_code == HTTPStatus.UNAUTHORIZED
+                and hasattr(self.authenticator, "invalidate")):
+            self.authenticator.invalidate()
+            self.auth_token = self.authenticator.auth()
+            response = self.request(**kwargs)
+        response.raise_for_status()
+        return response
+
+    def request(self, **kwargs):
+        """Sends a single http request with the access token
+
+        :return: response
+        """
+        params = kwargs
+        if self.auth_token:
+            params = {**kwargs, "token": self.auth_token}
+        return self.session.request(
             kwargs.get("method"),
             urljoin(self.url, kwargs.get("action", "")),
-            params=kwargs
+            params=params,
+            timeout=self.timeout
         )
-        response.raise_for_status()
-        return response
 
 
 @attr.s
@@ -74,8 +178,10 @@ class Authenticated:
     """ Poster Auth class """
     auth_url = "https://joinposter.com/api/v2/auth/access_token"
 
-    def __init__(self, auth_data: PosterAuthData):
+    def __init__(self, auth_data: PosterAuthData, session=None, timeout=10):
         self.auth_data = auth_data
+        self.session = session or shared_session()
+        self.timeout = timeout
 
     def auth(self):
         """
@@ -90,7 +196,8 @@ class Authenticated:
             "code": self.auth_data.code,
         }
 
-        response = requests.post(self.auth_url, data=auth_data)
+        response = self.session.post(
+            self.auth_url, data=auth_data, timeout=self.timeout)
 
         if not response.ok:
             raise exceptions.PosterAPIError("Problem accessing poster api")
@@ -101,3 +208,35 @@ class Authenticated:
             raise exceptions.PosterAPIError("Token not found")
 
         return token
+
+
+class CachedAuthenticated:
+    """ Poster Auth class reusing the access token until it expires """
+
+    def __init__(self, origin: Authenticated, cache, ttl=3600):
+        self.origin = origin
+        self.cache = cache
+        self.ttl = ttl
+
+    @property
+    def key(self):
+        """ Cache key of the token, specific to the application and code """
+        auth_data = self.origin.auth_data
+        return "poster:access_token:" + md5(
+            f"{auth_data.application_id}:{auth_data.code}".encode()
+        ).hexdigest()
+
+    def auth(self):
+        """
+        Returns cached access token, authenticates into poster API when there
+        is none
+        """
+        token = self.cache.get(self.key)
+        if not token:
+            token = self.origin.auth()
+            self.cache.set(self.key, token, timeout=self.ttl)
+        return token
+
+    def invalidate(self):
+        """ Forget the cached token, e.g. when Poster rejected it """
+        self.cache.delete(self.key)
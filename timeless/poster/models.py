@@ -4,6 +4,27 @@ from timeless import DB
 
 class PosterSyncMixin:
     """Mixin with fields needed for data synchronization with Poster.
+    Models using it implement poster_values(poster_data) class method
+    returning their column values for a record received from Poster.
+    poster_hash is the digest of these values at the last synchronization,
+    it lets unchanged records be skipped without comparing every column.
+    Unique keys of the model other than poster_id are listed in
+    poster_unique_keys, rows created before they were synchronized are
+    matched with Poster records by these keys.
     """
-    poster_id = DB.Column(DB.Integer)
+    poster_id = DB.Column(DB.Integer, unique=True)
+    poster_hash = DB.Column(DB.String(32))
     synchronized_on = DB.Column(DB.DateTime)
+    poster_unique_keys = ()
+
+
+class SyncState(DB.Model):
+    """Model for the state of the synchronization of an entity with Poster.
+    """
+    __tablename__ = "poster_sync_states"
+
+    entity = DB.Column(DB.String, primary_key=True)
+    synchronized_on = DB.Column(DB.DateTime)
+
+    def __repr__(self):
+        return "<SyncState %r>" % self.entity
@@ -0,0 +1,207 @@
+"""Batched synchronization of Poster data with the database.
+
+Poster records are processed in chunks. For every chunk the digests of the
+stored rows are fetched with a single query keyed by poster_id, compared in
+memory with the digests of the received records, and only the changed rows
+are written with a single INSERT ... ON CONFLICT DO UPDATE on poster_id.
+Rows created before they were synchronized have no poster_id yet, they are
+linked first to the Poster records with the same poster_unique_keys, so
+that they are updated instead of violating their unique keys. The whole
+synchronization runs in one transaction, cached results depending on the
+model are invalidated after it when rows were written.
+"""
+import hashlib
+import json
+from datetime import date, datetime
+from itertools import islice
+
+from dateutil.parser import isoparse
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from timeless.cache import invalidate
+from timeless.db import DB
+from timeless.poster.models import SyncState
+
+
+CHUNK_SIZE = 1000
+
+# Columns maintained by the synchronization itself, not hashed
+BOOKKEEPING_COLUMNS = ("synchronized_on", "updated_on")
+# Columns of the owner of rows, set in the application and never updated
+# from Poster
+OWNERSHIP_COLUMNS = ("company_id", "location_id")
+
+
+def chunks(iterable, size):
+    """Split iterable into lists of at most size elements."""
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def coerce(column, value):
+    """Convert value received from Poster to the python type of the column,
+    so it can be compared with the stored one."""
+    if value is None or value == "":
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if isinstance(value, python_type):
+        return value
+    if python_type is bool:
+        return str(value).lower() in ("1", "true")
+    if python_type is datetime:
+        return isoparse(value)
+    if python_type is date:
+        return isoparse(value).date()
+    return python_type(value)
+
+
+def digest(row):
+    """Digest of row values, stable between runs."""
+    return hashlib.md5(
+        json.dumps(row, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def poster_rows(model, poster_records):
+    """Column values of the model for every Poster record, converted to
+    column types, with the digest of these values in poster_hash.
+    If a record appears several times the last one is kept."""
+    columns = model.__table__.columns
+    rows = {}
+    for poster_record in poster_records:
+        row = {
+            name: coerce(columns[name], value)
+            for name, value in model.poster_values(poster_record).items()
+        }
+        row["poster_hash"] = digest(row)
+        rows[row["poster_id"]] = row
+    return list(rows.values())
+
+
+def changed_rows(model, rows):
+    """Rows which are missing or differ from the stored ones. Only digests
+    of stored rows are fetched, with one query."""
+    if not rows:
+        return []
+    stored = dict(DB.session.query(model.poster_id, model.poster_hash).filter(
+        model.poster_id.in_([row["poster_id"] for row in rows])
+    ))
+    return [
+        row for row in rows
+        if stored.get(row["poster_id"], "") != row["poster_hash"]
+    ]
+
+
+def link_unsynchronized(model, rows):
+    """Set poster_id of stored rows without one which have the same unique
+    key as a Poster record, with one query per key. Every poster_id is given
+    to one row at most, and never to a row when another one has it already.
+    :return: Number of linked rows
+    """
+    if not model.poster_unique_keys:
+        return 0
+    linked = {}
+    taken = {
+        poster_id for poster_id, in DB.session.query(model.poster_id).filter(
+            model.poster_id.in_([row["poster_id"] for row in rows]))
+    }
+    for key in model.poster_unique_keys:
+        columns = [getattr(model, name) for name in key]
+        poster_ids = {
+            tuple(row[name] for name in key): row["poster_id"] for row in rows
+        }
+        unsynchronized = DB.session.query(model.id, *columns).filter(
+            model.poster_id.is_(None),
+            tuple_(*columns).in_(list(poster_ids))
+        )
+        for object_id, *values in unsynchronized:
+            poster_id = poster_ids[tuple(values)]
+            if object_id not in linked and poster_id not in taken:
+                linked[object_id] = poster_id
+                taken.add(poster_id)
+    if linked:
+        DB.session.bulk_update_mappings(model, [
+            {"id": object_id, "poster_id": poster_id}
+            for object_id, poster_id in linked.items()
+        ])
+    return len(linked)
+
+
+def upsert(model, rows, synchronized_on):
+    """Insert rows or update the ones with the same poster_id using a single
+    statement. Ownership columns of updated rows are kept."""
+    columns = model.__table__.columns
+    values = [
+        {
+            **row,
+            **{
+                name: synchronized_on
+                for name in BOOKKEEPING_COLUMNS if name in columns
+            }
+        }
+        for row in rows
+    ]
+    statement = insert(model.__table__).values(values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[columns.poster_id],
+        set_={
+            name: statement.excluded[name]
+            for name in values[0]
+            if name != "poster_id" and name not in OWNERSHIP_COLUMNS
+        }
+    )
+    DB.session.execute(statement)
+
+
+def sync(model, poster_records, chunk_size=CHUNK_SIZE, incremental=True,
+         shard=None, progress=None):
+    """Synchronize model with Poster records in one transaction.
+    :param model: Model with PosterSyncMixin and poster_values() class method
+    :param poster_records: Iterable of dicts received from Poster
+    :param chunk_size: Number of records written by a single statement
+    :param incremental: Skip records unchanged since the previous
+     synchronization, otherwise all records are written
+    :param shard: Key of the part of the records being synchronized, shards
+     of the same model keep separate states and may run concurrently
+    :param progress: Callable receiving the number of rows written so far
+     after every chunk
+    :return: Number of inserted or updated rows
+    """
+    written, synchronized_on = 0, datetime.utcnow()
+    state = sync_state(model, shard)
+    try:
+        for chunk in chunks(poster_records, chunk_size):
+            rows = poster_rows(model, chunk)
+            if incremental:
+                rows = changed_rows(model, rows)
+            if rows:
+                link_unsynchronized(model, rows)
+                upsert(model, rows, synchronized_on)
+                written += len(rows)
+            if progress:
+                progress(written)
+        state.synchronized_on = synchronized_on
+        DB.session.add(state)
+        DB.session.commit()
+    except Exception:
+        DB.session.rollback()
+        raise
+    if written:
+        invalidate(model)
+    return written
+
+
+def sync_state(model, shard=None):
+    """Get state of the synchronization of model, or of its shard, a new one
+    if it was never synchronized."""
+    entity = model.__tablename__
+    if shard is not None:
+        entity = f"{entity}:{shard}"
+    return SyncState.query.get(entity) or SyncState(entity=entity)
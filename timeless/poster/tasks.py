@@ -1,84 +1,178 @@
 """Celery tasks for poster module"""
-import os
+from contextlib import contextmanager
 
 from flask import current_app
+from redis.exceptions import LockError
 
-from celery import shared_task
+from celery import chord, shared_task
 
-from timeless import DB
+from timeless.cache import CACHE, redis_client
 from timeless.customers.models import Customer
-from timeless.poster.api import Authenticated, PosterAuthData, Poster
+from timeless.db import DB
+from timeless.poster import sync
+from timeless.poster.api import (
+    Authenticated, CachedAuthenticated, PosterAuthData, Poster, shared_session
+)
 from timeless.restaurants.models import Table, Location
 
 
 def __poster_api():
+    config = current_app.config
     auth_data = PosterAuthData(
-        application_id=current_app.config.get("poster_application_id"),
-        application_secret=current_app.config.get("poster_application_secret"),
-        redirect_uri=current_app.config.get("poster_redirect_uri"),
-        code=current_app.config.get("poster_code"),
+        application_id=config.get("POSTER_APPLICATION_ID"),
+        application_secret=config.get("POSTER_APPLICATION_SECRET"),
+        redirect_uri=config.get("POSTER_REDIRECT_URI"),
+        code=config.get("POSTER_CODE"),
+    )
+    session = shared_session(
+        retries=config.get("POSTER_RETRIES", 3),
+        backoff_factor=config.get("POSTER_BACKOFF_FACTOR", 0.5),
+        pool_size=config.get("POSTER_POOL_SIZE", 10),
+    )
+    timeout = config.get("POSTER_TIMEOUT", 10)
+    authenticator = CachedAuthenticated(
+        Authenticated(auth_data=auth_data, session=session, timeout=timeout),
+        cache=CACHE,
+        ttl=config.get("POSTER_TOKEN_TTL", 3600)
+    )
+    poster = Poster(
+        auth_token=authenticator.auth(),
+        authenticator=authenticator,
+        session=session,
+        timeout=timeout,
+        page_size=config.get("POSTER_PAGE_SIZE", 500)
     )
-    auth_token = Authenticated(auth_data=auth_data).auth()
-    poster = Poster(auth_token=auth_token)
     return poster
 
 
+@contextmanager
+def __exclusive(name):
+    """Lock synchronization of name in Redis, so that a run never overlaps
+    the previous one. The lock expires after POSTER_SYNC_LOCK_TIMEOUT
+    seconds in case the worker holding it dies.
+    :return: Context manager giving False when another run holds the lock
+    """
+    lock = redis_client().lock(
+        f"poster:sync:{name}",
+        timeout=current_app.config.get("POSTER_SYNC_LOCK_TIMEOUT", 3600)
+    )
+    acquired = lock.acquire(blocking=False)
+    if not acquired:
+        current_app.logger.info("Poster sync of %s is already running", name)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except LockError:
+                current_app.logger.warning(
+                    "Poster sync of %s outlived its lock", name
+                )
+
+
+def __progress(task, shard):
+    """Report the number of rows written by the task, visible in the result
+    backend as PROGRESS state while the task runs."""
+    def report(written):
+        if task.request.id:
+            task.update_state(
+                state="PROGRESS", meta={"shard": shard, "written": written}
+            )
+    return report
+
+
 @shared_task
-def sync_tables():
+def sync_all(incremental=True):
     """
-    Periodic task for fetching and saving tables from Poster
-    @todo #187:30min Set up scheduler for celery,
-     docs - http://docs.celeryproject.org/en/
-     latest/userguide/periodic-tasks.html#id5
-     Also should make small refactoring: celery.py should situated in
-     timelessis/celery.py not in timelessis/sync/celery.py
+    Synchronize all Poster data in parallel.
+    Locations, customers and tables of every location are synchronized by
+    separate subtasks of a chord, so they run on all worker processes.
+    Tables of locations unknown before this run are picked up by the next
+    one.
+    :return: Id of the chord result, which is the sync summary
     """
-    for poster_table in __poster_api().tables():
-        table = DB.session(Table).query.filter_by(
-            name=poster_table["name"], floor_id=poster_table["floor_id"]
-        ).first()
-        merge_data(
-            model=Table, poster_data=poster_table, timelessis_data=table
-        )
+    shards = [sync_locations.si(incremental), sync_customers.si(incremental)]
+    shards.extend(
+        sync_tables.si(incremental, location_id=poster_id)
+        for poster_id in __location_ids()
+    )
+    return chord(shards)(sync_finished.s()).id
+
+
+def __location_ids():
+    """Poster ids of synchronized locations."""
+    locations = DB.session.query(Location.poster_id).filter(
+        Location.poster_id.isnot(None)
+    ).order_by(Location.poster_id)
+    return [poster_id for poster_id, in locations]
 
 
 @shared_task
-def sync_customers():
+def sync_finished(results):
+    """
+    Aggregate results of the subtasks of sync_all.
+    :param results: Numbers of rows written by every subtask
+    """
+    return {"shards": len(results), "written": sum(results)}
+
+
+@shared_task(bind=True)
+def sync_tables(self, incremental=True, location_id=None):
+    """
+    Periodic task for fetching and saving tables from Poster
+    Tables of a single location are synchronized when its Poster id is given
+    in location_id, otherwise tables of every location one after another.
+    Tables of a location are locked as "tables:<id>" either way, so this
+    task never overlaps the shards of sync_all.
+    Locations whose previous run is still going are skipped.
+    """
+    location_ids = [location_id]
+    if location_id is None:
+        location_ids = __location_ids()
+    written = 0
+    for poster_id in location_ids:
+        with __exclusive(f"tables:{poster_id}") as acquired:
+            if acquired:
+                written += sync.sync(
+                    Table, __poster_api().iter_tables(spot_id=poster_id),
+                    incremental=incremental,
+                    shard=poster_id,
+                    progress=__progress(self, poster_id)
+                )
+    return written
+
+
+@shared_task(bind=True)
+def sync_customers(self, incremental=True):
     """
     Periodic task for fetching and saving tables from Poster
     Docs - https://dev.joinposter.com/docs/api#clients-getclients
+    Poster has no filter by modification date for clients, so unchanged
+    clients are detected by the digest of their data.
+    Returns 0 without synchronizing when the previous run is still going.
     """
-    for poster_customer in __poster_api().customers().get("response", []):
-        customer = Customer.query.filter_by(
-            poster_id=poster_customer["client_id"]
-        ).first()
-        merge_data(
-            model=Customer,
-            poster_data=poster_customer,
-            timelessis_data=customer
+    with __exclusive("customers") as acquired:
+        if not acquired:
+            return 0
+        return sync.sync(
+            Customer, __poster_api().iter_customers(),
+            incremental=incremental,
+            progress=__progress(self, "customers")
         )
 
 
-@shared_task
-def sync_locations():
+@shared_task(bind=True)
+def sync_locations(self, incremental=True):
     """
     Periodic task for fetching and saving location from Poster
+    Returns 0 without synchronizing when the previous run is still going.
     """
-    for poster_location in __poster_api().locations():
-        location = DB.session(Location).query.filter_by(
-            name=poster_location["name"],
-            code=poster_location["code"]
-        ).first()
-        merge_data(
-            model=Location,
-            poster_data=poster_location,
-            timelessis_data=location
+    with __exclusive("locations") as acquired:
+        if not acquired:
+            return 0
+        return sync.sync(
+            Location, __poster_api().locations().get("response", []),
+            incremental=incremental,
+            progress=__progress(self, "locations")
         )
-
-
-def merge_data(model, poster_data, timelessis_data):
-    if timelessis_data:
-        DB.session.add(model.merge_with_poster(timelessis_data, poster_data))
-    else:
-        DB.session.merge(model.create_by_poster(poster_data))
-    DB.session.commit()
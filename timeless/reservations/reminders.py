@@ -0,0 +1,208 @@
+"""Sms reminders of upcoming reservations.
+
+Upcoming reservations are kept in a redis sorted set scored by their start
+time. Writes of reservations through the ORM update it once their
+transaction is committed: new and moved reservations are added or moved,
+canceled and deleted ones removed. Every REMINDER_SCHEDULE seconds the
+send_reminders task pops the reservations starting within
+threshold_sms_time minutes of ReservationSettings, loads them by primary
+key and queues their sms in the sms outbox, so the reservations table is
+never scanned. Reminders which fail to be queued are put back in the set.
+Reservations written with bulk statements bypass ORM events, the bulk API
+reschedules them by id. When redis cannot be reached the write is kept and
+the error logged, every REMINDER_RESCHEDULE seconds schedule_all() adds
+upcoming reservations again.
+"""
+import calendar
+from datetime import datetime, timedelta
+
+from flask import current_app
+from redis import RedisError
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from timeless.cache import redis_client
+from timeless.customers.models import Customer
+from timeless.db import DB
+from timeless.reservations.models import ReservationSettings
+from timeless.restaurants.models import Reservation
+from timeless.sms import outbox
+
+
+REMINDERS_KEY = "reservation-reminders"
+CHANGED_RESERVATIONS = "timeless_changed_reservations"
+# Statuses of reservations whose guests are reminded
+REMINDED_STATUSES = ("unconfirmed", "confirmed")
+MESSAGE = "Reminder: your table is reserved for {start_time:%d.%m %H:%M}"
+
+
+def score(moment):
+    """Score of a naive UTC datetime in the sorted set."""
+    return calendar.timegm(moment.timetuple())
+
+
+def is_reminded(status, start_time, now=None):
+    """Whether a reservation with status starting at start_time is waiting
+    for its reminder."""
+    status = getattr(status, "code", status)
+    return (status in REMINDED_STATUSES and start_time is not None and
+            start_time > (now or datetime.utcnow()))
+
+
+def schedule(reservations):
+    """
+    Add upcoming reservations to the sorted set, remove others.
+    :param reservations: Iterable of (id, status, start_time), status None
+     for deleted reservations
+    """
+    now = datetime.utcnow()
+    pipeline = redis_client().pipeline(transaction=False)
+    for reservation_id, status, start_time in reservations:
+        if is_reminded(status, start_time, now):
+            pipeline.zadd(REMINDERS_KEY, {reservation_id: score(start_time)})
+        else:
+            pipeline.zrem(REMINDERS_KEY, reservation_id)
+    pipeline.execute()
+
+
+def reschedule(reservation_ids):
+    """Schedule reminders of the reservations with the given ids as they are
+    stored, removing those which were deleted."""
+    reservation_ids = set(reservation_ids)
+    if not reservation_ids:
+        return
+    stored = Reservation.query.filter(
+        Reservation.id.in_(reservation_ids)
+    ).with_entities(Reservation.id, Reservation.status, Reservation.start_time)
+    rows = list(stored)
+    schedule(rows + [
+        (reservation_id, None, None)
+        for reservation_id in reservation_ids - {row[0] for row in rows}
+    ])
+
+
+def schedule_all():
+    """Schedule reminders of all upcoming reservations, through the index on
+    reservations.start_time.
+    :return: Number of reservations scheduled
+    """
+    upcoming = Reservation.query.filter(
+        Reservation.start_time > datetime.utcnow(),
+        Reservation.status.in_(REMINDED_STATUSES)
+    ).with_entities(Reservation.id, Reservation.status, Reservation.start_time)
+    count = 0
+    batch = []
+    for row in upcoming.yield_per(1000):
+        batch.append(row)
+        if len(batch) == 1000:
+            schedule(batch)
+            count += len(batch)
+            batch = []
+    schedule(batch)
+    return count + len(batch)
+
+
+def pop_due(until):
+    """Remove and return ids of reservations starting until the given
+    datetime. Both happen in one redis transaction, so concurrent runs never
+    get the same reservations."""
+    pipeline = redis_client().pipeline(transaction=True)
+    pipeline.zrangebyscore(REMINDERS_KEY, "-inf", score(until))
+    pipeline.zremrangebyscore(REMINDERS_KEY, "-inf", score(until))
+    members, _ = pipeline.execute()
+    return [int(member) for member in members]
+
+
+def restore(reservation_ids, until):
+    """Put back popped reservations whose reminders could not be queued,
+    due until the given datetime, so that the next run sends them. Those
+    scheduled again meanwhile keep their new start time."""
+    redis_client().zadd(
+        REMINDERS_KEY,
+        {reservation_id: score(until) for reservation_id in reservation_ids},
+        nx=True
+    )
+
+
+def threshold():
+    """Minutes before the start of reservations their reminders are sent,
+    None when sms notifications are disabled."""
+    settings = ReservationSettings.query.order_by(
+        ReservationSettings.id).first()
+    if settings is None or not settings.sms_notifications:
+        return None
+    return settings.threshold_sms_time
+
+
+def send_due():
+    """
+    Queue sms reminders of reservations starting within the threshold. When
+    notifications are disabled, reminders which became due are dropped. When
+    they cannot be queued, they are restored for the next run.
+    :return: Number of reminders queued
+    """
+    now = datetime.utcnow()
+    minutes = threshold()
+    until = now + timedelta(minutes=minutes or 0)
+    due = pop_due(until)
+    if minutes is None or not due:
+        return 0
+    try:
+        reservations = DB.session.query(
+            Reservation.status, Reservation.start_time,
+            Customer.phone_normalized
+        ).join(Customer, Customer.id == Reservation.customer_id).filter(
+            Reservation.id.in_(due)
+        )
+        return outbox.enqueue(
+            (phone, MESSAGE.format(start_time=start_time))
+            for status, start_time, phone in reservations
+            if phone and is_reminded(status, start_time, now)
+        )
+    except Exception:
+        restore(due, until)
+        raise
+
+
+@event.listens_for(Reservation, "after_insert")
+@event.listens_for(Reservation, "after_update")
+def __remember_reservation(mapper, connection, target):
+    session = object_session(target)
+    if session is None:
+        return
+    start_time = target.start_time
+    if not isinstance(start_time, datetime):
+        # assigned as text, e.g. from a form, the stored value is a datetime
+        start_time = connection.scalar(select([Reservation.start_time]).where(
+            Reservation.id == target.id))
+    session.info.setdefault(CHANGED_RESERVATIONS, {})[target.id] = (
+        target.status, start_time)
+
+
+@event.listens_for(Reservation, "after_delete")
+def __remember_deleted_reservation(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(CHANGED_RESERVATIONS, {})[target.id] = (
+            None, None)
+
+
+@event.listens_for(Session, "after_commit")
+def __schedule_changed_reservations(session):
+    changed = session.info.pop(CHANGED_RESERVATIONS, None)
+    if not changed:
+        return
+    try:
+        schedule(
+            (reservation_id, status, start_time)
+            for reservation_id, (status, start_time) in changed.items()
+        )
+    except RedisError:
+        # the reservations are committed, schedule_all() adds them later
+        current_app.logger.exception(
+            "Reminders of %d reservations not scheduled", len(changed))
+
+
+@event.listens_for(Session, "after_rollback")
+def __forget_changed_reservations(session):
+    session.info.pop(CHANGED_RESERVATIONS, None)
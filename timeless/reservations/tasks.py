@@ -0,0 +1,24 @@
+"""Celery tasks for reservations module"""
+from celery import shared_task
+
+from timeless.reservations import reminders
+
+
+@shared_task
+def send_reminders():
+    """
+    Periodic task queueing sms reminders of reservations which start soon,
+    see timeless.reservations.reminders.
+    :return: Number of reminders queued
+    """
+    return reminders.send_due()
+
+
+@shared_task
+def schedule_reminders():
+    """
+    Periodic task scheduling reminders of all upcoming reservations, for
+    those whose reminders could not be scheduled when they were written.
+    :return: Number of reservations scheduled
+    """
+    return reminders.schedule_all()
@@ -1,26 +1,42 @@
 """ Views for reservations """
-from datetime import datetime
 from http import HTTPStatus
 
 from flask import (
-    Blueprint, flash, redirect, render_template, request, url_for, jsonify
+    Blueprint, current_app, flash, redirect, render_template, request,
+    url_for, jsonify
 )
+from redis import RedisError
+from sqlalchemy import false
 
-from timeless import DB
+from timeless import DB, bulk
 from timeless.reservations.forms import ReservationForm, SettingsForm
-from timeless.restaurants.models import Reservation
+from timeless.restaurants.models import Reservation, Table, TableReservation
 from timeless import views
+from timeless.counts import AdaptiveCount
+from timeless.access_control.scope import current_scope
 from timeless.access_control.views import SecuredView
-from timeless.reservations import models
+from timeless.auth import views as auth
+from timeless.reservations import models, reminders
 
 
 BP = Blueprint("reservations", __name__, url_prefix="/reservations")
 
 
+def scoped_reservations():
+    """Reservations at tables of the company of the user."""
+    table_ids = current_scope().table_ids
+    if not table_ids:
+        return Reservation.query.filter(false())
+    return Reservation.query.filter(Reservation.tables.any(
+        TableReservation.table_id.in_(table_ids)))
+
+
 class ReservationsListView(views.ListView):
     """ List the reservations """
     model = Reservation
     template_name = "reservations/list.html"
+    count_strategy = AdaptiveCount()
+    conditional = True
 
 
 class ReservationsViewCreate(views.CreateView):
@@ -46,7 +62,18 @@ class ReservationsDeleteView(views.DeleteView):
     model = Reservation
 
 
+class ReservationsExportView(views.ExportView):
+    """ Export the reservations of the company as csv or json lines """
+    decorators = (auth.login_required,)
+    model = Reservation
+    resource = "reservation"
+
+    def get_query(self):
+        return scoped_reservations().order_by(Reservation.id)
+
+
 ReservationsListView.register(BP, "/", name="list")
+ReservationsExportView.register(BP, "/export", name="export")
 ReservationsViewCreate.register(BP, "/create", name="create")
 ReservationsEditView.register(BP, "/edit/<int:id>", name="edit")
 ReservationsDeleteView.register(BP, "/delete/<int:id>", name="delete")
@@ -99,43 +126,77 @@ SettingsDelete.register(BP, "/settings/delete/<int:setting_id>")
 class CommentView(SecuredView, views.CrudAPIView):
     """API Resource for comments /api/comments
 
+    Only comments of employees of the company of the logged in user are
+    read and written.
     """
+    decorators = (auth.api_login_required,)
     model = models.Comment
     url_lookup = "comment_id"
-    list_reservations = "reservation_comment"
+    resource = "reservation_comment"
 
+    def get_query(self):
+        """Comments of employees of the company of the user."""
+        employee_ids = current_scope().employees
+        if not employee_ids:
+            return models.Comment.query.filter(false())
+        return models.Comment.query.filter(
+            models.Comment.employee_id.in_(employee_ids))
 
-class ReservationView(views.CrudAPIView):
+    def get(self, object_id=None):
+        """A page of comments, or the comment with object_id."""
+        if object_id is None:
+            return super().get()
+        return self.get_detail(object_id)
+
+
+class ReservationView(SecuredView, views.CrudAPIView):
     """ Reservation JSON API /api/reservations
 
+    Reservations are listed by start time, pages are navigated with
+    the cursors returned in "next" and "prev". Only reservations of tables
+    of the company of the logged in user are returned. Reservations created
+    in bulk list the ids of their tables in table_ids.
+    @todo #28:30min Filter listed reservations by location and date.
     """
-
-    def get(self, company_id):
-        """Retrieve reservations based on location, and date.
-            @todo #28:30min Implement actual fetching of reservations. We need
-             to return a JSON list, filtered by reservations based on location
-             and date. We also need to password protect this API, and filter
-             those belonging to the specific company ID. Let's implement the
-             serialization and deserialization of JSON based on this API:
-             https://flask-marshmallow.readthedocs.io/en/latest/
-
-        :param self:
-        :return:
-        """
-        reservations_json = {
-            "items": [
-                {
-                    "id": 1,
-                    "start_time": datetime(1, 1, 1),
-                    "end_time": datetime(1, 1, 1),
-                    "customer_id": 1,
-                    "num_of_persons": 1,
-                    "comment": "Test",
-                    "status": 2
-                }
-            ]
-        }
-        return jsonify(reservations_json)
+    decorators = (auth.api_login_required,)
+    model = Reservation
+    url_lookup = "reservation_id"
+    sort_key = "start_time"
+    resource = "reservation"
+    conditional = True
+    cache_models = (Reservation, TableReservation, Table)
+
+    def get_query(self):
+        """Reservations at tables of the company of the user."""
+        return scoped_reservations()
+
+    def get_bulk_links(self):
+        """Tables of the company reserved by created reservations."""
+        return bulk.Links(
+            field="table_ids",
+            model=TableReservation,
+            key="reservation_id",
+            other_key="table_id",
+            allowed=current_scope().table_ids
+        )
+
+    def bulk_response(self, results):
+        """Schedule reminders of the reservations written by bulk
+        statements, which bypass the ORM events of reminders."""
+        try:
+            reminders.reschedule(
+                result.id for result in results
+                if result.id is not None and result.status < 300
+            )
+        except RedisError:
+            current_app.logger.exception("Reminders not scheduled")
+        return super().bulk_response(results)
+
+    def get(self, object_id=None):
+        """A page of reservations, or the reservation with object_id."""
+        if object_id is None:
+            return super().get()
+        return self.get_detail(object_id)
 
 
 class CreateReservation(views.CrudAPIView):
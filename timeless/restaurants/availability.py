@@ -0,0 +1,80 @@
+"""Availability of restaurant tables.
+
+Reservation periods are compared with the PostgreSQL range overlap operator,
+which is served by the GiST index on tsrange(start_time, end_time) created in
+migration 2019-03-02T101500. Together with the index on
+table_reservations.table_id, every table is checked with index lookups only,
+instead of scanning all reservations.
+"""
+from datetime import timezone
+
+from sqlalchemy import func, or_
+
+from timeless.db import DB
+from timeless.restaurants.models import Reservation, Table, TableReservation
+
+
+# Statuses of reservations that no longer occupy their tables
+RELEASED_STATUSES = ("canceled", "finished")
+
+
+def naive_utc(moment):
+    """Naive UTC datetime of moment, as reservation times are stored."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def period(start_time, end_time):
+    """Half open [start_time, end_time) range expression."""
+    return func.tsrange(start_time, end_time)
+
+
+def occupying_reservations(start_time, end_time):
+    """Table reservations occupying a table at some moment of the period.
+    :param start_time: Start of the period
+    :param end_time: End of the period, not included
+    :return: Query of TableReservation
+    """
+    return DB.session.query(TableReservation).join(
+        TableReservation.reservation
+    ).filter(
+        period(Reservation.start_time, Reservation.end_time).op("&&")(
+            period(start_time, end_time)
+        ),
+        ~Reservation.status.in_(RELEASED_STATUSES)
+    )
+
+
+def available_tables(floor_id, start_time, end_time, persons):
+    """Tables of the floor able to seat persons and free during the period.
+    Smallest fitting tables are returned first.
+    :param floor_id: Id of the floor
+    :param start_time: Start of the period
+    :param end_time: End of the period, not included
+    :param persons: Number of persons to seat
+    :return: Query of Table
+    """
+    occupied = occupying_reservations(start_time, end_time).filter(
+        TableReservation.table_id == Table.id
+    )
+    return Table.query.filter(
+        Table.floor_id == floor_id,
+        Table.max_capacity >= persons,
+        or_(Table.min_capacity.is_(None), Table.min_capacity <= persons),
+        ~occupied.exists()
+    ).order_by(Table.max_capacity, Table.id)
+
+
+def is_available(table_id, start_time, end_time):
+    """Check that the table is not reserved during the period.
+    :param table_id: Id of the table
+    :param start_time: Start of the period
+    :param end_time: End of the period, not included
+    :return: True when the table is free
+    """
+    return not DB.session.query(
+        occupying_reservations(start_time, end_time).filter(
+            TableReservation.table_id == table_id
+        ).exists()
+    ).scalar()
@@ -29,7 +29,7 @@ from flask import (
 from timeless import views
 from timeless.auth import views as auth
 from timeless.restaurants.floors.forms import FloorForm
-from timeless.restaurants.models import Floor
+from timeless.restaurants.models import Floor, Location
 
 
 BP = Blueprint("floor", __name__, url_prefix="/floors")
@@ -39,6 +39,10 @@ class List(views.ListView):
     """List all floors"""
     template_name = "restaurants/floors/list.html"
     model = Floor
+    cache_timeout = 600
+    cache_models = (Floor, Location)
+    conditional = True
+    eager = ("location",)
 
 
 @BP.route("/edit/<int:id>", methods=("GET", "POST"))
@@ -73,6 +77,8 @@ class Detail(views.DetailView):
     """ Detail view for Reservation Settings  """
     model = Floor
     template_name = "restaurants/floors/create_edit.html"
+    cache_timeout = 600
+    conditional = True
 
 
 Create.register(BP, "/create")
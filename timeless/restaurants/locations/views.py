@@ -2,7 +2,8 @@
 from flask import Blueprint
 
 from timeless import views
-from timeless.restaurants.models import Location
+from timeless.companies.models import Company
+from timeless.restaurants.models import Floor, Location
 from timeless.restaurants.locations.forms import LocationForm
 
 
@@ -36,6 +37,9 @@ class List(views.ListView):
     """List all locations"""
     template_name = "restaurants/locations/list.html"
     model = Location
+    cache_timeout = 600
+    cache_models = (Location, Company, Floor)
+    eager = ("company", "floors")
 
 
 List.register(BP, "/")
@@ -1,5 +1,6 @@
 """File for models in restaurants module"""
 import enum
+from datetime import datetime
 
 from timeless.db import DB
 from timeless.models import TimestampsMixin
@@ -70,25 +71,46 @@ class Location(PosterSyncMixin, DB.Model):
 
     company = DB.relationship("Company", back_populates="locations")
     floors = DB.relationship("Floor", order_by=Floor.id, back_populates="location")
+    devices = DB.relationship("Device", back_populates="location")
     working_hours = DB.Column(DB.Integer, DB.ForeignKey("scheme_types.id"))
     closed_days = DB.Column(DB.Integer, DB.ForeignKey("scheme_types.id"))
+    poster_unique_keys = (("name",), ("code",))
 
     def __repr__(self):
         return "<Location %r>" % self.name
 
+    @classmethod
+    def poster_values(cls, poster_location: dict) -> dict:
+        """
+        Method should return Location column values taken from
+        poster_location dict
+        """
+        return {
+            "name": poster_location["name"],
+            "code": poster_location["code"],
+            "country": poster_location["country"],
+            "region": poster_location["region"],
+            "city": poster_location["city"],
+            "address": poster_location["address"],
+            "longitude": poster_location["longitude"],
+            "latitude": poster_location["latitude"],
+            "type": poster_location["type"],
+            "status": poster_location["status"],
+            "comment": poster_location.get("comment"),
+            "poster_id": poster_location["id"],
+        }
+
     @classmethod
     def merge_with_poster(cls, location, poster_location: dict):
         """
         Method should return Location object with merged data from table entity
         and poster location dict
-        @todo #343:30min Implement two class methods merge_with_poster and
-         create_by_poster. merge_with_poster will merge entry entity with
-         poster entity, we should make right fields mapping, as result
-         returns Location instance.
-         The same should be made with method create_by_poster, returns Location
-         instance with data from poster_customer
         """
-        raise NotImplementedError()
+        return Location(**{
+            **cls.poster_values(poster_location),
+            "id": location.id,
+            "synchronized_on": datetime.utcnow()
+        })
 
     @classmethod
     def create_by_poster(cls, poster_location: dict):
@@ -96,7 +118,30 @@ class Location(PosterSyncMixin, DB.Model):
         Method should return Location object with given data from
         poster_location dict
         """
-        raise NotImplementedError()
+        return Location(
+            **cls.poster_values(poster_location),
+            synchronized_on=datetime.utcnow()
+        )
+
+
+class Device(DB.Model):
+    """Shared tablet of a location, where employees log in with their PIN
+    code. Only the digest of its token is stored."""
+
+    __tablename__ = "devices"
+
+    id = DB.Column(DB.Integer, primary_key=True, autoincrement=True)
+    name = DB.Column(DB.String, nullable=False)
+    location_id = DB.Column(DB.Integer, DB.ForeignKey("locations.id"),
+                            nullable=False)
+    token_digest = DB.Column(DB.String(64), unique=True, nullable=False)
+    created_on = DB.Column(DB.DateTime, default=datetime.utcnow,
+                           nullable=False)
+
+    location = DB.relationship("Location", back_populates="devices")
+
+    def __repr__(self):
+        return "<Device %r>" % self.name
 
 
 class TableReservation(DB.Model):
@@ -135,10 +180,33 @@ class Table(TimestampsMixin, PosterSyncMixin, DB.Model):
     floor = DB.relationship("Floor", back_populates="tables")
 
     DB.UniqueConstraint(u"name", u"floor_id")
+    poster_unique_keys = (("name", "floor_id"),)
 
     def __repr__(self):
         return "<Table %r>" % self.name
 
+    @classmethod
+    def poster_values(cls, poster_table: dict) -> dict:
+        """
+        Method should return Table column values taken from poster_table dict
+        """
+        return {
+            "name": poster_table["name"],
+            "floor_id": poster_table["floor_id"],
+            "x": poster_table["x"],
+            "y": poster_table["y"],
+            "width": poster_table["width"],
+            "height": poster_table["height"],
+            "status": poster_table["status"],
+            "max_capacity": poster_table["max_capacity"],
+            "min_capacity": poster_table.get("min_capacity"),
+            "multiple": poster_table.get("multiple"),
+            "playstation": poster_table.get("playstation"),
+            "shape_id": poster_table.get("shape_id"),
+            "deposit_hour": poster_table.get("deposit_hour"),
+            "poster_id": poster_table["id"],
+        }
+
 
 class Reservation(TimestampsMixin, DB.Model):
     """Model for a Reservation
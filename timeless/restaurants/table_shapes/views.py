@@ -43,7 +43,10 @@ def list():
     if order_fields:
         query = order_by(query, order_fields)
     if filter_fields:
-        query = filter_by(query, filter_fields)
+        try:
+            query = filter_by(query, filter_fields)
+        except ValueError:
+            abort(HTTPStatus.BAD_REQUEST)
     return render_template(
         "restaurants/table_shapes/list.html",
         table_shapes=query.all())
@@ -1,9 +1,14 @@
 """tables views module.
 """
-from flask import Blueprint
+from http import HTTPStatus
+
+from dateutil.parser import isoparse
+from flask import Blueprint, abort, jsonify, request
 
 from timeless import views
-from timeless.restaurants import models
+from timeless.access_control.scope import current_scope
+from timeless.auth import views as auth
+from timeless.restaurants import availability, models
 from timeless.restaurants.tables import forms
 
 
@@ -14,6 +19,9 @@ class TableListView(views.ListView):
     """ List the tables """
     model = models.Table
     template_name = "restaurants/tables/list.html"
+    cache_timeout = 600
+    cache_models = (models.Table, models.Floor, models.TableShape)
+    conditional = True
 
 
 class Create(views.CreateView):
@@ -36,7 +44,59 @@ class Delete(views.DeleteView):
     success_view_name = "table.list_tables"
 
 
+class Import(views.ImportView):
+    """Import tables from csv, onto the floors of the scope of the user"""
+    decorators = (auth.login_required,)
+    model = models.Table
+    resource = "table"
+
+    def get_allowed_values(self):
+        floors = models.Floor.query.filter(
+            models.Floor.location_id.in_(current_scope().location_ids)
+        ).with_entities(models.Floor.id)
+        return {"floor_id": {floor_id for floor_id, in floors}}
+
+
+@BP.route("/available")
+@auth.login_required
+def available():
+    """List tables of a floor which are free for a number of persons
+    in a period, e.g.:
+    /tables/available?floor_id=1&persons=4&start_time=2019-03-02T19:00
+    &end_time=2019-03-02T21:00
+    Times with an offset are converted to UTC. Only floors of locations of
+    the company of the user are found.
+    """
+    try:
+        floor_id = int(request.args["floor_id"])
+        persons = int(request.args["persons"])
+        start_time = availability.naive_utc(
+            isoparse(request.args["start_time"]))
+        end_time = availability.naive_utc(isoparse(request.args["end_time"]))
+    except (KeyError, ValueError, OverflowError):
+        abort(HTTPStatus.BAD_REQUEST)
+    if end_time <= start_time:
+        abort(HTTPStatus.BAD_REQUEST)
+    location_id = models.Floor.query.filter(
+        models.Floor.id == floor_id
+    ).with_entities(models.Floor.location_id).scalar()
+    if not current_scope().has_location(location_id):
+        abort(HTTPStatus.NOT_FOUND)
+    tables = availability.available_tables(
+        floor_id, start_time, end_time, persons)
+    return jsonify(tables=[
+        {
+            "id": table.id,
+            "name": table.name,
+            "min_capacity": table.min_capacity,
+            "max_capacity": table.max_capacity,
+        }
+        for table in tables
+    ])
+
+
 TableListView.register(BP, "/")
 Create.register(BP, "/create")
 Edit.register(BP, "/edit/<int:id>")
 Delete.register(BP, "/delete/<int:id>")
+Import.register(BP, "/import")
@@ -15,7 +15,19 @@ class RoleType(Enum):
     Owner = "Owner"
 
 
-class Role(DB.Model):
+class RoleTypeMixin:
+    """ Checks of role_type shared by roles and role principals """
+
+    def is_master_or_intern(self):
+        """ check if the type is master or intern """
+        return self.role_type in (RoleType.Master, RoleType.Intern,)
+
+    def is_director(self):
+        """ check if type is director """
+        return self.role_type == RoleType.Director
+
+
+class Role(RoleTypeMixin, DB.Model):
     """Settings model for Role."""
 
     __tablename__ = "roles"
@@ -36,11 +48,3 @@ class Role(DB.Model):
 
     def __repr__(self):
         return "<Role %r>" % self.role_type
-
-    def is_master_or_intern(self):
-        """ check if the type is master or intern """
-        return self.role_type in (RoleType.Master, RoleType.Intern,)
-
-    def is_director(self):
-        """ check if type is director """
-        return self.role_type == RoleType.Director
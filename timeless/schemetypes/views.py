@@ -63,7 +63,7 @@ class SchemeConditionList(ListView):
         self.scheme_type_id = scheme_type_id
         return super().get(self, scheme_type_id)
 
-    def get_object_list(self):
+    def get_query(self):
         return self.model.query.filter(
             SchemeCondition.scheme_type_id == self.scheme_type_id)
 
@@ -0,0 +1,100 @@
+"""Module for sms sending"""
+import hashlib
+from datetime import datetime
+from http import HTTPStatus
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# provider answers worth sending the message again later
+RETRY_STATUS_CODES = (
+    HTTPStatus.NOT_FOUND,
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+)
+
+__session = None
+
+
+def create_session(pool_size=10):
+    """Creates http session keeping connections to providers alive. Failed
+    requests are not retried here, the outbox sends them again later, see
+    timeless.sms.outbox."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def shared_session(**kwargs):
+    """Http session shared by all sms sent by the process, it is created
+    on first use with the given create_session arguments."""
+    global __session
+    if __session is None:
+        __session = create_session(**kwargs)
+    return __session
+
+
+class SMS:
+    """Interface for SMS"""
+
+    # recipients of the same message sent with a single request
+    max_recipients = 1
+
+    def send(self):
+        """Abstract method send"""
+        raise NotImplementedError
+
+
+class RedSMS(SMS):
+    """Class for sms sending
+    API docs - https://redsms.ru/api-doc/
+    The same message is sent to up to max_recipients numbers at once, given
+    as a list in recipient.
+    """
+    api_url = "https://cp.redsms.ru/api/message"
+    max_recipients = 100
+
+    def __init__(
+            self, login, api_key, recipient, message, sender, session=None,
+            timeout=10):
+        self.login = login
+        self.api_key = api_key
+        self.recipient = recipient
+        self.message = message
+        self.sender = sender
+        self.session = session or shared_session()
+        self.timeout = timeout
+
+    def make_base_payload(self):
+        """Make base payload with basic data for provider
+        """
+        timestamp = datetime.now().timestamp()
+        return {
+            "login": self.login,
+            "ts": timestamp,
+            "secret": hashlib.sha512(
+                f"{timestamp}{self.api_key}".encode()
+            ).hexdigest(),
+            "route": "sms",
+        }
+
+    def send(self):
+        """
+        Sends sms via provider
+        """
+        recipient = self.recipient
+        if not isinstance(recipient, str):
+            recipient = ",".join(recipient)
+        base_payload = self.make_base_payload()
+        return self.session.post(self.api_url, data={
+            "to": recipient,
+            "text": self.message,
+            "from": self.sender,
+            **base_payload
+        }, timeout=self.timeout)
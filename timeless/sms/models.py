@@ -0,0 +1,36 @@
+"""Models of the sms outbox"""
+from datetime import datetime
+
+from sqlalchemy_utils import ChoiceType
+
+from timeless.db import DB
+from timeless.models import TimestampsMixin
+
+
+SMS_STATUS = [
+    (u"pending", u"Pending"),
+    (u"sent", u"Sent"),
+    (u"failed", u"Failed"),
+]
+
+
+class OutgoingSMS(TimestampsMixin, DB.Model):
+    """Sms queued in the outbox, with the state of its delivery. Pending
+    messages are sent by timeless.sms.tasks.send_pending once
+    next_attempt_on has passed."""
+
+    __tablename__ = "outgoing_sms"
+
+    id = DB.Column(DB.Integer, primary_key=True, autoincrement=True)
+    recipient = DB.Column(DB.String(16), nullable=False)
+    message = DB.Column(DB.String, nullable=False)
+    status = DB.Column(ChoiceType(SMS_STATUS), nullable=False,
+                       default=u"pending")
+    attempts = DB.Column(DB.Integer, nullable=False, default=0)
+    next_attempt_on = DB.Column(DB.DateTime, nullable=False,
+                                default=datetime.utcnow)
+    last_error = DB.Column(DB.String)
+    sent_on = DB.Column(DB.DateTime)
+
+    def __repr__(self):
+        return "<OutgoingSMS %r>" % self.id
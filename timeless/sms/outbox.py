@@ -0,0 +1,137 @@
+"""Outbox of sms sent by celery workers.
+
+Requests and campaigns only store messages in the outbox, workers send
+them in batches of SMS_BATCH_SIZE. Messages of a batch with the same text
+are sent with one provider request for up to max_recipients numbers, over
+http connections kept open by the worker process. A message failing to
+send is not waited for: it is tried again after SMS_RETRY_BACKOFF seconds,
+doubled on every attempt, until it failed SMS_MAX_ATTEMPTS times.
+"""
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import requests
+from flask import current_app
+
+from timeless.db import DB
+from timeless.sms import RETRY_STATUS_CODES, RedSMS, shared_session
+from timeless.sms.models import OutgoingSMS
+
+
+PROVIDER = RedSMS
+
+
+def enqueue(messages):
+    """
+    Store messages in the outbox and commit them, workers send them. One
+    task is queued per batch, so that large campaigns are sent by all
+    workers at once.
+    :param messages: Iterable of (recipient, message) pairs
+    :return: Number of messages queued
+    """
+    # tasks import this module
+    from timeless.sms import tasks
+    rows = [
+        {"recipient": recipient, "message": message}
+        for recipient, message in messages
+    ]
+    DB.session.bulk_insert_mappings(OutgoingSMS, rows)
+    DB.session.commit()
+    batch_size = current_app.config["SMS_BATCH_SIZE"]
+    for _ in range(0, len(rows), batch_size):
+        tasks.send_pending.delay()
+    return len(rows)
+
+
+def provider(recipients, message):
+    """Provider request sending the message to the recipients."""
+    config = current_app.config
+    return PROVIDER(
+        login=config["REDSMS_LOGIN"],
+        api_key=config["REDSMS_API_KEY"],
+        recipient=recipients,
+        message=message,
+        sender=config["SMS_SENDER"],
+        session=shared_session(pool_size=config["SMS_POOL_SIZE"]),
+        timeout=config["SMS_TIMEOUT"],
+    )
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt, after attempts failed."""
+    return current_app.config["SMS_RETRY_BACKOFF"] * 2 ** (attempts - 1)
+
+
+def claim(limit):
+    """Pending messages due now, locked until the transaction ends, so that
+    other workers skip them."""
+    return OutgoingSMS.query.filter(
+        OutgoingSMS.status == u"pending",
+        OutgoingSMS.next_attempt_on <= datetime.utcnow()
+    ).order_by(OutgoingSMS.next_attempt_on).limit(limit).with_for_update(
+        skip_locked=True).all()
+
+
+def chunks(messages):
+    """Messages grouped by text, in chunks sent with a single request."""
+    by_text = {}
+    for sms in messages:
+        by_text.setdefault(sms.message, []).append(sms)
+    size = PROVIDER.max_recipients
+    for group in by_text.values():
+        for start in range(0, len(group), size):
+            yield group[start:start + size]
+
+
+def record(messages, error=None, retry=False):
+    """Record the state of messages after an attempt to send them, error
+    is None when they were sent."""
+    max_attempts = current_app.config["SMS_MAX_ATTEMPTS"]
+    now = datetime.utcnow()
+    for sms in messages:
+        sms.attempts += 1
+        sms.last_error = error
+        if error is None:
+            sms.status = u"sent"
+            sms.sent_on = now
+        elif retry and sms.attempts < max_attempts:
+            sms.next_attempt_on = now + timedelta(
+                seconds=retry_delay(sms.attempts))
+        else:
+            sms.status = u"failed"
+
+
+def deliver(messages):
+    """
+    Send the messages and record their state.
+    :return: Number of messages sent
+    """
+    sent = 0
+    for chunk in chunks(messages):
+        try:
+            response = provider(
+                [sms.recipient for sms in chunk], chunk[0].message).send()
+        except requests.RequestException as error:
+            record(chunk, error=str(error), retry=True)
+            continue
+        if response.status_code < HTTPStatus.BAD_REQUEST:
+            record(chunk)
+            sent += len(chunk)
+        else:
+            record(
+                chunk,
+                error=f"{response.status_code}: {response.text[:200]}",
+                retry=response.status_code in RETRY_STATUS_CODES
+            )
+    return sent
+
+
+def send_pending():
+    """
+    Send a batch of pending messages.
+    :return: Numbers of messages sent and of messages of the batch
+    """
+    messages = claim(current_app.config["SMS_BATCH_SIZE"])
+    sent = deliver(messages)
+    DB.session.commit()
+    return sent, len(messages)
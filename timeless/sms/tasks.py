@@ -0,0 +1,21 @@
+"""Celery tasks for sms module"""
+from celery import shared_task
+from flask import current_app
+
+from timeless.sms import outbox
+
+
+@shared_task
+def send_pending():
+    """
+    Send pending messages of the outbox, batch after batch, until none is
+    due. Runs after messages are queued and periodically, for retries.
+    :return: Number of messages sent
+    """
+    batch_size = current_app.config["SMS_BATCH_SIZE"]
+    total = 0
+    while True:
+        sent, claimed = outbox.send_pending()
+        total += sent
+        if claimed < batch_size:
+            return total
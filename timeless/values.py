@@ -0,0 +1,41 @@
+"""Conversion of text, from csv files or query parameters, to the python
+types of columns, see timeless.imports and timeless.filters.
+"""
+from datetime import date, datetime
+
+from dateutil.parser import isoparse
+from sqlalchemy_utils import ChoiceType
+
+
+TRUE_VALUES = ("1", "t", "true", "yes")
+FALSE_VALUES = ("0", "f", "false", "no")
+
+
+def parse(column, text):
+    """Convert text to the python type of the column.
+    :raise ValueError: When the text does not fit the column
+    """
+    if text == "":
+        if not column.nullable and column.default is None:
+            raise ValueError("Field may not be null")
+        return None
+    if isinstance(column.type, ChoiceType):
+        if text not in dict(column.type.choices):
+            raise ValueError("Not a valid choice")
+        return text
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return text
+    try:
+        if python_type is bool:
+            if text.lower() not in TRUE_VALUES + FALSE_VALUES:
+                raise ValueError
+            return text.lower() in TRUE_VALUES
+        if python_type is datetime:
+            return isoparse(text)
+        if python_type is date:
+            return isoparse(text).date()
+        return python_type(text)
+    except ValueError:
+        raise ValueError(f"Not a valid {python_type.__name__}") from None
@@ -12,20 +12,169 @@
  model.query.get(object_id) that would decorate the real implementation,
  eliminating the coupling here.
 """
+import hashlib
+import io
+import json
 import re
 from http import HTTPStatus
 
-from flask import views, redirect, render_template, request, url_for, jsonify
-from sqlalchemy import desc, asc
+import attr
+from flask import (
+    Response, current_app, g, make_response, views, redirect,
+    render_template, request, stream_with_context, url_for, jsonify
+)
+from sqlalchemy import asc, desc, func
+from sqlalchemy.orm import aliased, joinedload, load_only, selectinload
 from werkzeug.exceptions import abort
+from werkzeug.http import is_resource_modified
 
-from timeless import DB
+from timeless import DB, bulk, export, imports
+from timeless.access_control import authorization
+from timeless.access_control.scope import current_scope
+from timeless.filters import GenericFilter
+from timeless.cache import CACHE, model_versions
+from timeless.pagination import (
+    json_value, keyset_condition, paginate, parse_ordering)
 
 
 camel_to_underscore = re.compile("((?<=[a-z0-9])[A-Z]|(?!^)[A-Z](?=[a-z]))")
 
 
-class CrudAPIView(views.MethodView):
+@attr.s
+class Page:
+    """ Single page of a paginated list """
+    object_list = attr.ib()
+    number = attr.ib()
+    limit = attr.ib()
+    has_next = attr.ib()
+    next_after = attr.ib()
+    previous_before = attr.ib(default=None)
+    args = attr.ib(factory=dict)
+    count = attr.ib(default=None)
+
+    @property
+    def has_previous(self):
+        """ Whether there is a previous page """
+        return self.number > 1
+
+    @property
+    def page_count(self):
+        """ Number of pages, None when objects are not counted """
+        if self.count is None:
+            return None
+        return max(1, -(-self.count.value // self.limit))
+
+
+class CachedResponseMixin:
+    """Cache successful GET responses in CACHE for cache_timeout seconds.
+    Responses are cached by url, query arguments and company of the user,
+    and by the versions of cache_models (model by default), so they expire
+    as soon as any of these models changes. Caching is disabled while
+    cache_timeout is None.
+    Example:
+        class List(views.ListView):
+            model = Location
+            cache_timeout = 600
+    """
+    cache_timeout = None
+    cache_models = ()
+    cache_per_user = False
+
+    def get_cache_models(self):
+        """ Models whose data the response depends on """
+        return self.cache_models or (self.model,)
+
+    def get_scope(self):
+        """ Values identifying whom the response is built for """
+        user = g.get("user")
+        scope = [getattr(user, "company_id", None)]
+        if self.cache_per_user:
+            scope.append(getattr(user, "id", None))
+        return scope
+
+    def get_cache_key(self):
+        """ Cache key of the response to the current request """
+        payload = json.dumps([
+            request.path,
+            sorted(request.args.items(multi=True)),
+            self.get_scope(),
+            model_versions(self.get_cache_models()),
+        ])
+        return "view:" + hashlib.md5(payload.encode()).hexdigest()
+
+    def cached_response(self, view, *args, **kwargs):
+        """ Response of view, taken from the cache when possible """
+        if self.cache_timeout is None:
+            return view(*args, **kwargs)
+        key = self.get_cache_key()
+        cached = CACHE.get(key)
+        if cached is not None:
+            body, status, headers = cached
+            return current_app.response_class(body, status, headers)
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == HTTPStatus.OK and not response.is_streamed:
+            CACHE.set(
+                key,
+                (response.get_data(), response.status_code,
+                 list(response.headers)),
+                timeout=self.cache_timeout
+            )
+        return response
+
+
+class ConditionalResponseMixin(CachedResponseMixin):
+    """Answer GET requests with 304 Not Modified when the client already
+    has the current response, before objects are loaded or templates are
+    rendered. Responses get a weak ETag computed from the versions of
+    cache_models, the url and the user, and the latest updated_on of
+    get_validator_query() when the model has it, also sent as
+    Last-Modified header. Reading updated_on costs an aggregate query per
+    request, so views opt in by setting conditional to True, e.g. the lists
+    polled by the tablets; other views never compute the validators.
+    """
+    conditional = False
+
+    def get_validator_query(self):
+        """ Query of the rows the response is built from """
+        return self.model.query
+
+    def get_validators(self):
+        """ ETag and Last-Modified of the current response """
+        updated_on = getattr(self.model, "updated_on", None)
+        last_modified = None
+        if updated_on is not None:
+            last_modified = self.get_validator_query().order_by(
+                None
+            ).with_entities(func.max(updated_on)).scalar()
+        payload = json.dumps([
+            request.path,
+            sorted(request.args.items(multi=True)),
+            self.get_scope(),
+            model_versions(self.get_cache_models()),
+            json_value(last_modified),
+        ])
+        return hashlib.md5(payload.encode()).hexdigest(), last_modified
+
+    def conditional_response(self, view, *args, **kwargs):
+        """ Response of view, or 304 Not Modified when the client has it """
+        if not self.conditional:
+            return view(*args, **kwargs)
+        etag, last_modified = self.get_validators()
+        if is_resource_modified(
+                request.environ, etag=etag, last_modified=last_modified):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != HTTPStatus.OK:
+                return response
+        else:
+            response = current_app.response_class(
+                status=HTTPStatus.NOT_MODIFIED)
+        response.set_etag(etag, weak=True)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        return response
+
+
+class CrudAPIView(ConditionalResponseMixin, views.MethodView):
     """View that supports generic crud operations.
     @todo #289:30min Move Fake* class definitions to test path so it's
      not mixed in with production code, reconsider if they're really needed.
@@ -40,6 +189,13 @@ class CrudAPIView(views.MethodView):
      to the project for object json serialization, update this puzzle or
      document design considerations for implementation if so.
     """
+    model = None
+    filter_class = GenericFilter
+    url_lookup = "object_id"
+    sort_key = "id"
+    paginate_by = 50
+    max_paginate_by = 500
+    max_bulk_size = 1000
 
     @classmethod
     def register(cls, blueprint, route, name=None):
@@ -60,10 +216,91 @@ class CrudAPIView(views.MethodView):
 
         blueprint.add_url_rule(route, view_func=cls.as_view(name))
 
-    def get(self, object_id):
-        """Calls the GET method."""
+    def dispatch_request(self, *args, **kwargs):
+        """Pass the object id from the URL as object_id argument. Requests
+        to the bulk url are dispatched to bulk_post(), bulk_put() and
+        bulk_delete()."""
+        if kwargs.pop("bulk", False):
+            handler = getattr(self, f"bulk_{request.method.lower()}", None)
+            if handler is None:
+                abort(HTTPStatus.METHOD_NOT_ALLOWED)
+            self.authorize_bulk()
+            return handler()
+        if self.url_lookup in kwargs:
+            kwargs["object_id"] = kwargs.pop(self.url_lookup)
+        return super().dispatch_request(*args, **kwargs)
+
+    def get(self, object_id=None):
+        """Calls the GET method. Without object_id returns a page of
+        objects."""
+        if object_id is None:
+            return self.conditional_response(
+                self.cached_response, self.get_list)
         return self.model.query.get(object_id)
 
+    def get_query(self):
+        """Get the lazy query of objects to be listed."""
+        return self.model.query
+
+    def get_validator_query(self):
+        """Rows of all pages of the list."""
+        return self.get_query()
+
+    def get_detail(self, object_id):
+        """Serialized object of get_query() with the given primary key,
+        404 when there is none."""
+        primary_key = getattr(
+            self.model, self.model.__mapper__.primary_key[0].key)
+        obj = self.get_query().filter(primary_key == object_id).first_or_404()
+        return jsonify(self.serialize(obj)), HTTPStatus.OK
+
+    def get_ordering(self):
+        """
+        Get the list of (column, direction) pairs from the ?ordering=
+        parameter, falling back to sort_key. The primary key is appended as
+        a tie breaker, so that every row has a unique position.
+        """
+        ordering = parse_ordering(
+            self.model, request.args.get("ordering") or self.sort_key)
+        primary_key = getattr(
+            self.model, self.model.__mapper__.primary_key[0].key)
+        if not any(column is primary_key for column, _ in ordering):
+            ordering.append((primary_key, asc))
+        return ordering
+
+    def get_paginate_by(self):
+        """Get page size from ?limit= parameter, capped by max_paginate_by."""
+        limit = request.args.get("limit", self.paginate_by, type=int)
+        return max(1, min(limit, self.max_paginate_by))
+
+    def get_list(self):
+        """
+        Return a page of serialized objects, filtered with ?filter_by=
+        parameters. Pages are navigated with the opaque cursors returned in
+        "next" and "prev", passed back as ?cursor= parameter.
+        """
+        try:
+            query = self.filter_class(self.model).apply(
+                self.get_query(), request.args.getlist("filter_by"))
+            page = paginate(
+                query, self.get_ordering(), self.get_paginate_by(),
+                cursor=request.args.get("cursor")
+            )
+        except ValueError:
+            abort(HTTPStatus.BAD_REQUEST)
+        return jsonify(
+            items=[self.serialize(obj) for obj in page.items],
+            next=page.next_cursor,
+            prev=page.prev_cursor
+        ), HTTPStatus.OK
+
+    def serialize(self, obj):
+        """Convert model instance to a json serializable dict."""
+        return {
+            column.key: json_value(getattr(obj, column.key))
+            for column in self.model.__mapper__.column_attrs
+        }
+
     def post(self, payload):
         """Calls the POST method."""
         return self.model.query.post(payload)
@@ -76,6 +313,86 @@ class CrudAPIView(views.MethodView):
         """Calls the DELETE method."""
         return self.model.query.delete(object_id)
 
+    def authorize_bulk(self):
+        """Bulk requests need a logged in user allowed to write the resource
+        of the view, views without resource do not accept them."""
+        if not g.get("user"):
+            abort(HTTPStatus.UNAUTHORIZED)
+        resource = getattr(self, "resource", None)
+        if not resource or not authorization.is_allowed(
+                method=request.method.lower(), resource=resource):
+            abort(HTTPStatus.FORBIDDEN)
+
+    def get_bulk_items(self):
+        """Get the json array of a bulk request, at most max_bulk_size
+        items."""
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            abort(HTTPStatus.BAD_REQUEST)
+        if len(items) > self.max_bulk_size:
+            abort(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        return items
+
+    def bulk_response(self, results):
+        """Respond with the status of every item of a bulk request."""
+        return jsonify(
+            results=[result.to_json() for result in results]
+        ), HTTPStatus.OK
+
+    def get_bulk_links(self):
+        """Association rows written with created objects, see bulk.Links,
+        None when there are none."""
+        return None
+
+    def bulk_post(self):
+        """Create objects from an array of objects."""
+        return self.bulk_response(bulk.create(
+            self.model, self.get_bulk_items(), links=self.get_bulk_links()))
+
+    def bulk_put(self):
+        """Update objects from an array of objects with primary keys, only
+        objects of get_query() are found."""
+        return self.bulk_response(
+            bulk.update(self.model, self.get_bulk_items(),
+                        query=self.get_query()))
+
+    def bulk_delete(self):
+        """Delete objects from an array of primary keys, only objects of
+        get_query() are found."""
+        return self.bulk_response(
+            bulk.delete(self.model, self.get_bulk_items(),
+                        query=self.get_query()))
+
+
+class LoadOptionsMixin:
+    """Declare how objects are loaded, so that rendering them does not run
+    a query per object:
+        eager = ("company", "floors")   relationships loaded with the objects,
+                                        joinedload for a single object and
+                                        selectinload for collections, loader
+                                        options like joinedload("x.y") are
+                                        used as they are
+        only = ("id", "name")           columns loaded, the others are
+                                        deferred until accessed
+    """
+    eager = ()
+    only = ()
+
+    def get_load_options(self):
+        """ Loader options applied to the query of objects """
+        options = []
+        relationships = self.model.__mapper__.relationships
+        for relation in self.eager:
+            if not isinstance(relation, str):
+                options.append(relation)
+            elif relationships[relation].uselist:
+                options.append(selectinload(relation))
+            else:
+                options.append(joinedload(relation))
+        if self.only:
+            options.append(load_only(*self.only))
+        return options
+
 
 class GenericView(views.MethodView):
     """ Generic view with common logic
@@ -166,13 +483,48 @@ class GenericView(views.MethodView):
         return render_template(self.get_template_name(), **context)
 
 
-class ListView(GenericView):
+class ListView(ConditionalResponseMixin, LoadOptionsMixin, GenericView):
     """
     A view that will render a template with a list of objects.
+
+    Sorting, filtering and pagination are applied to a lazy query, so they
+    run in the database and only one page of rows is ever loaded:
+        ?ordering=name,-id      ORDER BY, unknown fields are skipped
+        ?filter_by=name=Foo     equality filter, unknown fields are skipped
+        ?filter_by=name__prefix=Fo  typed operators, see timeless.filters
+        ?limit=20               page size, capped by max_paginate_by
+        ?page=3                 offset pagination
+        ?after=42&page=3        keyset pagination, continues after row id 42
+        ?before=42&page=1       keyset pagination, goes back before row 42
+
+    Relationships rendered for every object are declared in eager, see
+    LoadOptionsMixin. Objects are counted for "page X of Y" only with a
+    count_strategy, see timeless.counts, keyset pages know X from ?page=.
+    Pages include the name of the user, so they are cached and validated per
+    user.
     """
 
     model = None
+    filter_class = GenericFilter
+    count_strategy = None
     context_object_list_name = "object_list"
+    paginate_by = 50
+    max_paginate_by = 500
+    cache_per_user = True
+
+    def get(self, *args, **kwargs):
+        """
+        Render the list, taken from the cache when it is enabled, or answer
+        304 Not Modified when the client has it.
+        """
+        return self.conditional_response(
+            self.cached_response, super().get, *args, **kwargs)
+
+    def get_validator_query(self):
+        """
+        Rows of all pages of the list.
+        """
+        return self.filter_query(self.get_query())
 
     def get_context_object_list_name(self):
         """
@@ -180,42 +532,169 @@ class ListView(GenericView):
         """
         return self.context_object_list_name
 
-    @staticmethod
-    def get_order_direction(field_name):
-        return desc if field_name.startswith("-") else asc
+    def get_ordering(self):
+        """
+        Get a list of (column, direction) pairs from ?ordering= parameter.
+        """
+        return parse_ordering(self.model, request.args.get("ordering"))
+
+    def get_pagination_ordering(self):
+        """
+        Ordering used for pagination. The primary key is appended as a tie
+        breaker, so that every row has a stable position between pages.
+        """
+        ordering = self.get_ordering()
+        primary_key = self.get_primary_key()
+        if not any(column is primary_key for column, _ in ordering):
+            ordering.append((primary_key, asc))
+        return ordering
+
+    def get_primary_key(self):
+        """
+        Get primary key column of the model.
+        """
+        return getattr(self.model, self.model.__mapper__.primary_key[0].key)
 
     def sort_query(self, query):
-        ordering = request.args.get("ordering")
-        if not ordering:
-            return query
-        for field_name in ordering.split(","):
-            order_direction = self.get_order_direction(field_name)
-            model_field = getattr(self.model, field_name.strip("-"), None)
-            if not model_field:
-                continue
+        for model_field, order_direction in self.get_pagination_ordering():
             query = query.order_by(order_direction(model_field))
         return query
 
-    def get_object_list(self):
+    def filter_query(self, query):
         """
-        Get the list of objects. If this method is not overwritten, then a
-        model variable must be declared, and it must have query.all().
+        Apply ?filter_by=field__operator=value parameters to the query with
+        filter_class, see timeless.filters.
+        """
+        try:
+            return self.filter_class(self.model).apply(
+                query, request.args.getlist("filter_by"))
+        except ValueError:
+            abort(HTTPStatus.BAD_REQUEST)
+
+    def get_paginate_by(self):
+        """
+        Get page size from ?limit= parameter, capped by max_paginate_by.
+        """
+        limit = request.args.get("limit", self.paginate_by, type=int)
+        return max(1, min(limit, self.max_paginate_by))
+
+    def paginate_query(self, query):
+        """
+        Restrict the query to a single page. One row more than the page size
+        is requested, so that the next page can be detected without COUNT.
+        Keyset pages are read after or before a row, the sort order being
+        reversed for the latter, and carry their number in ?page=.
+        """
+        limit = self.get_paginate_by()
+        ordering = self.get_pagination_ordering()
+        after = request.args.get("after", type=int)
+        before = request.args.get("before", type=int)
+        backward = after is None and before is not None
+        number = max(1, request.args.get("page", 1, type=int))
+        if after is not None:
+            query = query.filter(keyset_condition(
+                ordering, self.get_anchor_values(ordering, after)))
+        elif backward:
+            reverse = [
+                (column, asc if direction is desc else desc)
+                for column, direction in ordering
+            ]
+            query = query.filter(keyset_condition(
+                reverse, self.get_anchor_values(reverse, before))
+            ).order_by(None).order_by(
+                *[direction(column) for column, direction in reverse])
+        else:
+            query = query.offset((number - 1) * limit)
+        rows = query.limit(limit + 1).all()
+        object_list = rows[:limit]
+        has_next = len(rows) > limit
+        if backward:
+            object_list.reverse()
+            # the row the page was read before follows it
+            has_next = True
+            if len(rows) <= limit:
+                number = 1
+        primary_key = self.get_primary_key().key
+        return Page(
+            object_list=object_list,
+            number=number,
+            limit=limit,
+            has_next=has_next,
+            next_after=(
+                getattr(object_list[-1], primary_key)
+                if object_list and has_next else None
+            ),
+            previous_before=(
+                getattr(object_list[0], primary_key)
+                if object_list and number > 1 else None
+            ),
+            args={
+                key: value for key, value in request.args.items()
+                if key not in ("page", "after", "before")
+            }
+        )
+
+    def get_anchor_values(self, ordering, object_id):
+        """
+        Subqueries of the values of the ordering columns for the row with the
+        given primary key, keyset pages are read after or before it.
+        """
+        anchor = aliased(self.model)
+        primary_key = self.get_primary_key()
+        return [
+            DB.session.query(getattr(anchor, column.key)).filter(
+                getattr(anchor, primary_key.key) == object_id
+            ).as_scalar()
+            for column, _ in ordering
+        ]
+
+    def get_query(self):
+        """
+        Get the lazy query of objects. If this method is not overwritten,
+        then a model variable must be declared.
         """
         if self.model is None:
             raise NotImplementedError(f"{self.__class__.__name__} must define "
-                                      f"either 'model' or 'get_object_list()'")
-        return self.sort_query(self.model.query.all())
+                                      f"either 'model' or 'get_query()'")
+        return self.model.query
+
+    def get_page(self):
+        """
+        Get the current page of objects.
+        """
+        if not hasattr(self, "_page"):
+            query = self.filter_query(self.get_query())
+            self._page = self.paginate_query(
+                self.sort_query(query).options(*self.get_load_options()))
+            self._page.count = self.count_query(query)
+        return self._page
+
+    def count_query(self, query):
+        """
+        Count objects of the filtered query with count_strategy, None when
+        there is no strategy.
+        """
+        if self.count_strategy is None:
+            return None
+        return self.count_strategy.count(query, self.model)
+
+    def get_object_list(self):
+        """
+        Get the list of objects of the current page.
+        """
+        return self.get_page().object_list
 
     def get_default_context(self):
         """
-        Add the object list to the context.
+        Add the object list and page to the context.
         """
         context = super().get_default_context()
         context[self.get_context_object_list_name()] = self.get_object_list()
+        context["page"] = self.get_page()
         return context
 
 
-class SingleObjectMixin:
+class SingleObjectMixin(LoadOptionsMixin):
     """ Fetch model from database using id """
     model = None
     object_url_lookup = "id"
@@ -223,7 +702,9 @@ class SingleObjectMixin:
     def get_object(self):
         """ Takes object based on id provided in URL """
         object_id = self.kwargs.get(self.object_url_lookup)
-        return self.model.query.get(object_id)
+        return self.model.query.options(
+            *self.get_load_options()
+        ).get(object_id)
 
 
 class SuccessRedirectMixin:
@@ -238,11 +719,30 @@ class SuccessRedirectMixin:
         return url_for(self.success_view_name)
 
 
-class DetailView(SingleObjectMixin, GenericView):
+class DetailView(ConditionalResponseMixin, SingleObjectMixin, GenericView):
     """
     A view that will display details in a template for a single object.
+    Pages include the name of the user, so they are cached and validated
+    per user.
     """
     context_object_name = "object"
+    cache_per_user = True
+
+    def get(self, *args, **kwargs):
+        """
+        Render the object, taken from the cache when it is enabled, or
+        answer 304 Not Modified when the client has it.
+        """
+        return self.conditional_response(
+            self.cached_response, super().get, *args, **kwargs)
+
+    def get_validator_query(self):
+        """
+        Row of the object.
+        """
+        primary_key = self.model.__mapper__.primary_key[0]
+        return self.model.query.filter(
+            primary_key == self.kwargs.get(self.object_url_lookup))
 
     def get_context_object_name(self):
         """
@@ -325,6 +825,114 @@ class DeleteView(SuccessRedirectMixin, SingleObjectMixin, GenericView):
         return redirect(self.get_success_url_redirect())
 
 
+class ResourcePermissionMixin:
+    """Requests need a logged in user allowed to use resource with the
+    method of the request, views without resource do not accept them."""
+    resource = None
+
+    def authorize(self):
+        """Abort unless the user may use the resource of the view."""
+        if not g.get("user"):
+            abort(HTTPStatus.UNAUTHORIZED)
+        if not self.resource or not authorization.is_allowed(
+                method=request.method.lower(), resource=self.resource):
+            abort(HTTPStatus.FORBIDDEN)
+
+
+class ExportView(ResourcePermissionMixin, GenericView):
+    """ Streams the objects of the company of the user as a file,
+    ?format=csv (default) or ?format=jsonl. Rows are read with a server side
+    cursor and sent as soon as they are formatted, so memory use does not
+    depend on their number. The user must be allowed to get the resource.
+    Example:
+        class Export(views.ExportView):
+            model = Reservation
+            resource = "reservation"
+            fields = ("id", "start_time", "end_time")
+    """
+    methods = ["get"]
+    model = None
+    fields = None
+
+    def get_query(self):
+        """ Get the lazy query of exported objects, those of the company of
+        the user when the model has company_id """
+        query = self.model.query
+        if "company_id" in self.model.__table__.columns:
+            query = query.filter(
+                self.model.company_id == current_scope().company_id)
+        return query.order_by(*self.model.__mapper__.primary_key)
+
+    def get(self, *args, **kwargs):
+        self.authorize()
+        export_format = request.args.get("format", "csv")
+        if export_format not in export.FORMATS:
+            abort(HTTPStatus.BAD_REQUEST)
+        _, mimetype = export.FORMATS[export_format]
+        lines = export.export(
+            self.get_query(),
+            export.columns(self.model, self.fields),
+            export_format
+        )
+        filename = f"{self.model.__tablename__}.{export_format}"
+        return Response(
+            stream_with_context(lines),
+            mimetype=mimetype,
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}"
+            }
+        )
+
+
+class ImportView(ResourcePermissionMixin, GenericView):
+    """ Imports objects from the csv file uploaded as "file", the header
+    names the columns. Rows are validated and copied into the database in
+    chunks, rows with invalid values are skipped and reported with their
+    line number. With ?key=poster_id rows with a known key update the
+    existing objects of the scope of the user.
+    The user must be allowed to post the resource, the company and the
+    locations of the rows are those of the scope of the user.
+    Example:
+        class Import(views.ImportView):
+            model = Customer
+            resource = "customer"
+    """
+    methods = ["post"]
+    model = None
+
+    def get_forced_values(self):
+        """Column values set on every imported row."""
+        if "company_id" in self.model.__table__.columns:
+            return {"company_id": current_scope().company_id}
+        return {}
+
+    def get_allowed_values(self):
+        """Values the imported rows may have per column."""
+        if "location_id" in self.model.__table__.columns:
+            return {"location_id": current_scope().location_ids}
+        return {}
+
+    def post(self, *args, **kwargs):
+        self.authorize()
+        upload = request.files.get("file")
+        if upload is None:
+            abort(HTTPStatus.BAD_REQUEST)
+        try:
+            result = imports.load(
+                self.model,
+                io.TextIOWrapper(upload.stream, encoding="utf-8", newline=""),
+                key=request.args.get("key"),
+                forced=self.get_forced_values(),
+                allowed=self.get_allowed_values()
+            )
+        except (imports.CsvImportError, UnicodeDecodeError) as error:
+            return jsonify(error=str(error)), HTTPStatus.BAD_REQUEST
+        return jsonify(
+            imported=result.imported,
+            rejected=[attr.asdict(rejected) for rejected in result.rejected]
+        ), HTTPStatus.OK
+
+
 class FakeModel:
     """Fake model for tests."""
 